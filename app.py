@@ -1,39 +1,79 @@
 import sys
-import os
+import json
+from contextlib import asynccontextmanager
 
-import certifi
-ca = certifi.where()
-
-from dotenv import load_dotenv
-load_dotenv()
-mongo_db_url = os.getenv("MONGODB_URL_KEY")
-print(mongo_db_url)
-import pymongo
 from networksecurity.exception.exception import NetworkSecurityException
-from networksecurity.logging.logger import logging
-from networksecurity.pipelines.training_pipeline import TrainingPipeline
+from networksecurity.logging.logger import serving_logger, get_logging_stats
+from networksecurity.pipelines.training_job import TrainingJobManager
+from networksecurity.constant.training_pipeline import MODEL_TRAINER_SEARCH_STRATEGY, MODEL_TRAINER_SEARCH_STRATEGIES
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, File, UploadFile,Request
+from fastapi import FastAPI, File, UploadFile,Request,HTTPException
 from uvicorn import run as app_run
-from fastapi.responses import Response
+from fastapi.responses import Response, JSONResponse
 from starlette.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
 import pandas as pd
+import numpy as np
+import io
 
-from networksecurity.utils.main_utils import load_object
+from networksecurity.utils.main_utils import read_yaml_file
+from networksecurity.utils.ml_utils.model_registry import ModelRegistry
+from networksecurity.utils.ml_utils.micro_batcher import MicroBatcher
+from networksecurity.utils.ml_utils.prediction_cache import PredictionCache
+from networksecurity.utils.ml_utils.estimator import apply_threshold
+from networksecurity.utils.ml_utils.drift_monitor import OnlineDriftMonitor
+from networksecurity.utils.mongo_utils import get_async_collection, close_mongo_client
 
-from networksecurity.utils.ml_utils.estimator import NetworkModel
+from networksecurity.constant.training_pipeline import DATA_INGESTION_COLLECTION_NAME
+from networksecurity.constant.training_pipeline import DATA_INGESTION_DATABASE_NAME
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH, TARGET_COLUMN
+from networksecurity.constant.training_pipeline import PREDICTION_COLUMN, PREDICTION_SCORE_COLUMN
+from networksecurity.constant.training_pipeline import PREDICTION_MICRO_BATCH_MAX_SIZE, PREDICTION_MICRO_BATCH_MAX_LATENCY
 
+model_registry = ModelRegistry()
+prediction_cache = PredictionCache()
 
-client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
+def predict_rows(df: pd.DataFrame) -> tuple:
+    """
+    Labels and class probabilities from the served model, reusing cached predictions of rows seen before,
+    together with the model and version that produced them, which a hot swap cannot tear apart.
+    """
+    network_model, version = model_registry.get_model_version()
+    y_pred, proba = prediction_cache.predict_with_scores(network_model, df, version)
+    return y_pred, proba, network_model, version
 
-from networksecurity.constant.training_pipeline import DATA_INGESTION_COLLECTION_NAME
-from networksecurity.constant.training_pipeline import DATA_INGESTION_DATABASE_NAME
+micro_batcher = MicroBatcher(
+    predict_fn=predict_rows,
+    max_batch_size=PREDICTION_MICRO_BATCH_MAX_SIZE,
+    max_latency=PREDICTION_MICRO_BATCH_MAX_LATENCY,
+)
+drift_monitor = OnlineDriftMonitor()
+training_jobs = TrainingJobManager()
 
-database = client[DATA_INGESTION_DATABASE_NAME]
-collection = database[DATA_INGESTION_COLLECTION_NAME]
+schema_columns = [list(column)[0] for column in read_yaml_file(SCHEMA_FILE_PATH)["columns"]]
+feature_columns = [column for column in schema_columns if column != TARGET_COLUMN]
+feature_column_set = set(feature_columns)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        model_registry.load()
+    except NetworkSecurityException as e:
+        serving_logger.warning(f"No model loaded at startup: {e}")
+    micro_batcher.start()
+    # Connects on the first query; request handlers share its pool through app.state.
+    try:
+        app.state.collection = get_async_collection(DATA_INGESTION_DATABASE_NAME, DATA_INGESTION_COLLECTION_NAME)
+    except NetworkSecurityException as e:
+        app.state.collection = None
+        serving_logger.warning(f"No MongoDB collection available: {e}")
+    yield
+    await micro_batcher.stop()
+    training_jobs.shutdown()
+    await close_mongo_client()
+
+app = FastAPI(lifespan=lifespan)
 origins = ["*"]
 
 app.add_middleware(
@@ -51,38 +91,152 @@ templates = Jinja2Templates(directory="./templates")
 async def index():
     return RedirectResponse(url="/docs")
 
-@app.get("/train")
-async def train_route():
+@app.api_route("/train", methods=["GET", "POST"])
+async def train_route(model_search_strategy: str = MODEL_TRAINER_SEARCH_STRATEGY):
+    if model_search_strategy not in MODEL_TRAINER_SEARCH_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown model_search_strategy: {model_search_strategy}; "
+                                                    f"expected one of {', '.join(MODEL_TRAINER_SEARCH_STRATEGIES)}")
     try:
-        train_pipeline=TrainingPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training is successful")
+        # Starting the job process can take a while and must not hold up the serving loop.
+        job, started = await run_in_threadpool(training_jobs.start, model_search_strategy=model_search_strategy)
+        return JSONResponse({**job, "started": started}, status_code=202)
     except Exception as e:
         raise NetworkSecurityException(e,sys)
+
+@app.get("/train/jobs")
+async def train_jobs_route():
+    return training_jobs.list_jobs()
+
+@app.get("/train/jobs/{job_id}")
+async def train_job_status_route(job_id: str):
+    job = training_jobs.get_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job: {job_id}")
+    return job
+
+@app.post("/train/jobs/{job_id}/cancel")
+async def train_job_cancel_route(job_id: str):
+    job = await run_in_threadpool(training_jobs.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job: {job_id}")
+    return job
     
+def predict_csv(csv_file) -> str:
+    """
+    Scores an uploaded CSV, writes it with the predictions to prediction_output/output.csv
+    and returns it as an HTML table.
+    """
+    df=pd.read_csv(csv_file)
+    y_pred, proba, _, version = predict_rows(df)
+    drift_monitor.observe(df, version)
+    df[PREDICTION_COLUMN] = y_pred
+    if proba.shape[1] == 2:
+        df[PREDICTION_SCORE_COLUMN] = proba[:, 1]
+    #df['predicted_column'].replace(-1, 0)
+    #return df.to_json()
+    df.to_csv('prediction_output/output.csv')
+    return df.to_html(classes='table table-striped')
+
 @app.post("/predict")
 async def predict_route(request: Request,file: UploadFile = File(...)):
     try:
-        df=pd.read_csv(file.file)
-        #print(df)
-        preprocesor=load_object("final_model/preprocessor.pkl")
-        final_model=load_object("final_model/model.pkl")
-        network_model = NetworkModel(preprocessor=preprocesor,model=final_model)
-        print(df.iloc[0])
-        y_pred = network_model.predict(df)
-        print(y_pred)
-        df['predicted_column'] = y_pred
-        print(df['predicted_column'])
-        #df['predicted_column'].replace(-1, 0)
-        #return df.to_json()
-        df.to_csv('prediction_output/output.csv')
-        table_html = df.to_html(classes='table table-striped')
-        #print(table_html)
-        return templates.TemplateResponse("table.html", {"request": request, "table": table_html})
+        # Parsing, scoring and rendering a large upload must not hold up the serving loop.
+        table_html = await run_in_threadpool(predict_csv, file.file)
+        return templates.TemplateResponse(request, "table.html", {"table": table_html})
         
     except Exception as e:
             raise NetworkSecurityException(e,sys)
 
+def check_record_columns(record: dict) -> None:
+    """
+    Rejects a record whose keys are not exactly the model's features, so the
+    imputer never has to make up features the client did not send.
+    """
+    unknown = [column for column in record if column not in feature_column_set]
+    missing = [column for column in feature_columns if column not in record]
+    if unknown or missing:
+        problems = []
+        if missing:
+            problems.append(f"missing features: {', '.join(missing)}")
+        if unknown:
+            problems.append(f"unknown features: {', '.join(map(str, unknown))}")
+        raise HTTPException(status_code=400, detail="; ".join(problems))
+
+def parse_prediction_body(body: bytes, content_type: str) -> pd.DataFrame:
+    """
+    Builds the feature frame from a JSON, Arrow IPC or .npy request body.
+    Every feature must be present; a null value marks it as missing.
+    """
+    if content_type in ("application/json", ""):
+        payload = json.loads(body)
+        records = payload.get("records", payload) if isinstance(payload, dict) else payload
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Expected a record or a list of records")
+        for record in records:
+            if not isinstance(record, dict):
+                raise HTTPException(status_code=400, detail="Each record must be an object of feature values")
+            check_record_columns(record)
+        return pd.DataFrame.from_records(records, columns=feature_columns)
+    if content_type in ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file"):
+        import pyarrow as pa
+        reader = pa.ipc.open_stream(body) if content_type.endswith("stream") else pa.ipc.open_file(body)
+        table = reader.read_all()
+        missing = [column for column in feature_columns if column not in table.column_names]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"missing features: {', '.join(missing)}")
+        return table.select(feature_columns).to_pandas()
+    if content_type in ("application/x-npy", "application/octet-stream"):
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+        return pd.DataFrame(np.atleast_2d(array), columns=feature_columns)
+    raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+
+@app.post("/v1/predict")
+async def predict_v1_route(request: Request, threshold: float = None, scores: bool = False):
+    """
+    Predicts the posted rows. With `threshold`, labels are taken from the class
+    probabilities at that threshold; with `scores`, the probabilities are returned too.
+    """
+    try:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        df = parse_prediction_body(await request.body(), content_type)
+        if len(df) == 1:
+            y_pred, proba, network_model, version = await micro_batcher.submit(df)
+        else:
+            y_pred, proba, network_model, version = await run_in_threadpool(predict_rows, df)
+        drift_monitor.observe(df, version)
+        classes = network_model.classes
+        if threshold is not None:
+            y_pred = apply_threshold(proba, classes, threshold)
+        response = {"model_version": version, "predictions": y_pred.tolist()}
+        if scores:
+            response.update(classes=classes.tolist(), probabilities=proba.tolist())
+        return response
+    except HTTPException:
+        raise
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+@app.post("/model/reload")
+async def reload_model_route():
+    try:
+        model_registry.reload()
+        drift_monitor.reset(model_registry.version)
+        return model_registry.get_stats()
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+@app.get("/model/stats")
+async def model_stats_route():
+    return {**model_registry.get_stats(), "micro_batcher": micro_batcher.get_stats(),
+            "prediction_cache": prediction_cache.get_stats(), "logging": get_logging_stats()}
+
+@app.get("/metrics/drift")
+async def drift_metrics_route():
+    return drift_monitor.get_drift()
     
 if __name__=="__main__":
     app_run(app,host="0.0.0.0",port=8000)
\ No newline at end of file
@@ -0,0 +1,354 @@
+"""
+Benchmarks for the training pipeline stages and for inference.
+
+Runs the pipeline components on network_data/phisingData.csv and on synthetic
+scale-ups of it, and stores the timings as JSON so runs can be compared:
+
+    python benchmarks/run_benchmarks.py run --scales 1 10 --output benchmarks/results/main.json
+    python benchmarks/run_benchmarks.py compare benchmarks/results/main.json benchmarks/results/branch.json
+
+Everything runs in a temporary working directory, so the repository's
+Artifact/ and final_model/ are never touched. Mongo is not needed: ingestion
+runs DataIngestion.initiate_data_ingestion against an in-memory collection
+holding the scaled records, so only the server round trips are left out; pass
+--mongo to also time the export from the collection in MONGO_DB_URL. `compare` exits with status 1 when a timing regresses by more
+than the tolerance, for use in CI.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from networksecurity.constant.training_pipeline import TARGET_COLUMN
+from networksecurity.components import data_ingestion as data_ingestion_module
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.entity.config_entity import (
+    TrainingPipelineConfig,
+    DataIngetionConfig,
+    DataValidationConfig,
+    DataTransformationConfig,
+)
+from networksecurity.utils.main_utils import evaluate_model, load_numpy_array_data, load_object, save_object
+from networksecurity.utils.ml_utils.compiled_model import compile_model
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model_artifact import save_model_artifact, load_model_artifact
+from networksecurity.utils.profiler import StageProfiler
+
+DATA_FILE_PATH = os.path.join(REPO_DIR, "network_data", "phisingData.csv")
+SCHEMA_DIR = os.path.join(REPO_DIR, "data_schema")
+STAGES = ("ingestion", "validation", "transformation", "training", "prediction")
+
+
+def scale_up(dataframe: pd.DataFrame, factor: float, seed: int, noise_rate: float = 0.02,
+             missing_rate: float = 0.0) -> pd.DataFrame:
+    """
+    Builds a synthetic dataset of `factor` times the rows of `dataframe`.
+
+    Rows are resampled with replacement and a `noise_rate` share of feature cells
+    is redrawn from the same column of another row, so the scaled data keeps the
+    ternary value domain and the column marginals without being exact copies.
+    A `missing_rate` share of feature cells can be blanked to exercise imputation.
+    Factor 1 without missing values returns the original data.
+    """
+    rng = np.random.default_rng(seed)
+    features = [column for column in dataframe.columns if column != TARGET_COLUMN]
+    if factor == 1:
+        sample = dataframe.copy()
+    else:
+        sample = dataframe.iloc[rng.integers(0, len(dataframe), int(len(dataframe) * factor))].reset_index(drop=True)
+        values = sample[features].to_numpy()
+        noise = rng.random(values.shape) < noise_rate
+        donor_rows = rng.integers(0, len(dataframe), noise.sum())
+        values[noise] = dataframe[features].to_numpy()[donor_rows, np.nonzero(noise)[1]]
+        sample[features] = values
+    if missing_rate > 0:
+        sample[features] = sample[features].astype(np.float32).mask(rng.random((len(sample), len(features))) < missing_rate)
+    return sample
+
+
+class InMemoryCollection:
+    """
+    Stands in for the Mongo collection: find() yields a fresh dict per document, as a
+    cursor does, with the projected-out fields removed.
+    """
+    def __init__(self, records: list):
+        self.records = records
+
+    def find(self, query: dict = None, projection: dict = None, batch_size: int = 0):
+        excluded = [field for field, keep in (projection or {}).items() if not keep]
+        for record in self.records:
+            document = dict(record)
+            for field in excluded:
+                document.pop(field, None)
+            yield document
+
+
+@contextmanager
+def serve_collection(collection):
+    """
+    Makes DataIngestion read from `collection` instead of the configured MongoDB.
+    """
+    get_collection = data_ingestion_module.get_collection
+    data_ingestion_module.get_collection = lambda database_name, collection_name: collection
+    try:
+        yield collection
+    finally:
+        data_ingestion_module.get_collection = get_collection
+
+
+def profile(name: str, fn, rows: int) -> tuple:
+    with StageProfiler(name) as profiler:
+        profiler.rows_processed = rows
+        value = fn()
+    return profiler.metric_artifact, value
+
+
+def make_result(benchmark: str, scale: float, metric_artifact, **extra) -> dict:
+    rows = metric_artifact.rows_processed
+    seconds = metric_artifact.wall_time_seconds
+    result = {
+        "benchmark": benchmark,
+        "scale": scale,
+        "rows": rows,
+        "seconds": seconds,
+        "cpu_seconds": metric_artifact.cpu_time_seconds,
+        "peak_rss_mb": metric_artifact.peak_rss_mb,
+        "rows_per_second": rows / seconds if rows and seconds else None,
+    }
+    result.update(extra)
+    return result
+
+
+def benchmark_predict(network_model: NetworkModel, features: pd.DataFrame, batch_sizes: list, scale: float,
+                      min_seconds: float, max_repeats: int) -> list:
+    """
+    Latency and throughput of NetworkModel.predict for each batch size. Results for the
+    compiled backend are named with a "compiled_" prefix.
+    """
+    prefix = "" if network_model.backend == "sklearn" else f"{network_model.backend}_"
+    results = []
+    for batch_size in batch_sizes:
+        batch = features.iloc[:batch_size]
+        network_model.predict(batch)  # warm-up
+        latencies = []
+        start = time.perf_counter()
+        while len(latencies) < max_repeats and (time.perf_counter() - start < min_seconds or len(latencies) < 3):
+            call_start = time.perf_counter()
+            network_model.predict(batch)
+            latencies.append(time.perf_counter() - call_start)
+        latencies = np.array(latencies)
+        results.append({
+            "benchmark": "predict",
+            "name": f"{prefix}batch_{len(batch)}",
+            "scale": scale,
+            "backend": network_model.backend,
+            "batch_size": len(batch),
+            "calls": len(latencies),
+            "seconds": float(np.median(latencies)),
+            "p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "p95_ms": float(np.percentile(latencies, 95) * 1000),
+            "rows_per_second": float(len(batch) / np.median(latencies)),
+        })
+    return results
+
+
+def run_scale(dataframe: pd.DataFrame, scale: float, args) -> list:
+    """
+    Runs the selected stages on one scaled dataset inside the current working directory.
+    """
+    results = []
+    data = scale_up(dataframe, scale, args.seed, missing_rate=args.missing_rate)
+    training_pipeline_config = TrainingPipelineConfig(model_search_strategy=args.search_strategy)
+
+    data_ingestion = DataIngestion(DataIngetionConfig(training_pipeline_config))
+    # The records are built up front so the timing starts at the cursor; ingestion counts its own rows.
+    with serve_collection(InMemoryCollection(data.to_dict("records"))):
+        metric, data_ingestion_artifact = profile("ingestion", data_ingestion.initiate_data_ingestion, None)
+    if "ingestion" in args.stages:
+        results.append(make_result("ingestion", scale, metric))
+    if args.mongo and scale == 1:
+        metric, exported = profile("ingestion_mongo_export", data_ingestion.export_collection_as_dataframe, None)
+        metric.rows_processed = len(exported)
+        results.append(make_result("ingestion_mongo_export", scale, metric))
+    if not set(args.stages) - {"ingestion"}:
+        return results
+
+    data_validation = DataValidation(data_ingestion_artifact, DataValidationConfig(training_pipeline_config))
+    metric, data_validation_artifact = profile("validation", data_validation.initiate_data_validation, len(data))
+    if "validation" in args.stages:
+        results.append(make_result("validation", scale, metric))
+    if not set(args.stages) - {"ingestion", "validation"}:
+        return results
+
+    data_transformation = DataTransformation(DataTransformationConfig(training_pipeline_config), data_validation_artifact)
+    metric, data_transformation_artifact = profile("transformation", data_transformation.initiate_data_transformation, len(data))
+    if "transformation" in args.stages:
+        results.append(make_result("transformation", scale, metric, missing_rate=args.missing_rate))
+
+    if "training" in args.stages or "prediction" in args.stages:
+        train_arr = load_numpy_array_data(data_transformation_artifact.transformed_train_file_path)
+        test_arr = load_numpy_array_data(data_transformation_artifact.transformed_test_file_path)
+        X_train, y_train = train_arr[:, :-1].astype(np.float32), train_arr[:, -1]
+        X_test, y_test = test_arr[:, :-1].astype(np.float32), test_arr[:, -1]
+        models, params = ModelTrainer.get_candidate_models()
+        if "training" not in args.stages:
+            # Prediction only needs one fitted model.
+            models = {"Random Forest": models["Random Forest"]}
+            params = {"Random Forest": {}}
+        model_report = evaluate_model(X_train, y_train, X_test, y_test, models, params, n_jobs=args.n_jobs,
+                                      cv=3, search_strategy=args.search_strategy, n_iter=args.n_iter)
+        if "training" in args.stages:
+            for name, report in model_report.items():
+                results.append(make_result("evaluate_model", scale, report["metrics"], name=name,
+                                           n_fits=report["n_fits"], test_score=float(report["test_score"])))
+
+        if "prediction" in args.stages:
+            best_name = max(model_report, key=lambda name: model_report[name]["test_score"])
+            preprocessor = load_object(data_transformation_artifact.transformed_object_file_path)
+            network_model = NetworkModel(preprocessor=preprocessor, model=model_report[best_name]["model"])
+            # Cold-start cost of the served model: versioned artifact (memory-mapped) against a plain pickle.
+            # The artifact is saved as the trainer saves it, so the compiled backend serves it without
+            # unpickling the estimator; "artifact_sklearn" is the cost when the estimator is needed.
+            compiled = compile_model(network_model.model)
+            save_model_artifact("model_artifact", preprocessor, network_model.model, compiled_model=compiled)
+            save_object(os.path.join("pickled_model", "model.pkl"), network_model)
+            metric, _ = profile("model_load", lambda: load_model_artifact("model_artifact"), None)
+            results.append(make_result("model_load", scale, metric, name="artifact"))
+            metric, _ = profile("model_load", lambda: load_model_artifact("model_artifact", backend="sklearn"), None)
+            results.append(make_result("model_load", scale, metric, name="artifact_sklearn"))
+            metric, _ = profile("model_load", lambda: load_object(os.path.join("pickled_model", "model.pkl")), None)
+            results.append(make_result("model_load", scale, metric, name="pickle"))
+            features = data.drop(columns=[TARGET_COLUMN])
+            features = pd.concat([features] * (-(-max(args.batch_sizes) // len(features))), ignore_index=True)
+            results.extend(benchmark_predict(network_model, features, args.batch_sizes, scale,
+                                             args.min_seconds, args.max_repeats))
+            if compiled is not None:
+                compiled_network_model = NetworkModel(preprocessor=preprocessor, model=network_model.model,
+                                                      compiled_model=compiled)
+                results.extend(benchmark_predict(compiled_network_model, features, args.batch_sizes, scale,
+                                                 args.min_seconds, args.max_repeats))
+    return results
+
+
+def get_environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+    }
+
+
+def run(args):
+    dataframe = pd.read_csv(DATA_FILE_PATH)
+    output_path = os.path.abspath(args.output or os.path.join(
+        REPO_DIR, "benchmarks", "results", f"benchmark_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"))
+    report = {"environment": get_environment(), "config": vars(args).copy(), "results": []}
+    report["config"].pop("func", None)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="networksecurity-bench-") as workdir:
+        os.chdir(workdir)
+        os.symlink(SCHEMA_DIR, "data_schema")
+        try:
+            for scale in args.scales:
+                print(f"Running scale {scale}x ({int(len(dataframe) * scale)} rows)")
+                for result in run_scale(dataframe, scale, args):
+                    report["results"].append(result)
+                    label = result["benchmark"] + (f" [{result['name']}]" if "name" in result else "")
+                    print(f"  {label:<40} {result['seconds']:.4f}s")
+        finally:
+            os.chdir(cwd)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as output_file:
+        json.dump(report, output_file, indent=2, default=str)
+    print(f"Results written to {output_path}")
+
+
+def result_key(result: dict) -> tuple:
+    return result["benchmark"], result.get("name"), result["scale"]
+
+
+def compare(args) -> int:
+    with open(args.baseline) as baseline_file:
+        baseline = {result_key(result): result for result in json.load(baseline_file)["results"]}
+    with open(args.current) as current_file:
+        current = {result_key(result): result for result in json.load(current_file)["results"]}
+
+    regressions = 0
+    print(f"{'benchmark':<45} {'scale':>6} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key in sorted(set(baseline) & set(current), key=str):
+        before, after = baseline[key]["seconds"], current[key]["seconds"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > args.tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        label = key[0] + (f" [{key[1]}]" if key[1] else "")
+        print(f"{label:<45} {key[2]:>6} {before:>10.4f} {after:>10.4f} {change:>+8.1%}{flag}")
+    for key in sorted(set(baseline) ^ set(current), key=str):
+        print(f"{key} only in {'baseline' if key in baseline else 'current'}")
+    print(f"{regressions} regression(s) above {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the training pipeline and inference.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write a JSON report.")
+    run_parser.add_argument("--scales", type=float, nargs="+", default=[1, 10],
+                            help="Dataset sizes as multiples of phisingData.csv (100 is supported but slow).")
+    run_parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    run_parser.add_argument("--output", help="JSON report path (default: benchmarks/results/benchmark_<timestamp>.json).")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--missing-rate", type=float, default=0.0,
+                            help="Share of feature cells blanked in the synthetic data, to exercise imputation.")
+    run_parser.add_argument("--search-strategy", default="random", choices=["grid", "random", "halving"])
+    run_parser.add_argument("--n-iter", type=int, default=5)
+    run_parser.add_argument("--n-jobs", type=int, default=-1)
+    run_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    run_parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum time spent per predict batch size.")
+    run_parser.add_argument("--max-repeats", type=int, default=1000)
+    run_parser.add_argument("--mongo", action="store_true", help="Also time the export from the Mongo collection.")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two JSON reports.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.2,
+                                help="Relative slowdown above which a benchmark counts as a regression.")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,65 @@
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.constant.training_pipeline import DATA_ARTIFACT_FORMAT, MONGO_CONTENT_HASH_FIELD, SCHEMA_FILE_PATH
 from networksecurity.entity.config_entity import DataIngetionConfig
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file, read_dataframe, write_dataframe, get_schema_dtypes
+from networksecurity.utils.profiler import record_rows
+from networksecurity.utils.mongo_utils import get_collection
 
 import os
 import sys
-import pandas as pd
 import numpy as np
+import pandas as pd
 import pymongo
+from bson import ObjectId
+from datetime import datetime
 from typing import List
 from sklearn.model_selection import train_test_split
 
-from dotenv import load_dotenv
-load_dotenv()
+class FeatureStoreWriter:
+    """
+    Appends exported chunks to the feature store file, in the format given by its extension.
+
+    A chunk's columns are int8 or float32 depending on whether it has missing values,
+    so Parquet row groups are written with one fixed schema: columns in the data schema
+    take its dtype, with missing values stored as nulls, and any other column keeps the
+    type it had in the first chunk.
+    """
+    def __init__(self, file_path: str, schema_dtypes: dict = None):
+        self.file_path = file_path
+        self.schema_dtypes = schema_dtypes or {}
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._parquet_writer = None
+
+    def _get_parquet_schema(self, table):
+        import pyarrow as pa
+        fields = []
+        for field in table.schema:
+            if field.name in self.schema_dtypes:
+                field = pa.field(field.name, pa.from_numpy_dtype(np.dtype(self.schema_dtypes[field.name])))
+            fields.append(field)
+        return pa.schema(fields)
+
+    def write(self, chunk: pd.DataFrame):
+        if self.file_path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.file_path, self._get_parquet_schema(table))
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        else:
+            first_chunk = self.chunks_written == 0
+            chunk.to_csv(self.file_path, mode="w" if first_chunk else "a", header=first_chunk, index=False)
+        self.rows_written += len(chunk)
+        self.chunks_written += 1
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
 
-MONGO_DB_URL = os.getenv("MONGO_DB_URL")
 
 class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngetionConfig):
@@ -23,28 +68,177 @@ class DataIngestion:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
     
-    def export_collection_as_dataframe(self):
+    @staticmethod
+    def downcast_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Types the frame compactly: "na"-style strings become NaN, complete columns
+        are downcast to int8 and the rest to float32.
+        """
         try:
-            database_name = self.data_ingestion_config.database_name
-            collection_name = self.data_ingestion_config.collection_name
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL)
-            collection = self.mongo_client[database_name][collection_name]
+            for column in df.columns:
+                series = pd.to_numeric(df[column], errors="coerce")
+                df[column] = pd.to_numeric(series, downcast="float" if series.isna().any() else "integer")
+            return df
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def iter_collection_chunks(self, since_id: str = None):
+        """
+        Streams the collection in cursor batches with `_id` and the loader's content hash projected
+        out on the server, yielding each batch as a typed DataFrame. With `since_id`, only documents
+        with a greater `_id` are read, in `_id` order, and the last `_id` seen is kept in
+        `self.last_exported_id`. An empty collection yields one empty frame.
+        """
+        database_name = self.data_ingestion_config.database_name
+        collection_name = self.data_ingestion_config.collection_name
+        batch_size = self.data_ingestion_config.export_batch_size
+        collection = get_collection(database_name, collection_name)
 
-            df = pd.DataFrame(list(collection.find()))
+        track_id = since_id is not None or self.data_ingestion_config.incremental
+        if track_id:
+            query = {"_id": {"$gt": ObjectId(since_id)}} if since_id else {}
+            cursor = collection.find(query, {MONGO_CONTENT_HASH_FIELD: 0}, batch_size=batch_size).sort("_id", pymongo.ASCENDING)
+        else:
+            cursor = collection.find({}, {"_id": 0, MONGO_CONTENT_HASH_FIELD: 0}, batch_size=batch_size)
 
-            if "_id" in df.columns.to_list():
-               df = df.drop(columns=["_id"], axis=1)
-               df.replace({"na":np.nan, "NaN":np.nan, "nan":np.nan},inplace=True)
+        self.last_exported_id = since_id
+        columns = None
+        records = []
+        for record in cursor:
+            if track_id:
+                self.last_exported_id = str(record.pop("_id"))
+            records.append(record)
+            if len(records) < batch_size:
+                continue
+            chunk = self._export_chunk(records, columns)
+            columns = chunk.columns.to_list()
+            records = []
+            yield chunk
+        if records or columns is None:
+            yield self._export_chunk(records, columns)
+
+    def _open_feature_store_writer(self) -> FeatureStoreWriter:
+        feature_store_file_path = self.data_ingestion_config.feature_store_file_path
+        os.makedirs(os.path.dirname(feature_store_file_path), exist_ok=True)
+        return FeatureStoreWriter(feature_store_file_path, get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH)))
+
+    def export_collection_as_dataframe(self, write_feature_store: bool = False, since_id: str = None) -> pd.DataFrame:
+        """
+        Reads the collection into one DataFrame, batch by batch (see `iter_collection_chunks`).
+        When `write_feature_store` is set, every batch is also appended to the feature store file.
+        """
+        try:
+            writer = self._open_feature_store_writer() if write_feature_store else None
+            chunks = []
+            try:
+                for chunk in self.iter_collection_chunks(since_id):
+                    if writer is not None:
+                        writer.write(chunk)
+                    chunks.append(chunk)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            df = pd.concat(chunks, ignore_index=True)
+            logging.info(f"Exported {len(df)} records from {self.data_ingestion_config.database_name}."
+                         f"{self.data_ingestion_config.collection_name} in {len(chunks)} batches")
             return df
         except Exception as e:
             raise NetworkSecurityException(e, sys)
-    
+
+    def export_collection_to_feature_store(self) -> int:
+        """
+        Streams the collection into the feature store file without keeping the batches,
+        so memory is bounded by one batch. Returns the number of rows written.
+        """
+        try:
+            writer = self._open_feature_store_writer()
+            try:
+                for chunk in self.iter_collection_chunks():
+                    writer.write(chunk)
+            finally:
+                writer.close()
+            logging.info(f"Streamed {writer.rows_written} records from {self.data_ingestion_config.database_name}."
+                         f"{self.data_ingestion_config.collection_name} to {writer.file_path} in {writer.chunks_written} batches")
+            return writer.rows_written
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_data_fingerprint(self) -> dict:
+        """
+        Cheap summary of the collection contents: document count and highest `_id`.
+        Both come from collection metadata and the `_id` index, so no documents are scanned.
+        In-place updates of existing documents do not change the fingerprint.
+        """
+        try:
+            collection = get_collection(self.data_ingestion_config.database_name, self.data_ingestion_config.collection_name)
+            last_record = collection.find_one({}, {"_id": 1}, sort=[("_id", pymongo.DESCENDING)])
+            return {
+                "database": self.data_ingestion_config.database_name,
+                "collection": self.data_ingestion_config.collection_name,
+                "count": collection.estimated_document_count(),
+                "max_id": str(last_record["_id"]) if last_record else None,
+            }
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _export_chunk(self, records: List[dict], columns: List[str]) -> pd.DataFrame:
+        return DataIngestion.downcast_dataframe(pd.DataFrame.from_records(records, columns=columns))
+
+    def read_ingestion_state(self) -> dict:
+        try:
+            state_file_path = self.data_ingestion_config.ingestion_state_file_path
+            if not os.path.exists(state_file_path):
+                return {"last_id": None, "partitions": [], "rows": 0}
+            return read_yaml_file(state_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def export_new_records_to_partition(self) -> dict:
+        """
+        Pulls the documents added since the last run into a new feature store partition
+        and advances the high-water mark. Returns the updated ingestion state.
+        """
+        try:
+            state = self.read_ingestion_state()
+            dataframe = self.export_collection_as_dataframe(since_id=state["last_id"])
+            if len(dataframe) == 0:
+                logging.info(f"No new records since {state['last_id']}")
+                return state
+
+            partition_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.{DATA_ARTIFACT_FORMAT}"
+            partition_path = os.path.join(self.data_ingestion_config.persistent_feature_store_dir, partition_name)
+            write_dataframe(partition_path, dataframe)
+
+            state = {
+                "last_id": self.last_exported_id,
+                "partitions": state["partitions"] + [partition_name],
+                "rows": state["rows"] + len(dataframe),
+            }
+            # Write the new state aside and swap it in so a crash never leaves a torn state file.
+            state_file_path = self.data_ingestion_config.ingestion_state_file_path
+            write_yaml_file(state_file_path + ".tmp", state)
+            os.replace(state_file_path + ".tmp", state_file_path)
+            logging.info(f"Appended {len(dataframe)} new records to partition {partition_name}")
+            return state
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def read_feature_store_partitions(self, state: dict) -> pd.DataFrame:
+        try:
+            feature_store_dir = self.data_ingestion_config.persistent_feature_store_dir
+            if not state["partitions"]:
+                raise ValueError(f"No feature store partitions in {feature_store_dir}: collection "
+                                 f"{self.data_ingestion_config.database_name}.{self.data_ingestion_config.collection_name} "
+                                 f"has had no records to ingest")
+            partitions = [read_dataframe(os.path.join(feature_store_dir, name)) for name in state["partitions"]]
+            return DataIngestion.downcast_dataframe(pd.concat(partitions, ignore_index=True))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
     def export_data_to_feature_store(self, dataframe: pd.DataFrame):
         try:
-            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
+            write_dataframe(self.data_ingestion_config.feature_store_file_path, dataframe)
             return dataframe
         except Exception as e:
             raise NetworkSecurityException(e, sys)
@@ -56,16 +250,9 @@ class DataIngestion:
                     random_state=42)
             logging.info(f"Performed train test split on dataframe")
 
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-            
             logging.info(f"Creating train and test files ")
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path, index=False, header=True)
-            
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path, index=False, header=True
-            )
+            write_dataframe(self.data_ingestion_config.training_file_path, train_set)
+            write_dataframe(self.data_ingestion_config.testing_file_path, test_set)
             logging.info(f"Train and test files created sucessfully")
         except Exception as e:
             raise NetworkSecurityException(e, sys)
@@ -73,8 +260,17 @@ class DataIngestion:
         
     def initiate_data_ingestion(self):
         try:
-           dataframe = self.export_collection_as_dataframe()
-           dataframe = self.export_data_to_feature_store(dataframe)
+           if self.data_ingestion_config.incremental:
+               state = self.export_new_records_to_partition()
+               dataframe = self.read_feature_store_partitions(state)
+           elif self.data_ingestion_config.stream_to_feature_store:
+               # The split needs every row at once, so the frame is only built here, from the feature store.
+               self.export_collection_to_feature_store()
+               dataframe = DataIngestion.downcast_dataframe(read_dataframe(self.data_ingestion_config.feature_store_file_path))
+           else:
+               dataframe = self.export_collection_as_dataframe()
+               dataframe = self.export_data_to_feature_store(dataframe)
+           record_rows(len(dataframe))
            self.split_data_as_train_test(dataframe)
            data_ingestion_artifact = DataIngestionArtifact(
                train_file_path=self.data_ingestion_config.training_file_path,
@@ -3,9 +3,14 @@ import numpy as np
 import pandas as pd
 from sklearn.impute import KNNImputer
 from sklearn.pipeline import Pipeline
+from sklearn import config_context
+from sklearn.utils import gen_batches
+from sklearn.utils.parallel import Parallel, delayed
 
 from networksecurity.constant.training_pipeline import TARGET_COLUMN
 from networksecurity.constant.training_pipeline import DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.constant.training_pipeline import DATA_TRANSFORMATION_SERVING_IMPUTER, DATA_TRANSFORMATION_IMPUTER_LOOKUP_TABLE_SIZE
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH, DATA_COMPACT_DTYPES
 
 from networksecurity.entity.artifact_entity import (
     DataTransformationArtifact,
@@ -15,7 +20,16 @@ from networksecurity.entity.config_entity import DataTransformationConfig
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 
-from networksecurity.utils.main_utils import save_numpy_array_data, save_object
+from networksecurity.utils.main_utils import save_numpy_array_data, save_object, read_dataframe, read_yaml_file
+from networksecurity.utils.main_utils import write_yaml_file
+from networksecurity.utils.main_utils import get_schema_dtypes, compact_array, get_n_jobs_budget
+from networksecurity.utils.ml_utils.drift import build_drift_baseline
+from networksecurity.utils.ml_utils.serving_imputer import ServingImputer
+from networksecurity.utils.profiler import record_rows
+
+
+# Imputing one row holds a row of distances to every fitted row plus a few temporaries of the same size.
+DISTANCE_ROW_COPIES = 4
 
 
 class DataTransformation:
@@ -24,13 +38,14 @@ class DataTransformation:
         try:
             self.data_transformation_config = data_transformation_config
             self.data_validation_artifacts = data_validation_artifacts
+            self.schema_dtypes = get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH)) if DATA_COMPACT_DTYPES else None
         except Exception as e:
             raise NetworkSecurityException(e, sys)
     
     @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(file_path: str, schema_dtypes: dict = None) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_dataframe(file_path, schema_dtypes)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
         
@@ -43,43 +58,120 @@ class DataTransformation:
             return pipeline
         except Exception as e:
             raise NetworkSecurityException(e, sys)
+
+    def get_serving_pipeline(self) -> Pipeline:
+        """
+        Same imputation as the training pipeline, with prediction-time cost independent of the training set size.
+        """
+        try:
+            imputer = ServingImputer(
+                n_neighbors=DATA_TRANSFORMATION_IMPUTER_PARAMS["n_neighbors"],
+                weights=DATA_TRANSFORMATION_IMPUTER_PARAMS["weights"],
+                lookup_table_size=DATA_TRANSFORMATION_IMPUTER_LOOKUP_TABLE_SIZE,
+            )
+            return Pipeline([("imputer", imputer)])
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
     
 
         
+    def transform_in_chunks(self, preprocessor: Pipeline, dataframe: pd.DataFrame, n_fitted_rows: int) -> np.ndarray:
+        """
+        Applies a fitted imputation pipeline in bounded-memory row chunks spread over a worker pool.
+
+        Complete rows need no neighbour search and are transformed in one call. Rows
+        with missing values are split into chunks sized so that every worker stays
+        within its share of `max_memory_mb`, and sklearn's working_memory is set to
+        the same share so the distance computation inside each chunk is bounded too.
+        Each row is imputed independently, so the result equals a one-shot transform.
+        """
+        try:
+            n_jobs = get_n_jobs_budget(self.data_transformation_config.n_jobs)
+            worker_memory_mb = self.data_transformation_config.max_memory_mb / n_jobs
+            row_bytes = DISTANCE_ROW_COPIES * 8 * max(n_fitted_rows, 1)
+            max_chunk_rows = max(1, int(worker_memory_mb * 2 ** 20 // row_bytes))
+
+            incomplete = dataframe.isna().to_numpy().any(axis=1)
+            incomplete_rows = np.flatnonzero(incomplete)
+            complete_rows = np.flatnonzero(~incomplete)
+            # At least one chunk per worker so the pool is kept busy.
+            chunk_rows = min(max_chunk_rows, max(1, -(-len(incomplete_rows) // n_jobs)))
+            chunks = [incomplete_rows[batch] for batch in gen_batches(len(incomplete_rows), chunk_rows)] if len(incomplete_rows) else []
+            logging.info(f"Imputing {len(incomplete_rows)} incomplete rows in {len(chunks)} chunks of up to "
+                         f"{chunk_rows} rows across {min(n_jobs, len(chunks))} workers")
+
+            with config_context(working_memory=worker_memory_mb):
+                if len(chunks) <= 1 or n_jobs == 1:
+                    results = [preprocessor.transform(dataframe.iloc[rows]) for rows in chunks]
+                else:
+                    results = Parallel(n_jobs=min(n_jobs, len(chunks)), backend="loky")(
+                        delayed(preprocessor.transform)(dataframe.iloc[rows]) for rows in chunks)
+            if len(complete_rows):
+                chunks.append(complete_rows)
+                results.append(preprocessor.transform(dataframe.iloc[complete_rows]))
+            if not results:
+                return preprocessor.transform(dataframe)
+
+            transformed = np.empty((len(dataframe), results[0].shape[1]), dtype=results[0].dtype)
+            for rows, result in zip(chunks, results):
+                transformed[rows] = result
+            return transformed
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         try:
             logging.info("Starting data transformation process.")
-            train_df = DataTransformation.read_data(self.data_validation_artifacts.valid_test_file_path)
-            test_df = DataTransformation.read_data(self.data_validation_artifacts.valid_test_file_path)
+            train_df = DataTransformation.read_data(self.data_validation_artifacts.valid_train_file_path, self.schema_dtypes)
+            test_df = DataTransformation.read_data(self.data_validation_artifacts.valid_test_file_path, self.schema_dtypes)
+            record_rows(len(train_df) + len(test_df))
             
             #Training dataframe
-            input_features_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_features_train_df = train_df.drop(columns=[TARGET_COLUMN])
             traget_feature_train_df = train_df[TARGET_COLUMN]
             traget_feature_train_df = traget_feature_train_df.replace(-1, 0) #Replacing -1 with 0 
             #Testing dataframe
-            input_features_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_features_test_df = test_df.drop(columns=[TARGET_COLUMN])
             target_feature_test_df = test_df[TARGET_COLUMN]
             target_feature_test_df = target_feature_test_df.replace(-1, 0)
 
+            if DATA_COMPACT_DTYPES:
+                # KNNImputer works in float; float32 keeps its copy of the training data at half the size.
+                input_features_train_df = input_features_train_df.astype(np.float32)
+                input_features_test_df = input_features_test_df.astype(np.float32)
+
             preprocessor_object = self.get_data_transformation_pipeline()
-            transformed_input_features_train = preprocessor_object.fit_transform(input_features_train_df)
-            transformed_input_features_test = preprocessor_object.transform(input_features_test_df)
+            preprocessor_object.fit(input_features_train_df)
+            transformed_input_features_train = self.transform_in_chunks(preprocessor_object, input_features_train_df, len(input_features_train_df))
+            transformed_input_features_test = self.transform_in_chunks(preprocessor_object, input_features_test_df, len(input_features_train_df))
 
             train_arr = np.column_stack((transformed_input_features_train, traget_feature_train_df))
             test_arr = np.column_stack((transformed_input_features_test, target_feature_test_df))
+            if DATA_COMPACT_DTYPES:
+                # int8 unless imputation produced fractional values, float32 otherwise.
+                train_arr = compact_array(train_arr)
+                test_arr = compact_array(test_arr)
 
             #saving numpy array data
             save_numpy_array_data(self.data_transformation_config.transformed_train_file_path, array=train_arr)
             save_numpy_array_data(self.data_transformation_config.transformed_test_file_path, array=test_arr)
+            if DATA_TRANSFORMATION_SERVING_IMPUTER:
+                #the deployed preprocessor only needs transform, so it is swapped for the serving-optimized one
+                preprocessor_object = self.get_serving_pipeline().fit(input_features_train_df)
+
             #saving preprocessor object
             save_object(self.data_transformation_config.transformed_object_file_path, preprocessor_object)
-            save_object("final_model/preprocessor.pkl",preprocessor_object)
+            #saving the raw feature histograms the serving drift monitor compares live traffic against;
+            #it is published with the model version trained on this data, never on its own
+            drift_baseline = build_drift_baseline(input_features_train_df)
+            write_yaml_file(self.data_transformation_config.drift_baseline_file_path, drift_baseline)
 
             #preparing artifacts
             data_transformation_artifact = DataTransformationArtifact(
                 transformed_object_file_path= self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path= self.data_transformation_config.transformed_train_file_path,
-                transformed_test_file_path= self.data_transformation_config.transformed_test_file_path 
+                transformed_test_file_path= self.data_transformation_config.transformed_test_file_path,
+                drift_baseline_file_path= self.data_transformation_config.drift_baseline_file_path
             )
             return data_transformation_artifact
 
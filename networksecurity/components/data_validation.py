@@ -1,7 +1,9 @@
 from networksecurity.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from networksecurity.entity.config_entity import DataValidationConfig
-from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
-from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH, DATA_COMPACT_DTYPES
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file, read_dataframe, copy_data_file, get_schema_dtypes
+from networksecurity.utils.ml_utils.drift import compute_histograms, compare_histograms
+from networksecurity.utils.profiler import record_rows
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from scipy.stats import ks_2samp
@@ -17,13 +19,14 @@ class DataValidation:
             self.data_validation_config = data_validation_config
             self.schema = read_yaml_file(SCHEMA_FILE_PATH)
             self.numeric_columns = self.schema['numerical_columns']
+            self.schema_dtypes = get_schema_dtypes(self.schema) if DATA_COMPACT_DTYPES else None
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
     @staticmethod
-    def read_data(file_path: str) -> pd.DataFrame:
+    def read_data(file_path: str, schema_dtypes: dict = None) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return read_dataframe(file_path, schema_dtypes)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
@@ -48,14 +51,26 @@ class DataValidation:
             drift_report = {}
             drift_status = True
 
-            for column in base_df.columns:
-                p_value = ks_2samp(base_df[column], current_df[column]).pvalue
-                drift_found = p_value < threshold
+            # One histogram pass per frame gives every column's statistics at once.
+            base_counts = compute_histograms(base_df[base_df.columns].to_numpy())
+            current_counts = compute_histograms(current_df[base_df.columns].to_numpy())
+            drift_statistics = compare_histograms(base_counts, current_counts)
+
+            for index, column in enumerate(base_df.columns):
+                if base_counts[index, -1] or current_counts[index, -1]:
+                    # Values outside the ternary categories: fall back to the exact test on the raw column.
+                    p_value = ks_2samp(base_df[column], current_df[column]).pvalue
+                else:
+                    p_value = drift_statistics["ks_p_value"][index]
+                drift_found = bool(p_value < threshold)
                 drift_status = drift_status and not drift_found  # If drift found, set to False
 
                 drift_report[column] = {
                     "p_value": float(p_value),
-                    "drift_detected": drift_found
+                    "drift_detected": drift_found,
+                    "ks_statistic": float(drift_statistics["ks_statistic"][index]),
+                    "chi2_p_value": float(drift_statistics["chi2_p_value"][index]),
+                    "psi": float(drift_statistics["psi"][index]),
                 }
 
             write_yaml_file(self.data_validation_config.drift_report_file_path, drift_report)
@@ -68,8 +83,9 @@ class DataValidation:
             train_file_path = self.data_ingestion_artifact.train_file_path
             test_file_path = self.data_ingestion_artifact.test_file_path
 
-            train_df = DataValidation.read_data(train_file_path)
-            test_df = DataValidation.read_data(test_file_path)
+            train_df = DataValidation.read_data(train_file_path, self.schema_dtypes)
+            test_df = DataValidation.read_data(test_file_path, self.schema_dtypes)
+            record_rows(len(train_df) + len(test_df))
 
             if not self.validate_number_of_columns(train_df):
                 raise NetworkSecurityException("Train data columns do not match schema", sys)
@@ -83,9 +99,9 @@ class DataValidation:
 
             drift_status = self.validate_data_drift(train_df, test_df)
 
-            os.makedirs(os.path.dirname(self.data_validation_config.valid_train_file_path), exist_ok=True)
-            train_df.to_csv(self.data_validation_config.valid_train_file_path, index=False)
-            test_df.to_csv(self.data_validation_config.valid_test_file_path, index=False)
+            # The validated data is unchanged, so hand the files on as they are instead of re-serializing them.
+            copy_data_file(train_file_path, self.data_validation_config.valid_train_file_path)
+            copy_data_file(test_file_path, self.data_validation_config.valid_test_file_path)
 
             return DataValidationArtifact(
                 validation_status=drift_status,
@@ -1,17 +1,22 @@
 import os, sys
+import dataclasses
+import numpy as np
 import mlflow
 import mlflow.sklearn
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier, RandomForestClassifier
 
+from networksecurity.constant.training_pipeline import FINAL_MODEL_DRIFT_BASELINE_FILE_NAME
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact
 from networksecurity.entity.config_entity import ModelTrainerConfig
-from networksecurity.utils.main_utils import save_object, load_object, load_numpy_array_data, evaluate_model
+from networksecurity.utils.main_utils import load_object, load_numpy_array_data, evaluate_model
 from networksecurity.utils.ml_utils.metrics import get_classification_score
-from networksecurity.utils.ml_utils.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model_artifact import save_model_artifact, publish_model_artifact
+from networksecurity.utils.ml_utils.compiled_model import compile_model, count_mismatches
+from networksecurity.utils.profiler import record_rows
 
 
 class ModelTrainer:
@@ -33,10 +38,12 @@ class ModelTrainer:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def train_model(self, X_train, y_train, X_test, y_test) -> ModelTrainerArtifact:
+    @staticmethod
+    def get_candidate_models() -> tuple:
+        """
+        Returns the candidate models and their hyperparameter grids, keyed by model name.
+        """
         try:
-            logging.info("Starting model training and hyperparameter tuning...")
-
             models = {
                 "Random Forest": RandomForestClassifier(verbose=1),
                 "Decision Tree": DecisionTreeClassifier(),
@@ -63,16 +70,38 @@ class ModelTrainer:
                     'n_estimators': [8, 16, 32, 64, 128, 256]
                 }
             }
+            return models, params
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            model_report = evaluate_model(X_train, y_train, X_test, y_test, models, params)
+    def get_extra_model_files(self) -> dict:
+        """
+        Files shipped inside the model artifact: the drift baseline of the data the model was trained on.
+        """
+        drift_baseline_file_path = self.data_transformaton_artifact.drift_baseline_file_path
+        if drift_baseline_file_path is None or not os.path.exists(drift_baseline_file_path):
+            return {}
+        return {FINAL_MODEL_DRIFT_BASELINE_FILE_NAME: drift_baseline_file_path}
 
-            best_model_name = max(model_report, key=model_report.get)
-            best_model_score = model_report[best_model_name]
-            best_model = models[best_model_name]
+    def train_model(self, X_train, y_train, X_test, y_test) -> ModelTrainerArtifact:
+        try:
+            logging.info("Starting model training and hyperparameter tuning...")
+
+            models, params = self.get_candidate_models()
 
-            logging.info(f"Best Model: {best_model_name} with score: {best_model_score}")
+            model_report = evaluate_model(X_train, y_train, X_test, y_test, models, params,
+                                          n_jobs=self.model_trainer_config.n_jobs,
+                                          cv=self.model_trainer_config.cv_folds,
+                                          search_strategy=self.model_trainer_config.search_strategy,
+                                          n_iter=self.model_trainer_config.search_n_iter,
+                                          halving_factor=self.model_trainer_config.halving_factor)
 
-            best_model.fit(X_train, y_train)
+            best_model_name = max(model_report, key=lambda name: model_report[name]["test_score"])
+            best_model_score = model_report[best_model_name]["test_score"]
+            best_model = model_report[best_model_name]["model"]
+
+            logging.info(f"Best Model: {best_model_name} with score: {best_model_score} "
+                         f"(cv score: {model_report[best_model_name]['cv_score']})")
 
             # Train score
             y_train_pred = best_model.predict(X_train)
@@ -84,20 +113,34 @@ class ModelTrainer:
             classification_test_metric = get_classification_score(y_true=y_test, y_pred=y_test_pred)
             self.track_mlflow(best_model_name + " - test", best_model, classification_test_metric)
 
-            # Save the final model with preprocessor
-            model_dir_path = os.path.dirname(self.model_trainer_config.trained_model_file_path)
-            os.makedirs(model_dir_path, exist_ok=True)
-
+            # Compile the model for serving; it is only shipped if it agrees with sklearn on every row
+            compiled_model = compile_model(best_model)
+            if compiled_model is not None:
+                mismatches = count_mismatches(compiled_model, best_model, X_train) + \
+                    count_mismatches(compiled_model, best_model, X_test)
+                if mismatches:
+                    logging.warning(f"Compiled {best_model_name} disagreed with it on {mismatches} rows; "
+                                    f"serving with scikit-learn instead")
+                    compiled_model = None
+
+            # Save the final model with preprocessor once, then publish that artifact for serving
+            model_artifact_dir = os.path.dirname(self.model_trainer_config.trained_model_file_path)
             preprocessor = load_object(file_path=self.data_transformaton_artifact.transformed_object_file_path)
-            final_model = NetworkModel(preprocessor=preprocessor, model=best_model)
-            save_object(self.model_trainer_config.trained_model_file_path, obj=final_model)
-            save_object("final_model/model.pkl",best_model)
+            save_model_artifact(model_artifact_dir, preprocessor, best_model,
+                                metadata={"model_name": best_model_name,
+                                          "test_f1_score": float(classification_test_metric.f1_score)},
+                                compiled_model=compiled_model, extra_files=self.get_extra_model_files())
+            publish_model_artifact(model_artifact_dir)
 
             # Return artifact
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 train_metric_artifact=classification_train_metric,
-                test_metric_artifact=classification_test_metric
+                test_metric_artifact=classification_test_metric,
+                search_strategy=self.model_trainer_config.search_strategy,
+                n_fits=sum(report["n_fits"] for report in model_report.values()),
+                model_metric_artifacts=[dataclasses.replace(report["metrics"], name=name)
+                                        for name, report in model_report.items()],
             )
 
             logging.info(f"Model training complete. Artifact: {model_trainer_artifact}")
@@ -115,8 +158,10 @@ class ModelTrainer:
             train_arr = load_numpy_array_data(train_file_path)
             test_arr = load_numpy_array_data(test_file_path)
 
-            X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
-            X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+            # The tree models fit on float32; handing them float32 saves a converted copy per fit.
+            X_train, y_train = train_arr[:, :-1].astype(np.float32), train_arr[:, -1]
+            X_test, y_test = test_arr[:, :-1].astype(np.float32), test_arr[:, -1]
+            record_rows(len(X_train) + len(X_test))
 
             return self.train_model(X_train, y_train, X_test, y_test)
 
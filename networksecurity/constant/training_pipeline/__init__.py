@@ -10,6 +10,11 @@ DATA_INGESTION_COLLECTION_NAME:str = "network_data"
 DATA_INGESTION_FEATURE_STORE_DIR:str = "feature_store"
 DATA_INGESTION_INGESTED_DIR:str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO:float = 0.2
+DATA_INGESTION_EXPORT_BATCH_SIZE:int = 10_000
+DATA_INGESTION_STREAM_TO_FEATURE_STORE:bool = True
+DATA_INGESTION_INCREMENTAL:bool = False
+DATA_INGESTION_PERSISTENT_FEATURE_STORE_DIR:str = "feature_store"
+DATA_INGESTION_STATE_FILE_NAME:str = "ingestion_state.yaml"
 
 """"
 Defining the common constants for training pipeline
@@ -22,8 +27,50 @@ FILE_NAME:str = "phisingData.csv"
 TRAIN_FILE_NAME:str = "train.csv"
 TEST_FILE_NAME:str = "test.csv"
 
+# File format of the data handed between stages: "csv", "parquet", "feather" or "npy".
+DATA_ARTIFACT_FORMAT:str = "parquet"
+# Store data with the compact dtypes declared in the schema (int8 for the ternary features).
+DATA_COMPACT_DTYPES:bool = True
+
 SCHEMA_FILE_PATH:str = os.path.join("data_schema", "schema.yaml")
 
+# Stage artifacts are reused when a stage's inputs hash to a key seen before; manifests live under Artifact/.cache.
+PIPELINE_CACHE_ENABLED:bool = True
+PIPELINE_CACHE_DIR_NAME:str = ".cache"
+
+# Per-stage and per-model timings and memory of a run, written to the run's artifact directory.
+RUN_REPORT_FILE_NAME:str = "run_report.yaml"
+
+# Background training jobs run in a spawned process at this niceness so serving keeps priority.
+TRAINING_JOB_NICENESS:int = 10
+TRAINING_JOB_HISTORY_SIZE:int = 20
+# Held by the training process for its whole run, so server workers never train at the same time.
+TRAINING_JOB_LOCK_FILE_NAME:str = ".training.lock"
+
+# Shared MongoDB client settings (networksecurity/utils/mongo_utils.py); the URL comes from MONGO_DB_URL.
+MONGO_MAX_POOL_SIZE:int = 50
+MONGO_MIN_POOL_SIZE:int = 0
+MONGO_MAX_IDLE_TIME_MS:int = 300_000
+MONGO_SERVER_SELECTION_TIMEOUT_MS:int = 10_000
+
+# push_data.py loads the CSV into MongoDB in batches of this many rows, upserting on a per-row content hash.
+MONGO_LOAD_BATCH_SIZE:int = 5_000
+MONGO_LOAD_MAX_WORKERS:int = 4
+MONGO_CONTENT_HASH_FIELD:str = "content_hash"
+
+# Logs are written as JSON lines by a background thread to logs/<LOG_FILE_PREFIX>_<pid>.log, rotated by size.
+LOG_DIR_NAME:str = "logs"
+LOG_FILE_PREFIX:str = "networksecurity"
+LOG_LEVEL:str = os.getenv("LOG_LEVEL", "INFO")
+LOG_MAX_BYTES:int = 10 * 1024 * 1024
+LOG_BACKUP_COUNT:int = 5
+# Records waiting for the writer thread; new records are dropped (and counted) while it is full.
+LOG_QUEUE_SIZE:int = 10_000
+# INFO and DEBUG records of the serving logger are kept at most this many times per second per call site;
+# 0 keeps them all. Other loggers are never sampled.
+LOG_SAMPLE_MAX_PER_SECOND:int = 10
+LOG_SERVING_LOGGER_NAME:str = "networksecurity.serving"
+
 SAVED_MODEL_DIR = os.path.join("saved_models")
 MODEL_FILE_NAME = "model.pkl"
 
@@ -51,18 +98,80 @@ DATA_TRANSFORMATION_IMPUTER_PARAMS: dict = {
     "n_neighbors": 3,
     "weights": "uniform"
 }
+# Save a ServingImputer fitted on the same data as the preprocessor that is deployed with the model.
+DATA_TRANSFORMATION_SERVING_IMPUTER: bool = True
+DATA_TRANSFORMATION_IMPUTER_LOOKUP_TABLE_SIZE: int = 100_000
+# Imputation runs in row chunks across this many workers, within this much memory in total.
+DATA_TRANSFORMATION_N_JOBS: int = -1
+DATA_TRANSFORMATION_MAX_MEMORY_MB: int = 2048
 
 """
 Defining the model trainer related constants
 """
 MODEL_TRAINER_DIR_NAME:str = "model_trainer"
 MODEL_TRAINER_TRAINED_MODEL_DIR:str = "trained_model"
-MODEL_TRAINER_TRAINED_MODEL_NAME:str = "model.pkl"
+# The trained model is a versioned artifact directory (see utils/ml_utils/model_artifact.py); this is its manifest.
+MODEL_TRAINER_TRAINED_MODEL_NAME:str = "manifest.yaml"
 MODEL_TRAINER_EXPECTED_SCORE:float = 0.6
 MODEL_TRAINER_OVERFITTING_UNDERFITTING_THERSHOLD:float = 0.5
+MODEL_TRAINER_N_JOBS:int = -1
+MODEL_TRAINER_CV_FOLDS:int = 3
+MODEL_TRAINER_SEARCH_STRATEGY:str = "grid"
+MODEL_TRAINER_SEARCH_STRATEGIES:tuple = ("grid", "random", "halving")
+MODEL_TRAINER_SEARCH_N_ITER:int = 20
+MODEL_TRAINER_HALVING_FACTOR:int = 3
 
 TRAINING_BUCKET_NAME = "networksecurity"
 
+"""
+Defining the constants for model serving
+"""
+FINAL_MODEL_DIR:str = "final_model"
+FINAL_MODEL_PREPROCESSOR_FILE_NAME:str = "preprocessor.pkl"
+FINAL_MODEL_FILE_NAME:str = "model.pkl"
+# Published models live in final_model/versions/<version>; the current one is named in final_model/current.yaml.
+# The pickle files above are only read when no versioned model has been published.
+FINAL_MODEL_VERSIONS_DIR_NAME:str = "versions"
+FINAL_MODEL_CURRENT_FILE_NAME:str = "current.yaml"
+FINAL_MODEL_KEEP_VERSIONS:int = 3
+MODEL_ARTIFACT_FORMAT_VERSION:int = 1
+MODEL_ARTIFACT_MANIFEST_FILE_NAME:str = "manifest.yaml"
+MODEL_ARTIFACT_MODEL_FILE_NAME:str = "model.joblib"
+MODEL_ARTIFACT_PREPROCESSOR_FILE_NAME:str = "preprocessor.joblib"
+# Arrays in the artifact are memory-mapped read-only, so worker processes share one copy of their pages.
+MODEL_ARTIFACT_MMAP_MODE:str = "r"
+MODEL_ARTIFACT_COMPILED_FILE_PREFIX:str = "compiled_"
+# "compiled" serves tree ensembles from their flat-array form (utils/ml_utils/compiled_model.py) when the
+# artifact has one, "sklearn" always calls the estimator. With verify on, every compiled prediction is
+# checked against scikit-learn and scikit-learn's answer is served on a mismatch.
+MODEL_INFERENCE_BACKEND:str = "compiled"
+MODEL_INFERENCE_VERIFY:bool = False
+MODEL_REGISTRY_RELOAD_CHECK_INTERVAL:float = 5.0
+PREDICTION_MICRO_BATCH_MAX_SIZE:int = 256
+PREDICTION_MICRO_BATCH_MAX_LATENCY:float = 0.005
+# Served predictions are cached per distinct feature row (see utils/ml_utils/prediction_cache.py); 0 rows disables it.
+PREDICTION_CACHE_MAX_ROWS:int = 100_000
+PREDICTION_CACHE_TTL_SECONDS:float = 3600.0
+FINAL_MODEL_DRIFT_BASELINE_FILE_NAME:str = "drift_baseline.yaml"
+DRIFT_MONITOR_WINDOW_ROWS:int = 1_000
+DRIFT_MONITOR_N_WINDOWS:int = 10
+DRIFT_MONITOR_PSI_THRESHOLD:float = 0.2
+# PSI on a handful of rows is mostly noise; no feature is reported as drifted until this many rows were observed.
+DRIFT_MONITOR_MIN_ROWS:int = 500
+
+"""
+Defining the constants for batch prediction
+"""
+BATCH_PREDICTION_OUTPUT_DIR:str = "prediction_output"
+BATCH_PREDICTION_OUTPUT_FILE_NAME:str = "predictions.csv"
+BATCH_PREDICTION_CHUNK_SIZE:int = 50_000
+BATCH_PREDICTION_N_WORKERS:int = os.cpu_count() or 1
+PREDICTION_COLUMN:str = "predicted_column"
+# Probability of the model's second class, written next to the label.
+PREDICTION_SCORE_COLUMN:str = "predicted_score"
+# Each threshold adds a "<PREDICTION_COLUMN>_at_<threshold>" label column computed from the same scores.
+BATCH_PREDICTION_THRESHOLDS:list = []
+
 
 
 
@@ -1,9 +1,20 @@
 from dataclasses import dataclass
+from typing import List
+
+@dataclass
+class StageMetricArtifact:
+    name: str
+    wall_time_seconds: float
+    cpu_time_seconds: float
+    peak_rss_mb: float
+    rows_processed: int = None
+    cached: bool = False
 
 @dataclass
 class DataIngestionArtifact:
     train_file_path: str
     test_file_path: str
+    stage_metric_artifact: StageMetricArtifact = None
 
 @dataclass
 class DataValidationArtifact:
@@ -13,12 +24,15 @@ class DataValidationArtifact:
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    stage_metric_artifact: StageMetricArtifact = None
 
 @dataclass
 class DataTransformationArtifact:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    drift_baseline_file_path: str = None
+    stage_metric_artifact: StageMetricArtifact = None
 
 @dataclass
 class ClassificationMetricArtifact:
@@ -31,4 +45,13 @@ class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
-    
\ No newline at end of file
+    search_strategy: str
+    n_fits: int
+    model_metric_artifacts: List[StageMetricArtifact] = None
+    stage_metric_artifact: StageMetricArtifact = None
+
+@dataclass
+class BatchPredictionArtifact:
+    output_file_path: str
+    rows_processed: int
+    chunks_processed: int
@@ -4,11 +4,23 @@ from networksecurity.constant import training_pipeline
 
 
 class TrainingPipelineConfig:
-    def __init__(self, timestamp: datetime =datetime.now()):
+    def __init__(self, timestamp: datetime = None,
+                 model_search_strategy: str = training_pipeline.MODEL_TRAINER_SEARCH_STRATEGY):
+        # Resolved per instance: cached artifacts must never be overwritten by a later run in the same process.
+        timestamp = timestamp or datetime.now()
         self.pipeline_name = training_pipeline.PIPELINE_NAME
         self.artifact = training_pipeline.ARTIFACT_DIR
         self.artifact_dir = os.path.join(self.artifact,timestamp.strftime("%m%d%Y%H%M%S"))
         self.timestamp:str = timestamp
+        self.cache_dir = os.path.join(self.artifact, training_pipeline.PIPELINE_CACHE_DIR_NAME)
+        self.run_report_file_path = os.path.join(self.artifact_dir, training_pipeline.RUN_REPORT_FILE_NAME)
+        self.model_search_strategy:str = model_search_strategy
+
+def get_data_file_name(file_name: str) -> str:
+    """
+    Swaps the .csv extension of a data file name for the configured artifact format.
+    """
+    return file_name.replace("csv", training_pipeline.DATA_ARTIFACT_FORMAT)
 
 class DataIngetionConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig):
@@ -16,17 +28,26 @@ class DataIngetionConfig:
             training_pipeline_config.artifact_dir,training_pipeline.DATA_INGESTION_DIR_NAME
         )
         self.feature_store_file_path:str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, training_pipeline.FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, get_data_file_name(training_pipeline.FILE_NAME)
         )
         self.training_file_path:str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TRAIN_FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, get_data_file_name(training_pipeline.TRAIN_FILE_NAME)
         )
         self.testing_file_path:str = os.path.join(
-            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, training_pipeline.TEST_FILE_NAME
+            self.data_ingestion_dir, training_pipeline.DATA_INGESTION_INGESTED_DIR, get_data_file_name(training_pipeline.TEST_FILE_NAME)
         )
         self.train_test_split_ratio:float = training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         self.database_name:str = training_pipeline.DATA_INGESTION_DATABASE_NAME
         self.collection_name:str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
+        self.export_batch_size:int = training_pipeline.DATA_INGESTION_EXPORT_BATCH_SIZE
+        self.stream_to_feature_store:bool = training_pipeline.DATA_INGESTION_STREAM_TO_FEATURE_STORE
+        self.incremental:bool = training_pipeline.DATA_INGESTION_INCREMENTAL
+        self.persistent_feature_store_dir:str = os.path.join(
+            training_pipeline.DATA_INGESTION_PERSISTENT_FEATURE_STORE_DIR, self.collection_name
+        )
+        self.ingestion_state_file_path:str = os.path.join(
+            self.persistent_feature_store_dir, training_pipeline.DATA_INGESTION_STATE_FILE_NAME
+        )
 
 class DataValidationConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig):
@@ -35,10 +56,10 @@ class DataValidationConfig:
         )
         self.valid_data_dir:str = os.path.join(self.data_validation_dir, training_pipeline.DATA_VALIDATION_VALID_DIR)
         self.invalid_data_dir:str = os.path.join(self.data_validation_dir, training_pipeline.DATA_VALIDATION_INVALID_DIR)
-        self.valid_train_file_path:str = os.path.join(self.valid_data_dir, training_pipeline.TRAIN_FILE_NAME)
-        self.valid_test_file_path:str = os.path.join(self.valid_data_dir, training_pipeline.TEST_FILE_NAME)
-        self.invalid_train_file_path:str = os.path.join(self.invalid_data_dir, training_pipeline.TRAIN_FILE_NAME)
-        self.invalid_test_file_path:str = os.path.join(self.invalid_data_dir, training_pipeline.TEST_FILE_NAME)
+        self.valid_train_file_path:str = os.path.join(self.valid_data_dir, get_data_file_name(training_pipeline.TRAIN_FILE_NAME))
+        self.valid_test_file_path:str = os.path.join(self.valid_data_dir, get_data_file_name(training_pipeline.TEST_FILE_NAME))
+        self.invalid_train_file_path:str = os.path.join(self.invalid_data_dir, get_data_file_name(training_pipeline.TRAIN_FILE_NAME))
+        self.invalid_test_file_path:str = os.path.join(self.invalid_data_dir, get_data_file_name(training_pipeline.TEST_FILE_NAME))
         self.drift_report_file_path:str = os.path.join(self.data_validation_dir, 
                             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
                             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME)
@@ -52,6 +73,10 @@ class DataTransformationConfig:
                             training_pipeline.TEST_FILE_NAME.replace("csv", "npy"))
         self.transformed_object_file_path:str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJ_DIR,
                             training_pipeline.PREPROCESSING_FILE_NAME)
+        self.drift_baseline_file_path:str = os.path.join(self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJ_DIR,
+                            training_pipeline.FINAL_MODEL_DRIFT_BASELINE_FILE_NAME)
+        self.n_jobs:int = training_pipeline.DATA_TRANSFORMATION_N_JOBS
+        self.max_memory_mb:int = training_pipeline.DATA_TRANSFORMATION_MAX_MEMORY_MB
         
     
 class ModelTrainerConfig:
@@ -65,4 +90,21 @@ class ModelTrainerConfig:
             
             self.expected_accuracy:float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
             self.overfitting_underfitting_threshold:float = training_pipeline.MODEL_TRAINER_OVERFITTING_UNDERFITTING_THERSHOLD
-        
\ No newline at end of file
+            self.n_jobs:int = training_pipeline.MODEL_TRAINER_N_JOBS
+            self.cv_folds:int = training_pipeline.MODEL_TRAINER_CV_FOLDS
+            self.search_strategy:str = training_pipeline_config.model_search_strategy
+            self.search_n_iter:int = training_pipeline.MODEL_TRAINER_SEARCH_N_ITER
+            self.halving_factor:int = training_pipeline.MODEL_TRAINER_HALVING_FACTOR
+
+
+class BatchPredictionConfig:
+    def __init__(self, input_file_path: str = None, output_file_path: str = None, thresholds: list = None):
+        self.input_file_path:str = input_file_path
+        self.output_file_path:str = output_file_path or os.path.join(
+            training_pipeline.BATCH_PREDICTION_OUTPUT_DIR, training_pipeline.BATCH_PREDICTION_OUTPUT_FILE_NAME)
+        self.model_dir:str = training_pipeline.FINAL_MODEL_DIR
+        self.chunk_size:int = training_pipeline.BATCH_PREDICTION_CHUNK_SIZE
+        self.n_workers:int = training_pipeline.BATCH_PREDICTION_N_WORKERS
+        self.thresholds:list = list(training_pipeline.BATCH_PREDICTION_THRESHOLDS if thresholds is None else thresholds)
+        self.database_name:str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.collection_name:str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
@@ -1,21 +1,199 @@
+"""
+Process-wide logging setup.
+
+Records from every logger go through a bounded queue to a background thread
+that writes them as JSON lines, so logging never waits on disk I/O. Each
+process writes one size-rotated file, logs/networksecurity_<pid>.log, which
+is only created once the process logs something.
+
+Modules keep importing the standard library module from here:
+
+    from networksecurity.logging.logger import logging
+
+The request and prediction paths log through `serving_logger` instead, whose
+INFO and DEBUG records are sampled per call site so a burst of traffic cannot
+flood the log; its warnings and errors are always kept.
+"""
 import os
+import copy
+import json
+import queue
+import atexit
 import logging
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from multiprocessing import util as multiprocessing_util
 
+from networksecurity.constant.training_pipeline import (
+    LOG_DIR_NAME,
+    LOG_FILE_PREFIX,
+    LOG_LEVEL,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLE_MAX_PER_SECOND,
+    LOG_SERVING_LOGGER_NAME,
+)
 
-log_filename = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
+# Attributes every LogRecord has; any other attribute was passed with `extra=` and becomes a field.
+STANDARD_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
 
 
-logs_dir = os.path.join(os.getcwd(), "logs")
-os.makedirs(logs_dir, exist_ok=True)
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as a single-line JSON object.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
 
-log_file_path = os.path.join(logs_dir, log_filename)
 
+class SamplingFilter(logging.Filter):
+    """
+    Keeps at most `max_per_second` INFO and DEBUG records per call site in each
+    one-second window. The next record kept from a call site carries the number
+    dropped before it as `sampled_out`. Warnings and errors always pass.
+    """
+    def __init__(self, max_per_second: int = LOG_SAMPLE_MAX_PER_SECOND):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self.dropped = 0
+        self._sites = {}
+        self._lock = threading.Lock()
 
-logging.basicConfig(
-    filename=log_file_path,
-    level=logging.INFO,
-    format='[%(asctime)s] %(lineno)d %(name)s %(levelname)s - %(message)s',
-)
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.max_per_second <= 0 or record.levelno > logging.INFO:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            window_start, kept, dropped = self._sites.get(site, (record.created, 0, 0))
+            if record.created - window_start >= 1.0:
+                window_start, kept = record.created, 0
+            if kept >= self.max_per_second:
+                self._sites[site] = (window_start, kept, dropped + 1)
+                self.dropped += 1
+                return False
+            self._sites[site] = (window_start, kept + 1, 0)
+        if dropped:
+            record.sampled_out = dropped
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: records that do not fit in the queue are dropped and counted.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base class, keep the record's fields and traceback apart from the message
+        # so the JSON formatter can log them as separate fields.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler = None
+_sampling_filter = None
+_listener = None
+
+
+def get_log_file_path() -> str:
+    return os.path.join(os.getcwd(), LOG_DIR_NAME, f"{LOG_FILE_PREFIX}_{os.getpid()}.log")
+
+
+def _start_listener():
+    """
+    Starts this process's writer thread on a fresh queue; also run in forked children,
+    which inherit the parent's queue but not its thread.
+    """
+    global _listener
+    log_file_path = get_log_file_path()
+    os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
+    file_handler = RotatingFileHandler(log_file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                       encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonFormatter())
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = QueueListener(_queue_handler.queue, file_handler)
+    _listener.start()
+
+
+def _stop_at_process_exit(_handler=None):
+    # multiprocessing children leave through os._exit, which skips atexit but runs these finalizers.
+    multiprocessing_util.Finalize(None, stop_logging, exitpriority=0)
+
+
+def stop_logging():
+    """
+    Writes out the queued records and stops the writer thread.
+    """
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def setup_logging():
+    """
+    Routes the root logger through the background writer and samples the serving logger.
+    Only the first call has an effect.
+    """
+    global _queue_handler, _sampling_filter
+    if _queue_handler is not None:
+        return
+    _queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    # A logger's filters only see records logged on that logger itself, not on the root or other loggers.
+    _sampling_filter = SamplingFilter(LOG_SAMPLE_MAX_PER_SECOND)
+    logging.getLogger(LOG_SERVING_LOGGER_NAME).addFilter(_sampling_filter)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(_queue_handler)
+    root_logger.setLevel(LOG_LEVEL)
+    _start_listener()
+
+    atexit.register(stop_logging)
+    _stop_at_process_exit()
+    os.register_at_fork(after_in_child=_start_listener)
+    multiprocessing_util.register_after_fork(_queue_handler, _stop_at_process_exit)
+
+
+def get_logging_stats() -> dict:
+    return {
+        "log_file_path": get_log_file_path(),
+        "queued": _queue_handler.queue.qsize(),
+        "dropped_queue_full": _queue_handler.dropped,
+        "dropped_sampled": _sampling_filter.dropped,
+    }
+
+
+setup_logging()
 
 logger = logging.getLogger("networksecurity")
+serving_logger = logging.getLogger(LOG_SERVING_LOGGER_NAME)
@@ -0,0 +1,200 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import TARGET_COLUMN, PREDICTION_COLUMN, PREDICTION_SCORE_COLUMN, MONGO_CONTENT_HASH_FIELD
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.entity.config_entity import BatchPredictionConfig
+from networksecurity.entity.artifact_entity import BatchPredictionArtifact
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import serving_logger
+from networksecurity.utils.main_utils import read_yaml_file, get_schema_dtypes
+from networksecurity.utils.ml_utils.estimator import apply_threshold
+from networksecurity.utils.ml_utils.model_registry import ModelRegistry
+from networksecurity.utils.mongo_utils import get_collection
+
+# Model and decision thresholds held by each pool worker, set once by the pool initializer.
+_worker_model = None
+_worker_thresholds = []
+
+
+def _init_worker(model_dir: str, thresholds: list = ()):
+    global _worker_model, _worker_thresholds
+    _worker_model = ModelRegistry(model_dir=model_dir).load()
+    _worker_thresholds = list(thresholds)
+
+
+def get_threshold_column(threshold: float) -> str:
+    return f"{PREDICTION_COLUMN}_at_{threshold:g}"
+
+
+def _predict_chunk(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Output columns for a chunk: the label, the score of a binary model and one label
+    column per threshold, all from one inference pass.
+    """
+    y_pred, proba = _worker_model.predict_with_scores(dataframe.drop(columns=[TARGET_COLUMN], errors="ignore"))
+    predictions = {PREDICTION_COLUMN: y_pred}
+    if proba.shape[1] == 2:
+        predictions[PREDICTION_SCORE_COLUMN] = proba[:, 1]
+    for threshold in _worker_thresholds:
+        predictions[get_threshold_column(threshold)] = apply_threshold(proba, _worker_model.classes, threshold)
+    return pd.DataFrame(predictions, index=dataframe.index)
+
+
+class PredictionWriter:
+    """
+    Appends scored chunks to a CSV or Parquet output file.
+
+    Parquet needs the same schema for every chunk, so columns declared in
+    `schema_dtypes` are written with that dtype (integers as nullable integers,
+    whether or not the chunk has missing values), and any other column is cast
+    to the type it had in the first chunk.
+    """
+    def __init__(self, output_file_path: str, schema_dtypes: dict = None):
+        self.output_file_path = output_file_path
+        self.schema_dtypes = schema_dtypes or {}
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._parquet_writer = None
+
+    def _to_schema_dtypes(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        for column, dtype in self.schema_dtypes.items():
+            if column not in dataframe.columns:
+                continue
+            dtype = np.dtype(dtype)
+            if pd.api.types.is_integer_dtype(dtype):
+                # Nullable integers keep the column type fixed when a chunk has missing values.
+                dataframe[column] = dataframe[column].astype(dtype.name.capitalize())
+            else:
+                dataframe[column] = dataframe[column].astype(dtype)
+        return dataframe
+
+    def write(self, dataframe: pd.DataFrame, predictions: pd.DataFrame):
+        dataframe[predictions.columns] = predictions
+        if self.output_file_path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(self._to_schema_dtypes(dataframe), preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_file_path, table.schema)
+            elif not table.schema.equals(self._parquet_writer.schema, check_metadata=False):
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            first_chunk = self.chunks_written == 0
+            dataframe.to_csv(self.output_file_path, mode="w" if first_chunk else "a",
+                             header=first_chunk, index=False)
+        self.rows_written += len(dataframe)
+        self.chunks_written += 1
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+class BatchPredictionPipeline:
+    """
+    Scores a CSV/Parquet file or the Mongo collection in fixed-size chunks.
+
+    Chunks are scored by a process pool and written to the output file in
+    input order as soon as they are ready. At most two chunks per worker are
+    in flight, so memory stays flat regardless of the input size.
+    """
+    def __init__(self, batch_prediction_config: BatchPredictionConfig):
+        try:
+            self.batch_prediction_config = batch_prediction_config
+            self.schema_dtypes = get_schema_dtypes(read_yaml_file(SCHEMA_FILE_PATH))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def read_chunks(self):
+        """
+        Yields the input as DataFrames of at most `chunk_size` rows.
+        """
+        try:
+            input_file_path = self.batch_prediction_config.input_file_path
+            chunk_size = self.batch_prediction_config.chunk_size
+
+            if input_file_path is None:
+                yield from self._read_collection_chunks(chunk_size)
+            elif input_file_path.endswith(".parquet"):
+                import pyarrow.parquet as pq
+                for batch in pq.ParquetFile(input_file_path).iter_batches(batch_size=chunk_size):
+                    yield batch.to_pandas()
+            else:
+                yield from pd.read_csv(input_file_path, chunksize=chunk_size)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _read_collection_chunks(self, chunk_size: int):
+        collection = get_collection(self.batch_prediction_config.database_name, self.batch_prediction_config.collection_name)
+        cursor = collection.find({}, {"_id": 0, MONGO_CONTENT_HASH_FIELD: 0}, batch_size=chunk_size)
+
+        records = []
+        for record in cursor:
+            records.append(record)
+            if len(records) == chunk_size:
+                yield pd.DataFrame.from_records(records).replace({"na": np.nan})
+                records = []
+        if records:
+            yield pd.DataFrame.from_records(records).replace({"na": np.nan})
+
+    def initiate_batch_prediction(self) -> BatchPredictionArtifact:
+        try:
+            output_file_path = self.batch_prediction_config.output_file_path
+            n_workers = self.batch_prediction_config.n_workers
+            thresholds = self.batch_prediction_config.thresholds
+            os.makedirs(os.path.dirname(output_file_path) or ".", exist_ok=True)
+            serving_logger.info(f"Starting batch prediction with {n_workers} workers into {output_file_path}")
+
+            writer = PredictionWriter(output_file_path, self.schema_dtypes)
+            if n_workers <= 1:
+                _init_worker(self.batch_prediction_config.model_dir, thresholds)
+                for chunk in self.read_chunks():
+                    writer.write(chunk, _predict_chunk(chunk))
+            else:
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                         initargs=(self.batch_prediction_config.model_dir, thresholds)) as executor:
+                    in_flight = deque()
+                    for chunk in self.read_chunks():
+                        in_flight.append((chunk, executor.submit(_predict_chunk, chunk)))
+                        if len(in_flight) >= 2 * n_workers:
+                            done_chunk, future = in_flight.popleft()
+                            writer.write(done_chunk, future.result())
+                    while in_flight:
+                        done_chunk, future = in_flight.popleft()
+                        writer.write(done_chunk, future.result())
+            writer.close()
+
+            batch_prediction_artifact = BatchPredictionArtifact(
+                output_file_path=output_file_path,
+                rows_processed=writer.rows_written,
+                chunks_processed=writer.chunks_written,
+            )
+            serving_logger.info(f"Batch prediction completed. Artifact: {batch_prediction_artifact}")
+            return batch_prediction_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file or the Mongo collection in chunks.")
+    parser.add_argument("--input", help="CSV or Parquet file to score; reads the Mongo collection when omitted.")
+    parser.add_argument("--output", help="CSV or Parquet file to write the predictions to.")
+    parser.add_argument("--threshold", type=float, action="append", dest="thresholds",
+                        help="Also write labels at this decision threshold; may be repeated.")
+    args = parser.parse_args()
+
+    try:
+        batch_prediction_config = BatchPredictionConfig(input_file_path=args.input, output_file_path=args.output,
+                                                        thresholds=args.thresholds)
+        BatchPredictionPipeline(batch_prediction_config).initiate_batch_prediction()
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
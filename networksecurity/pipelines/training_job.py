@@ -0,0 +1,254 @@
+import os, sys
+import dataclasses
+import json
+import queue
+import threading
+import time
+import traceback
+import uuid
+import multiprocessing
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from networksecurity.constant.training_pipeline import (
+    ARTIFACT_DIR,
+    MODEL_TRAINER_SEARCH_STRATEGY,
+    TRAINING_JOB_LOCK_FILE_NAME,
+    TRAINING_JOB_NICENESS,
+    TRAINING_JOB_HISTORY_SIZE,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def get_lock_file_path() -> str:
+    return os.path.join(ARTIFACT_DIR, TRAINING_JOB_LOCK_FILE_NAME)
+
+
+def acquire_training_lock(lock_file_path: str):
+    """
+    Takes the exclusive training lock without waiting. Returns the open lock file,
+    which holds the lock until it is closed or the process exits, or None if
+    another process holds it.
+    """
+    os.makedirs(os.path.dirname(lock_file_path) or ".", exist_ok=True)
+    lock_file = open(lock_file_path, "a+")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+def _run_training_job(job_id: str, model_search_strategy: str, events, niceness: int, lock_file_path: str):
+    """
+    Entry point of the training process: runs the pipeline and reports back through `events`.
+    """
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+    # Held until this process exits; the OS releases it even if the process is killed.
+    lock_file = acquire_training_lock(lock_file_path)
+    if lock_file is None:
+        events.put({"job_id": job_id, "event": "failed", "time": time.time(),
+                    "error": f"Another training run holds {lock_file_path}"})
+        return
+    events.put({"job_id": job_id, "event": "started", "pid": os.getpid(), "time": time.time()})
+    try:
+        # Imported here so the serving process never loads the training stack.
+        from networksecurity.pipelines.training_pipeline import TrainingPipeline
+
+        def progress_callback(stage: str, status: str):
+            events.put({"job_id": job_id, "event": "progress", "stage": stage, "status": status, "time": time.time()})
+
+        model_trainer_artifact = TrainingPipeline(model_search_strategy=model_search_strategy,
+                                                  progress_callback=progress_callback).run_pipeline()
+        result = json.loads(json.dumps(dataclasses.asdict(model_trainer_artifact), default=str))
+        events.put({"job_id": job_id, "event": "succeeded", "result": result, "time": time.time()})
+    except BaseException as e:
+        events.put({"job_id": job_id, "event": "failed", "error": f"{e}\n{traceback.format_exc()}", "time": time.time()})
+
+
+class TrainingJobManager:
+    """
+    Runs the training pipeline as background jobs, one at a time.
+
+    Each job runs in its own spawned, non-daemon process at a lower CPU priority,
+    so the serving event loop and its worker threads are never blocked by a
+    retrain. The child reports stage progress through its own queue, drained
+    whenever status is read, so terminating one job cannot corrupt another's.
+    Starting a job while one is active returns the active job instead of
+    launching a duplicate run. Across server workers, the child holds an
+    exclusive lock file under the artifact directory for the whole run and
+    fails at once if another run holds it.
+    """
+    def __init__(self, niceness: int = TRAINING_JOB_NICENESS, history_size: int = TRAINING_JOB_HISTORY_SIZE,
+                 lock_file_path: str = None):
+        try:
+            self.niceness = niceness
+            self.history_size = history_size
+            self.lock_file_path = lock_file_path or get_lock_file_path()
+            self._context = multiprocessing.get_context("spawn")
+            self._events = {}
+            self._lock = threading.Lock()
+            self._jobs = OrderedDict()
+            self._processes = {}
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _get_active_job(self) -> dict:
+        for job in self._jobs.values():
+            if job["status"] in ACTIVE_STATUSES:
+                return job
+        return None
+
+    def start(self, model_search_strategy: str = MODEL_TRAINER_SEARCH_STRATEGY) -> tuple:
+        """
+        Starts a training job unless one is already active.
+        Returns the job status and whether a new job was started.
+        """
+        try:
+            with self._lock:
+                self._drain_events()
+                active_job = self._get_active_job()
+                if active_job is not None:
+                    return dict(active_job), False
+
+                events = self._context.Queue()
+                job_id = uuid.uuid4().hex
+                job = {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "model_search_strategy": model_search_strategy,
+                    "pid": None,
+                    "stage": None,
+                    "stages": {},
+                    "submitted_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                    "error": None,
+                    "result": None,
+                }
+                process = self._context.Process(
+                    target=_run_training_job,
+                    args=(job_id, model_search_strategy, events, self.niceness, self.lock_file_path),
+                    name=f"training-job-{job_id}",
+                    daemon=False,
+                )
+                process.start()
+                self._jobs[job_id] = job
+                self._processes[job_id] = process
+                self._events[job_id] = events
+                self._trim_history()
+                logging.info(f"Started training job {job_id} in process {process.pid}")
+                return dict(job), True
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _drain_job_events(self, job_id: str):
+        events = self._events[job_id]
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            except Exception as e:
+                # A process killed mid-write leaves a truncated event; nothing after it can be read.
+                logging.warning(f"Unreadable event from training job {job_id}: {e!r}")
+                break
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] not in ACTIVE_STATUSES:
+                continue
+            if event["event"] == "started":
+                job.update(status="running", pid=event["pid"], started_at=event["time"])
+            elif event["event"] == "progress":
+                job["stage"] = event["stage"]
+                job["stages"][event["stage"]] = event["status"]
+            else:
+                job.update(status=event["event"], finished_at=event["time"],
+                           result=event.get("result"), error=event.get("error"))
+                logging.info(f"Training job {job_id} {event['event']}")
+
+    def _release_job(self, job_id: str):
+        self._processes.pop(job_id, None)
+        events = self._events.pop(job_id, None)
+        if events is not None:
+            events.close()
+
+    def _drain_events(self):
+        for job_id, process in list(self._processes.items()):
+            alive = process.is_alive()
+            self._drain_job_events(job_id)
+            if alive:
+                continue
+            process.join()
+            # A process that exited without reporting (killed, crashed interpreter) failed.
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] in ACTIVE_STATUSES:
+                job.update(status="failed", finished_at=time.time(),
+                           error=f"Training process exited with code {process.exitcode}")
+            self._release_job(job_id)
+
+    def _trim_history(self):
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.history_size:
+                break
+            if self._jobs[job_id]["status"] not in ACTIVE_STATUSES:
+                del self._jobs[job_id]
+
+    def get_status(self, job_id: str) -> dict:
+        """
+        Returns the status of a job, None if it is unknown.
+        """
+        with self._lock:
+            self._drain_events()
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_jobs(self) -> list:
+        with self._lock:
+            self._drain_events()
+            return [dict(job) for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str) -> dict:
+        """
+        Terminates a running job. Returns its status, None if it is unknown.
+        """
+        try:
+            with self._lock:
+                self._drain_events()
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return None
+                process = self._processes.get(job_id)
+                if job["status"] in ACTIVE_STATUSES and process is not None:
+                    process.terminate()
+                    process.join()
+                    job.update(status="cancelled", finished_at=time.time())
+                    # The queue may hold a half-written event of the killed process; it is discarded with it.
+                    self._release_job(job_id)
+                    logging.info(f"Cancelled training job {job_id}")
+                return dict(job)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def shutdown(self):
+        """
+        Cancels the active job, if any, so no training process outlives the server.
+        """
+        with self._lock:
+            active_job = self._get_active_job()
+        if active_job is not None:
+            self.cancel(active_job["job_id"])
@@ -1,4 +1,7 @@
-import sys
+import os, sys
+import json
+import time
+from dataclasses import asdict
 from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
 from networksecurity.components.data_transformation import DataTransformation
@@ -19,12 +22,80 @@ from networksecurity.entity.artifact_entity import (
     ModelTrainerArtifact
 )
 
+from networksecurity.constant.training_pipeline import MODEL_TRAINER_SEARCH_STRATEGY, PIPELINE_CACHE_ENABLED
+from networksecurity.constant.training_pipeline import FINAL_MODEL_DIR
 from networksecurity.logging.logger import logging
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils import main_utils
+from networksecurity.utils.main_utils import write_yaml_file
+from networksecurity.utils.profiler import StageProfiler
+from networksecurity.utils.stage_cache import StageCache
+from networksecurity.utils.ml_utils import compiled_model, drift, estimator, metrics, model_artifact, serving_imputer
+from networksecurity.utils.ml_utils.model_artifact import publish_model_artifact
+from networksecurity.entity import config_entity, artifact_entity
+
+# Code each stage runs, hashed into its cache key; shared modules are covered by the first stage.
+STAGE_SOURCES = {
+    "data_ingestion": [DataIngestion, main_utils, config_entity, artifact_entity],
+    "data_validation": [DataValidation, drift],
+    "data_transformation": [DataTransformation, serving_imputer, drift],
+    "model_trainer": [ModelTrainer, estimator, metrics, model_artifact, compiled_model],
+}
 
 class TrainingPipeline():
-    def __init__(self):
-        self.training_pipeline_config = TrainingPipelineConfig()
+    def __init__(self, model_search_strategy: str = MODEL_TRAINER_SEARCH_STRATEGY, use_cache: bool = PIPELINE_CACHE_ENABLED,
+                 progress_callback=None):
+        """
+        `progress_callback(stage, status)` is called as each stage starts ("running")
+        and ends ("completed" or "cached").
+        """
+        self.training_pipeline_config = TrainingPipelineConfig(model_search_strategy=model_search_strategy)
+        self.use_cache = use_cache
+        self.stage_cache = StageCache(self.training_pipeline_config.cache_dir)
+        self.progress_callback = progress_callback
+        self.cached_stages = []
+        self.stage_metric_artifacts = []
+
+    def report_progress(self, stage: str, status: str):
+        if self.progress_callback is not None:
+            self.progress_callback(stage, status)
+
+    def run_stage(self, stage: str, parent_key: str, artifact_class, run_fn, extra: dict = None):
+        """
+        Runs a stage, or reuses its cached artifact when its inputs are unchanged.
+        Returns the artifact and the stage's cache key.
+        """
+        try:
+            self.report_progress(stage, "running")
+            with StageProfiler(stage) as profiler:
+                key = self.stage_cache.compute_key(stage, parent_key, STAGE_SOURCES[stage], extra)
+                artifact = self.stage_cache.load(stage, key, artifact_class) if self.use_cache else None
+                if artifact is not None:
+                    logging.info(f"Reusing cached {stage} artifact {key}: {artifact}")
+                    profiler.cached = True
+                    self.cached_stages.append(stage)
+                else:
+                    artifact = run_fn()
+            artifact.stage_metric_artifact = profiler.metric_artifact
+            if not profiler.cached:
+                self.stage_cache.save(stage, key, artifact, extra)
+            self.stage_metric_artifacts.append(profiler.metric_artifact)
+            self.report_progress(stage, "cached" if profiler.cached else "completed")
+            return artifact, key
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def publish_final_model(self, data_transformation_artifact: DataTransformationArtifact,
+                            model_trainer_artifact: ModelTrainerArtifact):
+        """
+        Points final_model at the given artifacts; needed when they came from the cache.
+        The drift baseline is part of the model artifact, so it is published with the model version.
+        """
+        try:
+            publish_model_artifact(os.path.dirname(model_trainer_artifact.trained_model_file_path))
+            logging.info(f"Published cached artifacts to {FINAL_MODEL_DIR}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
     
     def start_data_ingestion(self):
         try:
@@ -65,12 +136,55 @@ class TrainingPipeline():
         except Exception as e:
             raise NetworkSecurityException(e, sys)
         
+    def write_run_report(self, model_trainer_artifact: ModelTrainerArtifact, wall_time_seconds: float):
+        """
+        Writes the stage and model metrics of this run as YAML, in a stable layout that diffs cleanly.
+        """
+        try:
+            run_report = {
+                "artifact_dir": self.training_pipeline_config.artifact_dir,
+                "started_at": self.training_pipeline_config.timestamp.isoformat(),
+                "search_strategy": self.training_pipeline_config.model_search_strategy,
+                "wall_time_seconds": wall_time_seconds,
+                "cached_stages": list(self.cached_stages),
+                "stages": {metric.name: asdict(metric) for metric in self.stage_metric_artifacts},
+                "models": {metric.name: asdict(metric) for metric in model_trainer_artifact.model_metric_artifacts or []},
+                "n_fits": model_trainer_artifact.n_fits,
+                "test_f1_score": model_trainer_artifact.test_metric_artifact.f1_score,
+            }
+            # The JSON round trip turns numpy scalars into plain values.
+            write_yaml_file(self.training_pipeline_config.run_report_file_path, json.loads(json.dumps(run_report, default=str)))
+            logging.info(f"Run report written to {self.training_pipeline_config.run_report_file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
     def run_pipeline(self):
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_validation_artifacts=data_validation_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifacts=data_transformation_artifact)
+            start = time.perf_counter()
+            self.cached_stages = []
+            self.stage_metric_artifacts = []
+            data_fingerprint = None
+            if self.use_cache:
+                data_ingestion_config = DataIngetionConfig(training_pipeline_config=self.training_pipeline_config)
+                data_fingerprint = DataIngestion(data_ingestion_config=data_ingestion_config).get_data_fingerprint()
+
+            data_ingestion_artifact, key = self.run_stage(
+                "data_ingestion", None, DataIngestionArtifact, self.start_data_ingestion,
+                extra={"data_fingerprint": data_fingerprint})
+            data_validation_artifact, key = self.run_stage(
+                "data_validation", key, DataValidationArtifact,
+                lambda: self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact))
+            data_transformation_artifact, key = self.run_stage(
+                "data_transformation", key, DataTransformationArtifact,
+                lambda: self.start_data_transformation(data_validation_artifacts=data_validation_artifact))
+            model_trainer_artifact, key = self.run_stage(
+                "model_trainer", key, ModelTrainerArtifact,
+                lambda: self.start_model_trainer(data_transformation_artifacts=data_transformation_artifact),
+                extra={"search_strategy": self.training_pipeline_config.model_search_strategy})
+
+            if self.cached_stages:
+                self.publish_final_model(data_transformation_artifact, model_trainer_artifact)
+            self.write_run_report(model_trainer_artifact, time.perf_counter() - start)
             return model_trainer_artifact
         except Exception as e:
             raise NetworkSecurityException(e, sys)
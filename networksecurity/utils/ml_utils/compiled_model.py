@@ -0,0 +1,289 @@
+import sys
+
+import numpy as np
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import AdaBoostClassifier, ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.utils.extmath import softmax
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+# Upper bound on rows x trees traversed at once, so memory stays flat for large batches.
+MAX_NODES_PER_BATCH = 1 << 20
+# The walk drops pairs that reached a leaf once fewer than this share of them are still moving.
+COMPACT_FRACTION = 0.75
+# The ternary feature values the split lookup table is built for.
+TERNARY_VALUES = (-1, 0, 1)
+
+
+class CompiledTreeEnsemble:
+    """
+    Tree-ensemble classifier compiled into flat NumPy arrays.
+
+    The nodes of every tree are concatenated into one set of arrays, and a batch
+    is evaluated by advancing all (row, tree) pairs one level per step, so a
+    prediction costs `max_depth` vectorized steps instead of one Python call
+    per tree. Leaves point to themselves, so rows that reach a leaf early just
+    stay there.
+
+    For each node, the child taken for each of the ternary values -1, 0 and 1
+    is precomputed, so rows whose features are all ternary skip the threshold
+    comparison. Other rows, such as rows with imputed fractional values, are
+    compared against the thresholds the way scikit-learn does: float32 input
+    against float64 thresholds.
+
+    Predictions are bit-identical to the scikit-learn model it was compiled
+    from: leaf values are combined in the same order with the same floating
+    point operations. Supported models are DecisionTreeClassifier, RandomForest
+    and ExtraTrees classifiers, GradientBoostingClassifier with the default
+    prior or zero init, and AdaBoostClassifier (SAMME) over decision trees.
+    """
+    ARRAY_FIELDS = ("classes", "roots", "feature", "threshold", "left", "right", "ternary_next", "values",
+                    "init_raw", "estimator_weights")
+    META_FIELDS = ("kind", "n_features", "n_classes", "max_depth", "learning_rate")
+
+    def __init__(self, **fields):
+        for name in self.ARRAY_FIELDS + self.META_FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf index reached in every tree by every row, as an (n_rows, n_trees) array.
+        """
+        leaves = np.empty((len(X), self.n_trees), dtype=np.intp)
+        ternary = ((X == -1) | (X == 0) | (X == 1)).all(axis=1)
+        for rows, use_table in ((np.flatnonzero(ternary), True), (np.flatnonzero(~ternary), False)):
+            if len(rows) == 0:
+                continue
+            # (row, tree) pairs are walked as one flat array indexed with per-pair row offsets
+            # into the flattened inputs; pairs that reached a leaf are periodically dropped.
+            nodes = np.tile(self.roots.astype(np.intp), len(rows))
+            row_offsets = np.repeat(np.arange(len(rows)) * self.n_features, self.n_trees)
+            active = np.arange(len(nodes))
+            current = nodes
+            if use_table:
+                codes = (X[rows] + 1).astype(np.intp).ravel()
+                ternary_next = self.ternary_next.ravel()
+                n_codes = self.ternary_next.shape[1]
+            else:
+                values = X[rows].astype(np.float64).ravel()
+            for _ in range(self.max_depth):
+                if use_table:
+                    following = ternary_next[current * n_codes + codes[row_offsets + self.feature[current]]]
+                else:
+                    go_left = values[row_offsets + self.feature[current]] <= self.threshold[current]
+                    following = np.where(go_left, self.left[current], self.right[current])
+                moved = following != current
+                nodes[active] = following
+                current = following
+                n_moved = np.count_nonzero(moved)
+                if n_moved == 0:
+                    break
+                if n_moved < COMPACT_FRACTION * len(moved):
+                    active, current, row_offsets = active[moved], current[moved], row_offsets[moved]
+            nodes = nodes.reshape(len(rows), self.n_trees)
+            leaves[rows] = nodes
+        return leaves
+
+    def _decision_chunk(self, X: np.ndarray) -> np.ndarray:
+        """
+        Scores as scikit-learn computes them before picking a class: predict_proba for trees
+        and forests, decision_function for gradient boosting and AdaBoost.
+        """
+        # Per-tree terms are summed with add.accumulate, which adds strictly in tree order
+        # like scikit-learn's loops do; a plain sum could reorder the additions.
+        leaves = self._apply(X)
+        if self.kind == "tree":
+            return self.values[leaves[:, 0]]
+
+        if self.kind == "forest":
+            proba = np.add.accumulate(self.values[leaves], axis=1)[:, -1]
+            proba /= self.n_trees
+            return proba
+
+        if self.kind == "gradient_boosting":
+            n_outputs = len(self.init_raw)
+            # Trees are stored stage by stage, one per output.
+            terms = (self.learning_rate * self.values[leaves]).reshape(len(X), -1, n_outputs)
+            init_raw = np.broadcast_to(self.init_raw, (len(X), 1, n_outputs))
+            raw = np.add.accumulate(np.concatenate([init_raw, terms], axis=1), axis=1)[:, -1]
+            return raw.ravel() if n_outputs == 1 else raw
+
+        if self.kind == "adaboost":
+            weights = self.estimator_weights[:self.n_trees, None]
+            votes = np.argmax(self.values[leaves], axis=2)
+            terms = np.where(votes[:, :, None] == np.arange(self.n_classes), weights, -1 / (self.n_classes - 1) * weights)
+            decision = np.add.accumulate(terms, axis=1)[:, -1]
+            decision /= self.estimator_weights.sum()
+            if self.n_classes == 2:
+                decision[:, 0] *= -1
+                return decision.sum(axis=1)
+            return decision
+
+        raise ValueError(f"Unknown compiled model kind: {self.kind}")
+
+    def _classes_from_decision(self, decision: np.ndarray) -> np.ndarray:
+        if decision.ndim == 2:
+            return self.classes.take(np.argmax(decision, axis=1), axis=0)
+        if self.kind == "gradient_boosting":
+            return self.classes[(decision >= 0).astype(int)]
+        return self.classes.take(decision > 0, axis=0)
+
+    def _proba_from_decision(self, decision: np.ndarray) -> np.ndarray:
+        # The same conversions as the estimators' predict_proba.
+        if self.kind in ("tree", "forest"):
+            return decision
+        if self.kind == "gradient_boosting":
+            if decision.ndim == 2:
+                return softmax(decision)
+            proba = np.empty((len(decision), 2), dtype=decision.dtype)
+            proba[:, 1] = expit(decision)
+            proba[:, 0] = 1 - proba[:, 1]
+            return proba
+        if self.n_classes == 2:
+            decision = np.vstack([-decision, decision]).T / 2
+        else:
+            decision = decision / (self.n_classes - 1)
+        return softmax(decision, copy=False)
+
+    def _check_input(self, X) -> np.ndarray:
+        # scikit-learn scores trees on float32 input.
+        X = np.asarray(X, dtype=np.float32)
+        if not self.can_predict(X):
+            raise ValueError(f"Expected {self.n_features} features without missing values, got shape {X.shape}")
+        return X
+
+    def decision_function(self, X) -> np.ndarray:
+        try:
+            X = self._check_input(X)
+            chunk_rows = max(1, MAX_NODES_PER_BATCH // self.n_trees)
+            return np.concatenate([self._decision_chunk(X[start:start + chunk_rows])
+                                   for start in range(0, max(len(X), 1), chunk_rows)])
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def can_predict(self, X) -> bool:
+        """
+        Whether `X` can be scored here; inputs with missing values go to scikit-learn.
+        """
+        X = np.asarray(X)
+        return X.ndim == 2 and X.shape[1] == self.n_features and not np.isnan(X).any()
+
+    def predict(self, X) -> np.ndarray:
+        return self._classes_from_decision(self.decision_function(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self._proba_from_decision(self.decision_function(X))
+
+    def predict_with_proba(self, X) -> tuple:
+        """
+        Labels and class probabilities from a single pass over the trees.
+        """
+        decision = self.decision_function(X)
+        return self._classes_from_decision(decision), self._proba_from_decision(decision)
+
+    def get_arrays(self) -> dict:
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS if getattr(self, name) is not None}
+
+    def get_meta(self) -> dict:
+        return {name: getattr(self, name) for name in self.META_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, meta: dict, arrays: dict) -> "CompiledTreeEnsemble":
+        return cls(**meta, **arrays)
+
+
+def _flatten_trees(trees: list) -> dict:
+    """
+    Concatenates fitted sklearn trees into global node arrays; leaves point to themselves.
+    """
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    node_index = np.arange(offsets[-1])
+    left = np.concatenate([np.where(tree.children_left < 0, -1, tree.children_left + offset)
+                           for tree, offset in zip(trees, offsets)])
+    right = np.concatenate([np.where(tree.children_right < 0, -1, tree.children_right + offset)
+                            for tree, offset in zip(trees, offsets)])
+    is_leaf = left < 0
+    left[is_leaf] = node_index[is_leaf]
+    right[is_leaf] = node_index[is_leaf]
+    feature = np.concatenate([tree.feature for tree in trees])
+    feature[is_leaf] = 0
+    threshold = np.concatenate([tree.threshold for tree in trees]).astype(np.float64)
+
+    ternary_next = np.empty((len(node_index), len(TERNARY_VALUES)), dtype=np.int32)
+    for code, value in enumerate(TERNARY_VALUES):
+        ternary_next[:, code] = np.where(np.float64(np.float32(value)) <= threshold, left, right)
+    ternary_next[is_leaf] = node_index[is_leaf, None]
+
+    return {
+        "roots": offsets[:-1].astype(np.int32),
+        "feature": feature.astype(np.int32),
+        "threshold": threshold,
+        "left": left.astype(np.int32),
+        "right": right.astype(np.int32),
+        "ternary_next": ternary_next,
+        "max_depth": int(max(tree.max_depth for tree in trees)),
+    }
+
+
+def _is_single_output_tree(estimator) -> bool:
+    return isinstance(estimator, DecisionTreeClassifier) and estimator.n_outputs_ == 1
+
+
+def compile_model(model) -> CompiledTreeEnsemble:
+    """
+    Compiles a fitted tree-ensemble classifier, or returns None when the model is not supported.
+    """
+    try:
+        if _is_single_output_tree(model):
+            trees = [model.tree_]
+            fields = dict(kind="tree", values=model.tree_.value[:, 0, :].astype(np.float64))
+        elif isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)) and model.n_outputs_ == 1:
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            fields = dict(kind="forest", values=np.concatenate([tree.value[:, 0, :] for tree in trees]).astype(np.float64))
+        elif isinstance(model, GradientBoostingClassifier) and (
+                isinstance(model.init_, DummyClassifier) and model.init_.strategy == "prior" or model.init_ == "zero"):
+            trees = [estimator.tree_ for estimator in model.estimators_.ravel()]
+            # The prior init predicts the same raw score for every row.
+            init_raw = model._raw_predict_init(np.zeros((1, model.n_features_in_), dtype=np.float32))[0]
+            fields = dict(kind="gradient_boosting", values=np.concatenate([tree.value[:, 0, 0] for tree in trees]).astype(np.float64),
+                          init_raw=init_raw.astype(np.float64), learning_rate=float(model.learning_rate))
+        elif isinstance(model, AdaBoostClassifier) and getattr(model, "algorithm", "SAMME") in ("SAMME", "deprecated") \
+                and model.n_classes_ > 1 \
+                and all(_is_single_output_tree(estimator) and np.array_equal(estimator.classes_, model.classes_)
+                        for estimator in model.estimators_):
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            fields = dict(kind="adaboost", values=np.concatenate([tree.value[:, 0, :] for tree in trees]).astype(np.float64),
+                          estimator_weights=np.asarray(model.estimator_weights_, dtype=np.float64))
+        else:
+            logging.info(f"No compiled backend for {type(model).__name__}; it is served by scikit-learn")
+            return None
+
+        compiled_model = CompiledTreeEnsemble(
+            classes=np.asarray(model.classes_),
+            n_features=int(model.n_features_in_),
+            n_classes=int(len(model.classes_)),
+            **_flatten_trees(trees),
+            **fields,
+        )
+        logging.info(f"Compiled {type(model).__name__} into {compiled_model.n_trees} trees, "
+                     f"{len(compiled_model.feature)} nodes, depth {compiled_model.max_depth}")
+        return compiled_model
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def count_mismatches(compiled_model: CompiledTreeEnsemble, model, X) -> int:
+    """
+    Number of rows of `X` the compiled model predicts differently from `model`.
+    """
+    try:
+        return int((compiled_model.predict(X) != model.predict(X)).sum())
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -0,0 +1,120 @@
+import sys
+import numpy as np
+from scipy.stats import chi2, kstwo
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+# The phishing features only take these values.
+DRIFT_CATEGORIES = (-1, 0, 1)
+PSI_EPSILON = 1e-4
+
+
+def compute_histograms(array: np.ndarray, categories: tuple = DRIFT_CATEGORIES) -> np.ndarray:
+    """
+    Counts, for every column, how often each category occurs in one vectorized pass.
+
+    Returns an array of shape (n_columns, len(categories) + 2): one bucket per
+    category, then a bucket for missing values and one for any other value.
+    """
+    try:
+        values = np.asarray(array, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        n_rows, n_columns = values.shape
+        n_categories = len(categories)
+        n_buckets = n_categories + 2
+
+        # Categories are consecutive integers, so a value's bucket is its offset from the first one.
+        codes = values - categories[0]
+        is_category = (codes >= 0) & (codes < n_categories) & (codes == np.floor(codes))
+        codes = np.where(is_category, codes, n_categories + 1)
+        codes[np.isnan(values)] = n_categories
+        codes = codes.astype(np.int64) + n_buckets * np.arange(n_columns)
+
+        return np.bincount(codes.ravel(), minlength=n_columns * n_buckets).reshape(n_columns, n_buckets)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def compare_histograms(base_counts: np.ndarray, current_counts: np.ndarray) -> dict:
+    """
+    Derives per-column drift statistics from two sets of histograms.
+
+    The KS statistic is the largest gap between the two empirical CDFs over the
+    categories, with the asymptotic p-value scipy's ks_2samp uses for large
+    samples. The chi-square test runs on the 2 x k contingency table of the
+    non-empty buckets. PSI is computed on smoothed bucket proportions.
+    """
+    try:
+        base_counts = np.asarray(base_counts, dtype=np.float64)
+        current_counts = np.asarray(current_counts, dtype=np.float64)
+        n_categories = base_counts.shape[1] - 2
+
+        # KS only sees observed values, as ks_2samp does.
+        base_observed = base_counts[:, :n_categories]
+        current_observed = current_counts[:, :n_categories]
+        n_base = base_observed.sum(axis=1)
+        n_current = current_observed.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            base_cdf = np.cumsum(base_observed, axis=1) / n_base[:, None]
+            current_cdf = np.cumsum(current_observed, axis=1) / n_current[:, None]
+            ks_statistic = np.nan_to_num(np.abs(base_cdf - current_cdf).max(axis=1))
+            effective_n = np.round(n_base * n_current / (n_base + n_current))
+        ks_p_value = np.ones_like(ks_statistic)
+        has_samples = effective_n >= 1
+        ks_p_value[has_samples] = np.clip(kstwo.sf(ks_statistic[has_samples], effective_n[has_samples]), 0, 1)
+
+        totals = base_counts + current_counts
+        n_total = totals.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            expected_base = totals * base_counts.sum(axis=1, keepdims=True) / n_total
+            expected_current = totals * current_counts.sum(axis=1, keepdims=True) / n_total
+            chi2_statistic = np.where(
+                totals > 0,
+                (base_counts - expected_base) ** 2 / expected_base + (current_counts - expected_current) ** 2 / expected_current,
+                0.0,
+            ).sum(axis=1)
+        chi2_statistic = np.nan_to_num(chi2_statistic)
+        dof = (totals > 0).sum(axis=1) - 1
+        chi2_p_value = np.ones_like(chi2_statistic)
+        chi2_p_value[dof > 0] = chi2.sf(chi2_statistic[dof > 0], dof[dof > 0])
+
+        base_share = (base_counts + PSI_EPSILON) / (base_counts + PSI_EPSILON).sum(axis=1, keepdims=True)
+        current_share = (current_counts + PSI_EPSILON) / (current_counts + PSI_EPSILON).sum(axis=1, keepdims=True)
+        psi = ((current_share - base_share) * np.log(current_share / base_share)).sum(axis=1)
+
+        return {
+            "ks_statistic": ks_statistic,
+            "ks_p_value": ks_p_value,
+            "chi2_statistic": chi2_statistic,
+            "chi2_p_value": chi2_p_value,
+            "psi": psi,
+        }
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def build_drift_baseline(dataframe, categories: tuple = DRIFT_CATEGORIES) -> dict:
+    """
+    Histograms of the training features, in the form published with the model.
+    """
+    try:
+        counts = compute_histograms(dataframe.to_numpy(), categories)
+        return {
+            "categories": list(categories),
+            "n_rows": len(dataframe),
+            "columns": {column: counts[index].tolist() for index, column in enumerate(dataframe.columns)},
+        }
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_baseline_histograms(baseline: dict) -> tuple:
+    """
+    Returns the feature names and the (n_columns, n_buckets) counts of a saved baseline.
+    """
+    try:
+        columns = list(baseline["columns"])
+        return columns, np.array([baseline["columns"][column] for column in columns], dtype=np.int64)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
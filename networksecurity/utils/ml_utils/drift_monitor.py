@@ -0,0 +1,171 @@
+import os, sys
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_DRIFT_BASELINE_FILE_NAME,
+    DRIFT_MONITOR_WINDOW_ROWS,
+    DRIFT_MONITOR_N_WINDOWS,
+    DRIFT_MONITOR_PSI_THRESHOLD,
+    DRIFT_MONITOR_MIN_ROWS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import serving_logger
+from networksecurity.utils.main_utils import read_yaml_file
+from networksecurity.utils.ml_utils.drift import compute_histograms, compare_histograms, get_baseline_histograms
+from networksecurity.utils.ml_utils.model_artifact import get_model_version_dir
+
+
+class OnlineDriftMonitor:
+    """
+    Compares the feature distribution of live requests against the training baseline.
+
+    Every scored frame is folded into per-feature bucket counts. Counts are kept
+    in windows of at least `window_rows` rows and only the last `n_windows`
+    windows are retained, so the comparison always covers recent traffic.
+    Scores are derived from the running totals on demand and the counts start
+    over whenever the served model version changes, with the baseline published
+    in that version. Until `min_rows` rows were observed the scores are still
+    reported, but the report is flagged `insufficient_data` and no feature is
+    marked as drifted.
+    """
+    def __init__(self, model_dir: str = FINAL_MODEL_DIR,
+                 window_rows: int = DRIFT_MONITOR_WINDOW_ROWS, n_windows: int = DRIFT_MONITOR_N_WINDOWS,
+                 psi_threshold: float = DRIFT_MONITOR_PSI_THRESHOLD, min_rows: int = DRIFT_MONITOR_MIN_ROWS):
+        try:
+            self.model_dir = model_dir
+            self.baseline_file_path = None
+            self.window_rows = window_rows
+            self.n_windows = n_windows
+            self.psi_threshold = psi_threshold
+            self.min_rows = min_rows
+
+            self._lock = threading.Lock()
+            self._version = None
+            self._columns = None
+            self._categories = None
+            self._baseline_counts = None
+            self._windows = deque()
+            self._current_counts = None
+            self._current_rows = 0
+            self._total_counts = None
+            self._total_rows = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_baseline_file_path(self, version: str = None) -> str:
+        """
+        The baseline published with model `version`; legacy model directories keep it next to the model.
+        """
+        if version is not None:
+            version_file_path = os.path.join(get_model_version_dir(self.model_dir, version), FINAL_MODEL_DRIFT_BASELINE_FILE_NAME)
+            if os.path.exists(version_file_path):
+                return version_file_path
+        return os.path.join(self.model_dir, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME)
+
+    def reset(self, version: str = None):
+        """
+        Loads the baseline of model `version` and drops all observed counts.
+        """
+        baseline = None
+        baseline_file_path = self.get_baseline_file_path(version)
+        if os.path.exists(baseline_file_path):
+            baseline = read_yaml_file(baseline_file_path)
+        else:
+            serving_logger.warning(f"No drift baseline at {baseline_file_path}; online drift monitoring is off")
+
+        with self._lock:
+            self._version = version
+            self.baseline_file_path = baseline_file_path if baseline is not None else None
+            if baseline is None:
+                self._columns, self._categories, self._baseline_counts = None, None, None
+            else:
+                self._columns, self._baseline_counts = get_baseline_histograms(baseline)
+                self._categories = tuple(baseline["categories"])
+            self._windows.clear()
+            self._current_counts = None
+            self._current_rows = 0
+            self._total_counts = None
+            self._total_rows = 0
+
+    def observe(self, dataframe: pd.DataFrame, version: str = None):
+        """
+        Adds the rows of a scored frame to the rolling counts.
+
+        Failures are logged rather than raised so monitoring never fails a prediction.
+        """
+        try:
+            if version != self._version:
+                self.reset(version)
+            if self._baseline_counts is None or len(dataframe) == 0:
+                return
+
+            counts = compute_histograms(dataframe[self._columns].to_numpy(), self._categories)
+            with self._lock:
+                if self._total_counts is None:
+                    self._current_counts = np.zeros_like(counts)
+                    self._total_counts = np.zeros_like(counts)
+                self._current_counts += counts
+                self._current_rows += len(dataframe)
+                self._total_counts += counts
+                self._total_rows += len(dataframe)
+
+                if self._current_rows >= self.window_rows:
+                    self._windows.append((self._current_counts, self._current_rows))
+                    self._current_counts = np.zeros_like(counts)
+                    self._current_rows = 0
+                    if len(self._windows) > self.n_windows:
+                        expired_counts, expired_rows = self._windows.popleft()
+                        self._total_counts -= expired_counts
+                        self._total_rows -= expired_rows
+        except Exception as e:
+            serving_logger.error(f"Drift monitor failed to record {len(dataframe)} rows: {e}")
+
+    def get_drift(self) -> dict:
+        """
+        Per-feature drift scores of the current rolling window against the baseline.
+        """
+        try:
+            with self._lock:
+                version = self._version
+                baseline_file_path = self.baseline_file_path
+                columns = self._columns
+                baseline_counts = self._baseline_counts
+                total_counts = None if self._total_counts is None else self._total_counts.copy()
+                total_rows = self._total_rows
+
+            report = {
+                "model_version": version,
+                "baseline_loaded": baseline_counts is not None,
+                "baseline_file_path": baseline_file_path,
+                "rows_observed": total_rows,
+                "psi_threshold": self.psi_threshold,
+                "min_rows": self.min_rows,
+                "insufficient_data": total_rows < self.min_rows,
+                "drifted_features": [],
+                "features": {},
+            }
+            if baseline_counts is None or total_counts is None:
+                return report
+
+            statistics = compare_histograms(baseline_counts, total_counts)
+            for index, column in enumerate(columns):
+                drift_detected = bool(statistics["psi"][index] > self.psi_threshold) and not report["insufficient_data"]
+                report["features"][column] = {
+                    "psi": float(statistics["psi"][index]),
+                    "ks_statistic": float(statistics["ks_statistic"][index]),
+                    "ks_p_value": float(statistics["ks_p_value"][index]),
+                    "chi2_p_value": float(statistics["chi2_p_value"][index]),
+                    "missing_rate": float(total_counts[index, -2] / total_rows),
+                    "drift_detected": drift_detected,
+                }
+                if drift_detected:
+                    report["drifted_features"].append(column)
+            report["drifted_features"].sort(key=lambda column: report["features"][column]["psi"], reverse=True)
+            return report
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,19 +1,115 @@
 import os, sys
+import numpy as np
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
 from networksecurity.constant.training_pipeline import SAVED_MODEL_DIR, MODEL_FILE_NAME
 
+def apply_threshold(proba: np.ndarray, classes, threshold: float) -> np.ndarray:
+    """
+    Labels of a binary classifier from its class probabilities: the second class
+    wherever its probability is at least `threshold`, the first class elsewhere.
+    """
+    proba = np.asarray(proba)
+    if proba.ndim != 2 or proba.shape[1] != 2:
+        raise ValueError(f"Thresholds apply to two-class probabilities, got shape {proba.shape}")
+    return np.asarray(classes).take((proba[:, 1] >= threshold).astype(int))
+
+
 class NetworkModel:
-    def __init__(self,preprocessor,model):
+    """
+    The preprocessor and classifier served together.
+
+    With a `compiled_model`, predictions come from the compiled tree engine and the
+    scikit-learn model is only needed for inputs the engine cannot score or to
+    verify it; when `model` is None it is loaded on first use with `model_loader`.
+    """
+    # Class-level defaults keep models pickled before these attributes existed loadable.
+    compiled_model = None
+    model_loader = None
+    verify_compiled = False
+    compiled_mismatches = 0
+
+    def __init__(self, preprocessor, model, compiled_model=None, model_loader=None, verify_compiled: bool = False):
         try:
             self.preprocessor = preprocessor
             self.model = model
+            self.compiled_model = compiled_model
+            self.model_loader = model_loader
+            self.verify_compiled = verify_compiled
         except Exception as e:
             raise NetworkSecurityException(e, sys)
-    
+
+    @property
+    def backend(self) -> str:
+        return "compiled" if self.compiled_model is not None else "sklearn"
+
+    @property
+    def classes(self) -> np.ndarray:
+        if self.compiled_model is not None:
+            return self.compiled_model.classes
+        return self.get_model().classes_
+
+    def get_model(self):
+        """
+        The scikit-learn model, loading it first if it was deferred.
+        """
+        if self.model is None and self.model_loader is not None:
+            self.model = self.model_loader()
+        return self.model
+
+    def _use_compiled(self, x_transform) -> bool:
+        return self.compiled_model is not None and self.compiled_model.can_predict(x_transform)
+
+    def _record_mismatches(self, mismatches: int, n_rows: int) -> bool:
+        if mismatches:
+            self.compiled_mismatches += mismatches
+            logging.error(f"Compiled model disagreed with scikit-learn on {mismatches} of {n_rows} rows; "
+                          f"serving scikit-learn's predictions")
+        return mismatches > 0
+
     def predict(self, x):
         try:
             x_transform = self.preprocessor.transform(x)
-            y_hat = self.model.predict(x_transform)
+            if not self._use_compiled(x_transform):
+                return self.get_model().predict(x_transform)
+
+            y_hat = self.compiled_model.predict(x_transform)
+            if self.verify_compiled:
+                expected = self.get_model().predict(x_transform)
+                if self._record_mismatches(int((y_hat != expected).sum()), len(y_hat)):
+                    return expected
             return y_hat
         except Exception as e:
-            raise NetworkSecurityException(e, sys)
\ No newline at end of file
+            raise NetworkSecurityException(e, sys)
+
+    def predict_with_scores(self, x, threshold: float = None) -> tuple:
+        """
+        Labels and class probabilities (columns in `classes` order) from one inference pass.
+
+        Without `threshold` the labels are the model's own decisions; with it, they are
+        derived from the probabilities by `apply_threshold`.
+        """
+        try:
+            x_transform = self.preprocessor.transform(x)
+            if self._use_compiled(x_transform):
+                labels, proba = self.compiled_model.predict_with_proba(x_transform)
+                if self.verify_compiled:
+                    model = self.get_model()
+                    expected, expected_proba = model.predict(x_transform), model.predict_proba(x_transform)
+                    mismatched = (labels != expected) | (proba != expected_proba).any(axis=1)
+                    if self._record_mismatches(int(mismatched.sum()), len(labels)):
+                        labels, proba = expected, expected_proba
+            else:
+                model = self.get_model()
+                proba = model.predict_proba(x_transform)
+                # The same as predict except on exact ties, which predict may break towards the second class.
+                labels = model.classes_.take(np.argmax(proba, axis=1))
+
+            if threshold is not None:
+                labels = apply_threshold(proba, self.classes, threshold)
+            return labels, proba
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def predict_proba(self, x) -> np.ndarray:
+        return self.predict_with_scores(x)[1]
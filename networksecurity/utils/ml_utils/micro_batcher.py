@@ -0,0 +1,113 @@
+import sys
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import serving_logger
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into one vectorized call.
+
+    Requests are queued and flushed either when `max_batch_size` rows are
+    waiting or when the oldest request has waited `max_latency` seconds, so
+    the extra latency a request can pick up is bounded by `max_latency` plus
+    the time of one batched predict call.
+    """
+    def __init__(self, predict_fn, max_batch_size: int, max_latency: float):
+        try:
+            self.predict_fn = predict_fn
+            self.max_batch_size = max_batch_size
+            self.max_latency = max_latency
+            self._queue = None
+            self._worker = None
+
+            self.requests = 0
+            self.batches = 0
+            self.rows = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, dataframe: pd.DataFrame):
+        """
+        Queues the rows of `dataframe` and waits for their predictions.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((dataframe, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = loop.time() + self.max_latency
+        while rows < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            frames = [frame for frame, _ in batch]
+            try:
+                dataframe = pd.concat(frames, ignore_index=True)
+                y_pred = await loop.run_in_executor(None, self.predict_fn, dataframe)
+            except Exception as e:
+                serving_logger.error(f"Micro-batch of {len(batch)} requests failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.requests += len(batch)
+            self.batches += 1
+            self.rows += len(dataframe)
+
+            offset = 0
+            for frame, future in batch:
+                if not future.done():
+                    # predict_fn may return a tuple: its arrays are per-row, such as labels and scores,
+                    # and are split between the requests; anything else, such as the model version, is shared.
+                    if isinstance(y_pred, tuple):
+                        future.set_result(tuple(part[offset:offset + len(frame)] if isinstance(part, np.ndarray)
+                                                else part for part in y_pred))
+                    else:
+                        future.set_result(y_pred[offset:offset + len(frame)])
+                offset += len(frame)
+
+    def get_stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_latency": self.max_latency,
+            "requests": self.requests,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else None,
+        }
@@ -0,0 +1,216 @@
+"""
+Versioned model artifacts.
+
+An artifact is a directory holding the preprocessor and the model as uncompressed
+joblib files plus a manifest.yaml recording the format version, the library
+versions and a digest of every file. NumPy arrays inside the joblib files are
+memory-mapped on load, so processes loading the same artifact share one
+read-only copy of those pages instead of each unpickling its own. Tree
+ensembles are also stored in compiled form as plain .npy node arrays; serving
+from those maps the model without unpickling the estimator at all.
+
+Artifacts are written once into a temporary directory and renamed into place.
+Publishing hard-links (or copies) an artifact into final_model/versions/<version>
+and then atomically rewrites final_model/current.yaml to point at it, so a
+reader sees either the previous model or the new one, never a mix.
+"""
+import os, sys
+import hashlib
+import shutil
+from datetime import datetime
+from functools import partial
+
+import joblib
+import numpy as np
+import sklearn
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_VERSIONS_DIR_NAME,
+    FINAL_MODEL_CURRENT_FILE_NAME,
+    FINAL_MODEL_KEEP_VERSIONS,
+    MODEL_ARTIFACT_FORMAT_VERSION,
+    MODEL_ARTIFACT_MANIFEST_FILE_NAME,
+    MODEL_ARTIFACT_MODEL_FILE_NAME,
+    MODEL_ARTIFACT_PREPROCESSOR_FILE_NAME,
+    MODEL_ARTIFACT_MMAP_MODE,
+    MODEL_ARTIFACT_COMPILED_FILE_PREFIX,
+    MODEL_INFERENCE_BACKEND,
+    MODEL_INFERENCE_VERIFY,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.ml_utils.compiled_model import CompiledTreeEnsemble
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+
+
+def get_file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_model_artifact(artifact_dir: str, preprocessor, model, metadata: dict = None,
+                        compiled_model: CompiledTreeEnsemble = None, extra_files: dict = None) -> dict:
+    """
+    Writes `preprocessor` and `model`, and `compiled_model` when given, as a model artifact
+    in `artifact_dir`, replacing any artifact already there. Returns the manifest.
+
+    `extra_files` maps file names to files copied into the artifact, such as the drift
+    baseline; they are part of the version and are published with the model.
+    """
+    try:
+        tmp_dir = f"{artifact_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        joblib.dump(preprocessor, os.path.join(tmp_dir, MODEL_ARTIFACT_PREPROCESSOR_FILE_NAME))
+        joblib.dump(model, os.path.join(tmp_dir, MODEL_ARTIFACT_MODEL_FILE_NAME))
+        file_names = [MODEL_ARTIFACT_PREPROCESSOR_FILE_NAME, MODEL_ARTIFACT_MODEL_FILE_NAME]
+        if compiled_model is not None:
+            for name, array in compiled_model.get_arrays().items():
+                file_name = f"{MODEL_ARTIFACT_COMPILED_FILE_PREFIX}{name}.npy"
+                np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(array), allow_pickle=False)
+                file_names.append(file_name)
+        for file_name, src_file_path in (extra_files or {}).items():
+            shutil.copyfile(src_file_path, os.path.join(tmp_dir, file_name))
+            file_names.append(file_name)
+
+        files = {}
+        for file_name in file_names:
+            file_path = os.path.join(tmp_dir, file_name)
+            files[file_name] = {"sha256": get_file_digest(file_path), "size": os.path.getsize(file_path)}
+        # The version names the content, so publishing the same artifact twice is a no-op.
+        version_digest = hashlib.sha256("".join(files[name]["sha256"] for name in sorted(files)).encode())
+
+        manifest = {
+            "format_version": MODEL_ARTIFACT_FORMAT_VERSION,
+            "version": version_digest.hexdigest()[:16],
+            "created_at": datetime.now().isoformat(),
+            "model_class": f"{type(model).__module__}.{type(model).__name__}",
+            "preprocessor_class": f"{type(preprocessor).__module__}.{type(preprocessor).__name__}",
+            "libraries": {"scikit-learn": sklearn.__version__, "numpy": np.__version__, "joblib": joblib.__version__},
+            "files": files,
+            "compiled_model": compiled_model.get_meta() if compiled_model is not None else None,
+            "metadata": metadata or {},
+        }
+        write_yaml_file(os.path.join(tmp_dir, MODEL_ARTIFACT_MANIFEST_FILE_NAME), manifest)
+
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+        os.makedirs(os.path.dirname(artifact_dir) or ".", exist_ok=True)
+        os.replace(tmp_dir, artifact_dir)
+        logging.info(f"Model artifact {manifest['version']} saved at {artifact_dir}")
+        return manifest
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def read_model_manifest(artifact_dir: str) -> dict:
+    try:
+        manifest = read_yaml_file(os.path.join(artifact_dir, MODEL_ARTIFACT_MANIFEST_FILE_NAME))
+        if manifest.get("format_version", 0) > MODEL_ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Model artifact format {manifest.get('format_version')} at {artifact_dir} "
+                             f"is newer than the supported format {MODEL_ARTIFACT_FORMAT_VERSION}")
+        return manifest
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def load_model_artifact(artifact_dir: str, mmap_mode: str = MODEL_ARTIFACT_MMAP_MODE,
+                        backend: str = MODEL_INFERENCE_BACKEND, verify: bool = MODEL_INFERENCE_VERIFY) -> NetworkModel:
+    """
+    Loads a model artifact as a NetworkModel, memory-mapping its arrays with `mmap_mode`.
+
+    With the "compiled" backend and a compiled model in the artifact, the scikit-learn
+    estimator is only unpickled when `verify` is set or when it is first needed.
+    """
+    try:
+        manifest = read_model_manifest(artifact_dir)
+        if manifest["libraries"]["scikit-learn"] != sklearn.__version__:
+            logging.warning(f"Model artifact {manifest['version']} was saved with scikit-learn "
+                            f"{manifest['libraries']['scikit-learn']}, loading with {sklearn.__version__}")
+        preprocessor = joblib.load(os.path.join(artifact_dir, MODEL_ARTIFACT_PREPROCESSOR_FILE_NAME), mmap_mode=mmap_mode)
+        model_loader = partial(joblib.load, os.path.join(artifact_dir, MODEL_ARTIFACT_MODEL_FILE_NAME), mmap_mode=mmap_mode)
+
+        compiled_model = None
+        if backend == "compiled" and manifest.get("compiled_model"):
+            arrays = {}
+            for name in CompiledTreeEnsemble.ARRAY_FIELDS:
+                file_path = os.path.join(artifact_dir, f"{MODEL_ARTIFACT_COMPILED_FILE_PREFIX}{name}.npy")
+                if os.path.exists(file_path):
+                    arrays[name] = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+            compiled_model = CompiledTreeEnsemble.from_arrays(manifest["compiled_model"], arrays)
+
+        model = model_loader() if compiled_model is None or verify else None
+        return NetworkModel(preprocessor=preprocessor, model=model, compiled_model=compiled_model,
+                            model_loader=model_loader, verify_compiled=verify)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_current_model_version(final_model_dir: str = FINAL_MODEL_DIR) -> str:
+    """
+    Version of the published model, None when no versioned model has been published.
+    """
+    try:
+        current_file_path = os.path.join(final_model_dir, FINAL_MODEL_CURRENT_FILE_NAME)
+        if not os.path.exists(current_file_path):
+            return None
+        return read_yaml_file(current_file_path)["version"]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_model_version_dir(final_model_dir: str, version: str) -> str:
+    return os.path.join(final_model_dir, FINAL_MODEL_VERSIONS_DIR_NAME, version)
+
+
+def _link_or_copy(src: str, dst: str):
+    # Artifact files are never modified in place, so a hard link is as good as a copy.
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def publish_model_artifact(artifact_dir: str, final_model_dir: str = FINAL_MODEL_DIR,
+                           keep_versions: int = FINAL_MODEL_KEEP_VERSIONS) -> str:
+    """
+    Makes the artifact in `artifact_dir` the served model and returns its version.
+    Only the newest `keep_versions` published versions are kept.
+    """
+    try:
+        manifest = read_model_manifest(artifact_dir)
+        version = manifest["version"]
+        version_dir = get_model_version_dir(final_model_dir, version)
+        if not os.path.exists(version_dir):
+            tmp_dir = f"{version_dir}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            for file_name in [*manifest["files"], MODEL_ARTIFACT_MANIFEST_FILE_NAME]:
+                _link_or_copy(os.path.join(artifact_dir, file_name), os.path.join(tmp_dir, file_name))
+            os.replace(tmp_dir, version_dir)
+
+        current_file_path = os.path.join(final_model_dir, FINAL_MODEL_CURRENT_FILE_NAME)
+        write_yaml_file(f"{current_file_path}.tmp", {"version": version, "published_at": datetime.now().isoformat()})
+        os.replace(f"{current_file_path}.tmp", current_file_path)
+        logging.info(f"Published model version {version} to {final_model_dir}")
+
+        _prune_versions(final_model_dir, version, keep_versions)
+        return version
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def _prune_versions(final_model_dir: str, current_version: str, keep_versions: int):
+    # Processes still serving a removed version keep their mapped pages until they reload.
+    versions_dir = os.path.join(final_model_dir, FINAL_MODEL_VERSIONS_DIR_NAME)
+    versions = sorted(
+        (entry for entry in os.scandir(versions_dir) if entry.is_dir() and not entry.name.endswith(".tmp")),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    older_versions = [entry for entry in versions if entry.name != current_version]
+    for entry in older_versions[max(keep_versions - 1, 0):]:
+        shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,166 @@
+import os, sys
+import threading
+import time
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_DIR,
+    FINAL_MODEL_PREPROCESSOR_FILE_NAME,
+    FINAL_MODEL_FILE_NAME,
+    MODEL_REGISTRY_RELOAD_CHECK_INTERVAL,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import serving_logger
+from networksecurity.utils.main_utils import load_object
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model_artifact import get_current_model_version, get_model_version_dir, load_model_artifact
+
+
+class ModelRegistry:
+    """
+    Keeps the serving NetworkModel warm in memory.
+
+    The model is loaded once and every request is served from memory. The published
+    version under the model directory is re-checked at most every `reload_check_interval`
+    seconds and the model is swapped atomically when it changes. Directories without
+    a versioned model fall back to the legacy preprocessor.pkl/model.pkl pair.
+    """
+    def __init__(self, model_dir: str = FINAL_MODEL_DIR,
+                 reload_check_interval: float = MODEL_REGISTRY_RELOAD_CHECK_INTERVAL):
+        try:
+            self.model_dir = model_dir
+            self.preprocessor_file_path = os.path.join(model_dir, FINAL_MODEL_PREPROCESSOR_FILE_NAME)
+            self.model_file_path = os.path.join(model_dir, FINAL_MODEL_FILE_NAME)
+            self.reload_check_interval = reload_check_interval
+
+            self._lock = threading.Lock()
+            self._model = None
+            self._version = None
+            self._last_check = 0.0
+
+            self.hits = 0
+            self.misses = 0
+            self.loads = 0
+            self.load_failures = 0
+            self.last_load_seconds = None
+            self.total_load_seconds = 0.0
+            self.loaded_at = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _fingerprint(self) -> tuple:
+        """
+        Returns whether the model is a versioned artifact and an identifier of its current version.
+        """
+        version = get_current_model_version(self.model_dir)
+        if version is not None:
+            return True, version
+        stats = [os.stat(path) for path in (self.preprocessor_file_path, self.model_file_path)]
+        return False, "-".join(f"{stat.st_mtime_ns}.{stat.st_size}" for stat in stats)
+
+    @property
+    def version(self) -> str:
+        """
+        Identifier of the model currently served, None before the first load.
+        """
+        return self._version[1] if self._version is not None else None
+
+    def load(self) -> NetworkModel:
+        """
+        Loads the model from disk and swaps it in, replacing any model being served.
+        """
+        try:
+            version = self._fingerprint()
+            start = time.perf_counter()
+            versioned, version_id = version
+            if versioned:
+                network_model = load_model_artifact(get_model_version_dir(self.model_dir, version_id))
+            else:
+                preprocessor = load_object(self.preprocessor_file_path)
+                model = load_object(self.model_file_path)
+                network_model = NetworkModel(preprocessor=preprocessor, model=model)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._model = network_model
+                self._version = version
+                self._last_check = time.monotonic()
+                self.loads += 1
+                self.last_load_seconds = elapsed
+                self.total_load_seconds += elapsed
+                self.loaded_at = time.time()
+
+            serving_logger.info(f"Model loaded from {self.model_dir} in {elapsed:.3f}s (version {self.version})")
+            return network_model
+        except Exception as e:
+            with self._lock:
+                self.load_failures += 1
+            raise NetworkSecurityException(e, sys)
+
+    def reload(self) -> NetworkModel:
+        """
+        Forces a reload regardless of whether the files changed.
+        """
+        with self._lock:
+            self.misses += 1
+        return self.load()
+
+    def _is_stale(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_check_interval:
+            return False
+        self._last_check = now
+        try:
+            return self._fingerprint() != self._version
+        except (OSError, NetworkSecurityException):
+            # Files are being replaced; keep serving the current model.
+            return False
+
+    def get_model(self) -> NetworkModel:
+        """
+        Returns the model to serve, loading it first if it is missing or stale.
+        """
+        try:
+            if self._model is not None and not self._is_stale():
+                with self._lock:
+                    self.hits += 1
+                return self._model
+
+            with self._lock:
+                self.misses += 1
+            try:
+                return self.load()
+            except NetworkSecurityException as e:
+                if self._model is None:
+                    raise
+                serving_logger.error(f"Model hot-swap failed, serving previous version: {e}")
+                return self._model
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_model_version(self) -> tuple:
+        """
+        Returns the model to serve together with its version, read as one consistent pair.
+        """
+        self.get_model()
+        with self._lock:
+            return self._model, self.version
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "model_dir": self.model_dir,
+                "version": self.version,
+                "format": None if self._version is None else ("versioned" if self._version[0] else "legacy"),
+                "loaded": self._model is not None,
+                "backend": None if self._model is None else self._model.backend,
+                "compiled_mismatches": None if self._model is None else self._model.compiled_mismatches,
+                "loaded_at": self.loaded_at,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else None,
+                "loads": self.loads,
+                "load_failures": self.load_failures,
+                "last_load_seconds": self.last_load_seconds,
+                "total_load_seconds": self.total_load_seconds,
+            }
@@ -0,0 +1,185 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import PREDICTION_CACHE_MAX_ROWS, PREDICTION_CACHE_TTL_SECONDS
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+
+# 2-bit code of each feature value in a row key; anything else makes the row uncacheable.
+VALUE_CODES = {-1: 0, 0: 1, 1: 2}
+MISSING_CODE = 3
+MAX_KEY_FEATURES = 32
+
+
+class PredictionCache:
+    """
+    LRU cache of served predictions, keyed on the feature row.
+
+    Every feature is -1, 0, 1 or missing, so a row packs into a 64-bit key of
+    2 bits per feature. Each entry holds the row's label and class probabilities,
+    so rows found in the cache skip imputation and inference; only the distinct
+    rows that miss are sent to the model, in one call. Entries expire after
+    `ttl_seconds` and the whole cache is dropped when the model version
+    changes. Rows with other values are always predicted.
+    """
+    def __init__(self, max_rows: int = PREDICTION_CACHE_MAX_ROWS, ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS):
+        try:
+            self.max_rows = max_rows
+            self.ttl_seconds = ttl_seconds
+
+            self._lock = threading.Lock()
+            self._entries = OrderedDict()
+            self._version = None
+            self._columns = None
+
+            self.hits = 0
+            self.misses = 0
+            self.uncacheable = 0
+            self.expirations = 0
+            self.evictions = 0
+            self.invalidations = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def encode_rows(dataframe: pd.DataFrame) -> tuple:
+        """
+        Packs each row into a uint64 key. Returns the keys and which rows could be encoded.
+        """
+        n_features = dataframe.shape[1]
+        if n_features > MAX_KEY_FEATURES:
+            return np.zeros(len(dataframe), dtype=np.uint64), np.zeros(len(dataframe), dtype=bool)
+        try:
+            values = dataframe.to_numpy(dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.zeros(len(dataframe), dtype=np.uint64), np.zeros(len(dataframe), dtype=bool)
+
+        codes = np.full(values.shape, MISSING_CODE, dtype=np.uint64)
+        encoded = np.isnan(values)
+        for value, code in VALUE_CODES.items():
+            matches = values == value
+            codes[matches] = code
+            encoded |= matches
+        shifts = (2 * np.arange(n_features)).astype(np.uint64)
+        keys = np.bitwise_or.reduce(codes << shifts, axis=1) if n_features else np.zeros(len(values), dtype=np.uint64)
+        return keys, encoded.all(axis=1)
+
+    def _set_version(self, version: str, columns: list):
+        # Called with the lock held.
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+            self._entries = OrderedDict()
+            self._version = version
+            self._columns = None
+        if self._columns is None:
+            self._columns = columns
+
+    def predict_with_scores(self, network_model: NetworkModel, dataframe: pd.DataFrame, version: str) -> tuple:
+        """
+        Labels and class probabilities of `network_model` (at `version`) for `dataframe`,
+        served from the cache where possible.
+        """
+        try:
+            if self.max_rows <= 0 or len(dataframe) == 0:
+                return network_model.predict_with_scores(dataframe)
+
+            keys, cacheable = self.encode_rows(dataframe)
+            keys = keys.tolist()
+            columns = list(dataframe.columns)
+            now = time.monotonic()
+            y_pred = [None] * len(dataframe)
+            proba = [None] * len(dataframe)
+            pending = {}
+            uncached_rows = []
+            with self._lock:
+                self._set_version(version, columns)
+                # Keys are only meaningful for the column order they were built with.
+                if columns != self._columns:
+                    cacheable = np.zeros(len(dataframe), dtype=bool)
+                for row_index, (key, is_cacheable) in enumerate(zip(keys, cacheable)):
+                    if not is_cacheable:
+                        uncached_rows.append(row_index)
+                        continue
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[0] <= now:
+                        del self._entries[key]
+                        self.expirations += 1
+                        entry = None
+                    if entry is None:
+                        pending.setdefault(key, []).append(row_index)
+                        self.misses += 1
+                    else:
+                        self._entries.move_to_end(key)
+                        y_pred[row_index], proba[row_index] = entry[1], entry[2]
+                        self.hits += 1
+                self.uncacheable += len(uncached_rows)
+
+            if pending or uncached_rows:
+                # One row per distinct missing key, then the rows that cannot be cached.
+                predict_rows = [rows[0] for rows in pending.values()] + uncached_rows
+                predicted, predicted_proba = network_model.predict_with_scores(dataframe.iloc[predict_rows])
+                for offset, row_index in enumerate(uncached_rows, start=len(pending)):
+                    y_pred[row_index], proba[row_index] = predicted[offset], predicted_proba[offset]
+
+                expires_at = now + self.ttl_seconds
+                with self._lock:
+                    # Results of a model that was swapped out meanwhile are not stored.
+                    store = self._version == version
+                    for offset, (key, rows) in enumerate(pending.items()):
+                        # Copied so an entry does not keep the whole batch's array alive.
+                        value, row_proba = predicted[offset], predicted_proba[offset].copy()
+                        for row_index in rows:
+                            y_pred[row_index], proba[row_index] = value, row_proba
+                        if store:
+                            self._entries[key] = (expires_at, value, row_proba)
+                            self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_rows:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            return np.asarray(y_pred), np.vstack(proba)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def predict(self, network_model: NetworkModel, dataframe: pd.DataFrame, version: str) -> np.ndarray:
+        return self.predict_with_scores(network_model, dataframe, version)[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+
+    def memory_bytes(self) -> int:
+        """
+        Approximate memory held by the entries: the dict plus one sampled entry times the row count.
+        """
+        with self._lock:
+            size = sys.getsizeof(self._entries)
+            if self._entries:
+                key, entry = next(iter(self._entries.items()))
+                entry_size = sys.getsizeof(key) + sys.getsizeof(entry) + sum(sys.getsizeof(item) for item in entry)
+                size += entry_size * len(self._entries)
+            return size
+
+    def get_stats(self) -> dict:
+        memory_bytes = self.memory_bytes()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "rows": len(self._entries),
+                "max_rows": self.max_rows,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "uncacheable": self.uncacheable,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "memory_bytes": memory_bytes,
+            }
@@ -0,0 +1,192 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.neighbors import BallTree
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+
+class ServingImputer(TransformerMixin, BaseEstimator):
+    """
+    Nearest-neighbour imputer tuned for the prediction path.
+
+    Imputes like sklearn's KNNImputer, but keeps request-time cost independent
+    of the training set size:
+
+    - complete rows are passed through without any distance computation;
+    - the training rows are deduplicated and kept with their multiplicities,
+      so the search space is bounded by the distinct points of the discrete
+      feature space rather than by the number of training rows;
+    - neighbours are searched in a BallTree built per missing-value pattern
+      once that pattern has been queried for enough rows to pay for the build;
+      rare patterns are scanned by brute force;
+    - with `lookup_table_size > 0`, imputed values are memoised per distinct
+      incomplete row in an LRU table, so recurring rows skip the search.
+
+    Donors are the complete training rows only, and ties between equidistant
+    neighbours may be broken differently than in KNNImputer.
+    """
+    # Rows a missing-value pattern must be queried for before its tree is built.
+    TREE_MIN_QUERY_ROWS = 64
+
+    def __init__(self, n_neighbors: int = 5, weights: str = "uniform", lookup_table_size: int = 0):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.lookup_table_size = lookup_table_size
+
+    def fit(self, X, y=None):
+        try:
+            if self.weights not in ("uniform", "distance"):
+                raise ValueError(f"Unsupported weights: {self.weights}")
+            X = np.asarray(X, dtype=np.float64)
+            mask = np.isnan(X)
+            # KNNImputer drops features with no observed value; do the same.
+            self.valid_features_ = ~mask.all(axis=0)
+            X = X[:, self.valid_features_]
+            mask = mask[:, self.valid_features_]
+
+            self.n_features_in_ = len(self.valid_features_)
+            self.donors_, self.donor_counts_ = np.unique(X[~mask.any(axis=1)], axis=0, return_counts=True)
+            self.feature_means_ = np.nanmean(X, axis=0)
+            self._reset_state()
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _reset_state(self):
+        self._trees = {}
+        self._pattern_rows = {}
+        self._lookup_table = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookup_hits = 0
+        self.lookup_misses = 0
+
+    def __getstate__(self):
+        # Trees and the lookup table are rebuilt on demand after unpickling.
+        state = self.__dict__.copy()
+        for key in ("_trees", "_pattern_rows", "_lookup_table", "_lock", "lookup_hits", "lookup_misses"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_state()
+
+    def _get_tree(self, present: np.ndarray, n_rows: int) -> BallTree:
+        """
+        Returns the tree for a pattern, or None while brute force is still cheaper.
+        """
+        key = present.tobytes()
+        tree = self._trees.get(key)
+        if tree is None:
+            with self._lock:
+                queried_rows = self._pattern_rows.get(key, 0) + n_rows
+                self._pattern_rows[key] = queried_rows
+            if queried_rows < self.TREE_MIN_QUERY_ROWS:
+                return None
+            tree = BallTree(self.donors_[:, present])
+            with self._lock:
+                self._trees[key] = tree
+        return tree
+
+    def _query_neighbors(self, rows: np.ndarray, present: np.ndarray, n_neighbors: int) -> tuple:
+        """
+        Distances and indices of the nearest distinct donors, closest first.
+        """
+        tree = self._get_tree(present, len(rows))
+        if tree is not None:
+            return tree.query(rows[:, present], k=n_neighbors)
+        donors = self.donors_[:, present]
+        queries = rows[:, present]
+        squared = (queries ** 2).sum(axis=1)[:, None] - 2 * queries @ donors.T + (donors ** 2).sum(axis=1)
+        indices = np.argpartition(squared, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        squared = np.take_along_axis(squared, indices, axis=1)
+        order = np.argsort(squared, axis=1, kind="stable")
+        distances = np.sqrt(np.maximum(np.take_along_axis(squared, order, axis=1), 0))
+        return distances, np.take_along_axis(indices, order, axis=1)
+
+    @staticmethod
+    def _row_key(row: np.ndarray, missing: np.ndarray) -> bytes:
+        # NaN payloads vary, so missing entries are normalised before hashing.
+        return np.where(missing, np.nan, row).tobytes()
+
+    def _impute_pattern(self, rows: np.ndarray, missing: np.ndarray) -> np.ndarray:
+        """
+        Imputes rows that all share the missing-value pattern `missing`.
+        """
+        present = ~missing
+        if not present.any() or len(self.donors_) == 0:
+            rows[:, missing] = self.feature_means_[missing]
+            return rows
+
+        distances, indices = self._query_neighbors(rows, present, min(self.n_neighbors, len(self.donors_)))
+        # Each distinct donor stands for `count` training rows; take rows in distance order until k are used.
+        counts = self.donor_counts_[indices]
+        used_before = np.cumsum(counts, axis=1) - counts
+        neighbor_weights = np.clip(self.n_neighbors - used_before, 0, counts).astype(np.float64)
+        if self.weights == "distance":
+            exact = distances == 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                neighbor_weights = np.where(exact.any(axis=1)[:, None], neighbor_weights * exact, neighbor_weights / distances)
+
+        neighbor_values = self.donors_[:, missing][indices]
+        rows[:, missing] = np.einsum("ij,ijk->ik", neighbor_weights, neighbor_values) / neighbor_weights.sum(axis=1)[:, None]
+        return rows
+
+    def transform(self, X) -> np.ndarray:
+        try:
+            X = np.array(X, dtype=np.float64)[:, self.valid_features_]
+            mask = np.isnan(X)
+            incomplete = np.flatnonzero(mask.any(axis=1))
+            if len(incomplete) == 0:
+                return X
+
+            if self.lookup_table_size > 0:
+                pending = []
+                for row_index in incomplete:
+                    key = self._row_key(X[row_index], mask[row_index])
+                    with self._lock:
+                        imputed = self._lookup_table.get(key)
+                        if imputed is not None:
+                            self._lookup_table.move_to_end(key)
+                            self.lookup_hits += 1
+                    if imputed is None:
+                        pending.append(row_index)
+                    else:
+                        X[row_index] = imputed
+                incomplete = np.array(pending, dtype=np.intp)
+                if len(incomplete) == 0:
+                    return X
+
+            patterns, pattern_ids = np.unique(mask[incomplete], axis=0, return_inverse=True)
+            pattern_ids = pattern_ids.ravel()
+            for pattern_id, missing in enumerate(patterns):
+                row_indices = incomplete[pattern_ids == pattern_id]
+                X[row_indices] = self._impute_pattern(X[row_indices], missing)
+
+            if self.lookup_table_size > 0:
+                with self._lock:
+                    for row_index in incomplete:
+                        self._lookup_table[self._row_key(X[row_index], mask[row_index])] = X[row_index].copy()
+                        self.lookup_misses += 1
+                    while len(self._lookup_table) > self.lookup_table_size:
+                        self._lookup_table.popitem(last=False)
+            return X
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.lookup_hits + self.lookup_misses
+            return {
+                "donors": int(self.donor_counts_.sum()),
+                "distinct_donors": len(self.donors_),
+                "trees": len(self._trees),
+                "lookup_table_rows": len(self._lookup_table),
+                "lookup_hits": self.lookup_hits,
+                "lookup_misses": self.lookup_misses,
+                "lookup_hit_ratio": self.lookup_hits / lookups if lookups else None,
+            }
@@ -0,0 +1,120 @@
+import os, sys
+import inspect
+import threading
+
+import certifi
+import pymongo
+from dotenv import load_dotenv
+
+from networksecurity.constant.training_pipeline import (
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+load_dotenv()
+
+# MONGODB_URL_KEY is what app.py used to read; it is still honoured when MONGO_DB_URL is unset.
+MONGO_URL_ENV_VARS = ("MONGO_DB_URL", "MONGODB_URL_KEY")
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+_async_client = None
+_async_client_pid = None
+
+
+def get_mongo_url() -> str:
+    for env_var in MONGO_URL_ENV_VARS:
+        url = os.getenv(env_var)
+        if url:
+            return url
+    raise ValueError(f"MongoDB URL is not set; define one of {MONGO_URL_ENV_VARS}")
+
+
+def get_client_options(url: str) -> dict:
+    """
+    Pool settings shared by the sync and async clients. Connections are opened on first use.
+    """
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connect": False,
+    }
+    if url.startswith("mongodb+srv://") or "tls=true" in url.lower() or "ssl=true" in url.lower():
+        options["tlsCAFile"] = certifi.where()
+    return options
+
+
+def get_mongo_client() -> pymongo.MongoClient:
+    """
+    The process-wide MongoClient, created on first call.
+
+    The client's pool is reused by every caller in the process. A forked child
+    gets its own client, since pymongo clients are not fork-safe.
+    """
+    global _client, _client_pid
+    try:
+        with _lock:
+            if _client is None or _client_pid != os.getpid():
+                url = get_mongo_url()
+                _client = pymongo.MongoClient(url, **get_client_options(url))
+                _client_pid = os.getpid()
+                logging.info(f"Created MongoDB client with a pool of up to {MONGO_MAX_POOL_SIZE} connections")
+            return _client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_collection(database_name: str, collection_name: str):
+    return get_mongo_client()[database_name][collection_name]
+
+
+def get_async_mongo_client():
+    """
+    The process-wide async client for the FastAPI app, created on first call.
+
+    Uses pymongo's AsyncMongoClient (pymongo >= 4.10) and falls back to Motor.
+    Like the sync client it connects lazily and a forked child gets its own.
+    """
+    global _async_client, _async_client_pid
+    try:
+        with _lock:
+            if _async_client is None or _async_client_pid != os.getpid():
+                try:
+                    from pymongo import AsyncMongoClient
+                except ImportError:
+                    from motor.motor_asyncio import AsyncIOMotorClient as AsyncMongoClient
+                url = get_mongo_url()
+                _async_client = AsyncMongoClient(url, **get_client_options(url))
+                _async_client_pid = os.getpid()
+                logging.info(f"Created async MongoDB client with a pool of up to {MONGO_MAX_POOL_SIZE} connections")
+            return _async_client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def get_async_collection(database_name: str, collection_name: str):
+    return get_async_mongo_client()[database_name][collection_name]
+
+
+async def close_mongo_client():
+    """
+    Closes the sync and async clients created in this process, if any.
+    """
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = _async_client = None
+    if client is not None and _client_pid == os.getpid():
+        client.close()
+    if async_client is not None and _async_client_pid == os.getpid():
+        # AsyncMongoClient.close is a coroutine, Motor's is not.
+        result = async_client.close()
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,110 @@
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+from networksecurity.entity.artifact_entity import StageMetricArtifact
+from networksecurity.logging.logger import logging
+
+# Profilers currently open in this process, innermost last.
+_active_profilers = []
+
+
+def read_peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MB, None when it cannot be read.
+    """
+    try:
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return max_rss / 2 ** 20 if sys.platform == "darwin" else max_rss / 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS high-water mark (Linux only). Returns whether it was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _children_cpu_seconds() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def record_rows(n_rows: int):
+    """
+    Adds `n_rows` to the rows processed by the innermost open profiler, if any.
+    """
+    if _active_profilers:
+        _active_profilers[-1].rows_processed = (_active_profilers[-1].rows_processed or 0) + n_rows
+
+
+class StageProfiler:
+    """
+    Measures wall time, CPU time, peak RSS and rows processed for a block of work.
+
+    CPU time covers this process plus any child processes that were reaped
+    during the block; work done in long-lived pool workers (loky) is not seen.
+    Where the kernel allows it, the RSS high-water mark is reset on entry so the
+    peak is the block's own; otherwise it is the process peak so far. Profilers
+    nest: an inner block's peak is folded into the enclosing ones.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.rows_processed = None
+        self.cached = False
+        self.metric_artifact = None
+
+    def __enter__(self):
+        # Resetting the high-water mark would lose the enclosing blocks' peak so far; keep it first.
+        current_peak = read_peak_rss_mb()
+        for profiler in _active_profilers:
+            profiler._observe_peak(current_peak)
+        reset_peak_rss()
+
+        self._peak_rss_mb = None
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time() + _children_cpu_seconds()
+        _active_profilers.append(self)
+        return self
+
+    def _observe_peak(self, peak_rss_mb: float):
+        if peak_rss_mb is not None and (self._peak_rss_mb is None or peak_rss_mb > self._peak_rss_mb):
+            self._peak_rss_mb = peak_rss_mb
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_profilers.remove(self)
+        self._observe_peak(read_peak_rss_mb())
+        for profiler in _active_profilers:
+            profiler._observe_peak(self._peak_rss_mb)
+
+        self.metric_artifact = StageMetricArtifact(
+            name=self.name,
+            wall_time_seconds=time.perf_counter() - self._start_wall,
+            cpu_time_seconds=time.process_time() + _children_cpu_seconds() - self._start_cpu,
+            peak_rss_mb=self._peak_rss_mb,
+            rows_processed=self.rows_processed,
+            cached=self.cached,
+        )
+        if exc_type is None:
+            logging.info(f"Profile of {self.name}: {self.metric_artifact}")
+        return False
@@ -0,0 +1,137 @@
+import os, sys
+import dataclasses
+import hashlib
+import inspect
+import json
+import typing
+from datetime import datetime
+from typing import List
+
+from networksecurity.constant import training_pipeline
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+
+# Constants every stage depends on; stage-specific ones are picked by prefix.
+SHARED_CONSTANTS = (
+    "TARGET_COLUMN", "FILE_NAME", "TRAIN_FILE_NAME", "TEST_FILE_NAME",
+    "DATA_ARTIFACT_FORMAT", "DATA_COMPACT_DTYPES", "PREPROCESSING_FILE_NAME",
+)
+STAGE_CONSTANT_PREFIXES = {
+    "data_ingestion": "DATA_INGESTION_",
+    "data_validation": "DATA_VALIDATION_",
+    "data_transformation": "DATA_TRANSFORMATION_",
+    "model_trainer": "MODEL_TRAINER_",
+}
+
+
+def hash_files(file_paths: List[str]) -> str:
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        with open(file_path, "rb") as file_obj:
+            digest.update(hashlib.sha256(file_obj.read()).digest())
+    return digest.hexdigest()
+
+
+def get_stage_constants(stage: str) -> dict:
+    """
+    The training_pipeline constants a stage's output depends on, as printable values.
+    """
+    prefix = STAGE_CONSTANT_PREFIXES[stage]
+    return {
+        name: repr(value) for name, value in sorted(vars(training_pipeline).items())
+        if name.startswith(prefix) or (stage == "data_ingestion" and name in SHARED_CONSTANTS)
+    }
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage artifacts.
+
+    A stage's key hashes the key of the stage before it, the stage's constants,
+    the schema, the source of the modules it runs and any extra inputs, so a
+    change anywhere upstream changes every key after it. Each completed stage
+    writes a manifest named after its key holding the artifact fields; a later
+    run with the same key reuses that artifact as long as its files still exist.
+    """
+    def __init__(self, cache_dir: str):
+        try:
+            self.cache_dir = cache_dir
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def compute_key(self, stage: str, parent_key: str, sources: list, extra: dict = None) -> str:
+        """
+        Hashes everything a stage's output depends on. `sources` are the modules, classes
+        or functions the stage runs; the files defining them stand in for the code version.
+        """
+        try:
+            inputs = {
+                "stage": stage,
+                "parent_key": parent_key,
+                "constants": get_stage_constants(stage),
+                "schema": hash_files([training_pipeline.SCHEMA_FILE_PATH]),
+                "code": hash_files(list({inspect.getsourcefile(source) for source in sources})),
+                "extra": extra or {},
+            }
+            return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:32]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_manifest_path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{key}.yaml")
+
+    @staticmethod
+    def _build_artifact(artifact_class, fields: dict):
+        values = {}
+        for field in dataclasses.fields(artifact_class):
+            if field.name not in fields:
+                continue
+            value = fields[field.name]
+            if dataclasses.is_dataclass(field.type) and isinstance(value, dict):
+                value = StageCache._build_artifact(field.type, value)
+            elif typing.get_origin(field.type) is list and isinstance(value, list):
+                item_type = typing.get_args(field.type)[0]
+                if dataclasses.is_dataclass(item_type):
+                    value = [StageCache._build_artifact(item_type, item) for item in value]
+            values[field.name] = value
+        return artifact_class(**values)
+
+    def load(self, stage: str, key: str, artifact_class):
+        """
+        Returns the cached artifact for `key`, or None when there is none or its files are gone.
+        """
+        try:
+            manifest_path = self.get_manifest_path(stage, key)
+            if not os.path.exists(manifest_path):
+                return None
+            manifest = read_yaml_file(manifest_path)
+            artifact = self._build_artifact(artifact_class, manifest["artifact"])
+            missing = [path for path in manifest["files"] if not os.path.exists(path)]
+            if missing:
+                logging.warning(f"Cached {stage} artifact {key} is incomplete, missing {missing}; rerunning the stage")
+                return None
+            return artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def save(self, stage: str, key: str, artifact, extra: dict = None):
+        try:
+            manifest_path = self.get_manifest_path(stage, key)
+            fields = dataclasses.asdict(artifact)
+            manifest = {
+                "stage": stage,
+                "key": key,
+                "created_at": datetime.now().isoformat(),
+                "extra": extra or {},
+                # The JSON round trip turns numpy scalars into plain values safe_load can read back.
+                "artifact": json.loads(json.dumps(fields, default=str)),
+                # Files the stage produced; the entry is only reused while they all exist.
+                "files": sorted(path for name, path in fields.items()
+                                if name.endswith("_file_path") and isinstance(path, str) and os.path.exists(path)),
+            }
+            tmp_path = f"{manifest_path}.tmp"
+            write_yaml_file(tmp_path, manifest)
+            os.replace(tmp_path, manifest_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,49 +1,117 @@
-import os
 import sys
-import json
-import certifi
 import pandas as pd
-import pymongo
-from dotenv import load_dotenv
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
+from networksecurity.constant.training_pipeline import (
+    MONGO_LOAD_BATCH_SIZE,
+    MONGO_LOAD_MAX_WORKERS,
+    MONGO_CONTENT_HASH_FIELD,
+)
 from networksecurity.logging.logger import logging
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.mongo_utils import get_mongo_client
 
-load_dotenv()
-MONGO_DB_URL = os.getenv("MONGO_DB_URL")
-ca = certifi.where()
+DUPLICATE_KEY_ERROR = 11000
 
 class NetworkDataExtract:
     def __init__(self):
         try:
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL, tlsCAFile=ca)
-            logging.info("MongoDB client initialized successfully.")
+            self.mongo_client = get_mongo_client()
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def csv_to_json_convert(self, file_path: str):
+    @staticmethod
+    def _to_documents(chunk: pd.DataFrame) -> list:
         """
-        Reads a CSV and converts it to JSON (list of dicts)
+        Turns a chunk read as strings into documents: numeric columns become ints
+        (floats when not integral), missing cells become None.
+        """
+        columns = {}
+        for column in chunk.columns:
+            numeric = pd.to_numeric(chunk[column], errors="coerce")
+            if numeric.notna().sum() != chunk[column].notna().sum():
+                columns[column] = chunk[column]
+            elif (numeric.dropna() % 1 == 0).all():
+                columns[column] = numeric.astype("Int64")
+            else:
+                columns[column] = numeric
+        typed = pd.DataFrame(columns)
+        return typed.astype(object).where(typed.notna(), None).to_dict(orient="records")
+
+    def csv_to_documents(self, file_path: str, batch_size: int = MONGO_LOAD_BATCH_SIZE):
+        """
+        Streams a CSV as lists of at most `batch_size` documents, each carrying a content hash.
+
+        The hash covers the row's values as written in the file plus how many identical
+        rows came before it, so repeated rows stay distinct and reloading the same file
+        yields the same hashes whatever the batch size.
         """
         try:
-            data = pd.read_csv(file_path)
-            data.reset_index(drop=True, inplace=True)
-            records = json.loads(data.to_json(orient="records"))
-            return records
+            occurrences = {}
+            for chunk in pd.read_csv(file_path, dtype=str, chunksize=batch_size):
+                row_hashes = pd.Series(pd.util.hash_pandas_object(chunk.fillna(""), index=False).to_numpy())
+                previous = row_hashes.map(occurrences).fillna(0).astype("int64")
+                occurrence = previous + row_hashes.groupby(row_hashes).cumcount()
+                for row_hash, count in row_hashes.value_counts().items():
+                    occurrences[row_hash] = occurrences.get(row_hash, 0) + count
+
+                documents = self._to_documents(chunk)
+                for document, row_hash, index in zip(documents, row_hashes, occurrence):
+                    document[MONGO_CONTENT_HASH_FIELD] = f"{row_hash:016x}-{index}"
+                yield documents
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def insert_data_mongodb(self, records, collection_name: str, database_name: str):
+    @staticmethod
+    def _upsert_batch(collection, documents: list) -> tuple:
         """
-        Inserts records into the specified MongoDB collection.
+        Inserts the documents whose content hash is not in the collection yet.
+        Returns the number inserted and the number already present.
         """
+        requests = [
+            UpdateOne({MONGO_CONTENT_HASH_FIELD: document[MONGO_CONTENT_HASH_FIELD]},
+                      {"$setOnInsert": document}, upsert=True)
+            for document in documents
+        ]
         try:
-            db = self.mongo_client[database_name]
-            collection = db[collection_name]
+            result = collection.bulk_write(requests, ordered=False)
+            return result.upserted_count, result.matched_count
+        except BulkWriteError as e:
+            # A concurrent load may insert the same hash between the lookup and the insert.
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            return e.details.get("nUpserted", 0), e.details.get("nMatched", 0) + len(errors)
+
+    def insert_data_mongodb(self, document_batches, collection_name: str, database_name: str,
+                            max_workers: int = MONGO_LOAD_MAX_WORKERS) -> dict:
+        """
+        Upserts batches of documents on their content hash across a pool of threads.
+        Batches are written unordered, and at most two per worker are held in memory.
+        """
+        try:
+            collection = self.mongo_client[database_name][collection_name]
+            collection.create_index(MONGO_CONTENT_HASH_FIELD, unique=True)
+
+            inserted = existing = 0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                in_flight = deque()
+                for documents in document_batches:
+                    in_flight.append(executor.submit(self._upsert_batch, collection, documents))
+                    if len(in_flight) >= 2 * max_workers:
+                        batch_inserted, batch_existing = in_flight.popleft().result()
+                        inserted += batch_inserted
+                        existing += batch_existing
+                while in_flight:
+                    batch_inserted, batch_existing = in_flight.popleft().result()
+                    inserted += batch_inserted
+                    existing += batch_existing
 
-            result = collection.insert_many(records)
-            logging.info(f"Inserted {len(result.inserted_ids)} records into {collection_name}")
-            return len(result.inserted_ids)
+            logging.info(f"Inserted {inserted} records into {collection_name}, {existing} were already present")
+            return {"inserted": inserted, "existing": existing}
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
@@ -54,9 +122,9 @@ if __name__ == "__main__":
         COLLECTION = "network_data"
 
         networkobj = NetworkDataExtract()
-        records = networkobj.csv_to_json_convert(file_path=FILE_PATH)
-        inserted_count = networkobj.insert_data_mongodb(records=records, collection_name=COLLECTION, database_name=DATABASE)
+        document_batches = networkobj.csv_to_documents(file_path=FILE_PATH)
+        counts = networkobj.insert_data_mongodb(document_batches=document_batches, collection_name=COLLECTION, database_name=DATABASE)
 
-        logging.info(f"Data ingestion complete. Total records inserted: {inserted_count}")
+        logging.info(f"Data ingestion complete. Total records inserted: {counts['inserted']}")
     except Exception as e:
         raise NetworkSecurityException(e, sys)
@@ -23,5 +23,5 @@ setup(
     author="Abinesh",
     author_email="abinesh3200@gmail.com",
     description="A production-ready MLOps pipeline for network security",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=get_requirements(),)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+
+from networksecurity.constant.training_pipeline import TARGET_COLUMN
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+from networksecurity.utils.ml_utils.serving_imputer import ServingImputer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILE_PATH = os.path.join(REPO_DIR, "network_data", "phisingData.csv")
+
+
+@pytest.fixture(scope="session")
+def phishing_df() -> pd.DataFrame:
+    return pd.read_csv(DATA_FILE_PATH)
+
+
+@pytest.fixture(scope="session")
+def features(phishing_df) -> pd.DataFrame:
+    return phishing_df.drop(columns=[TARGET_COLUMN])
+
+
+@pytest.fixture(scope="session")
+def labels(phishing_df) -> np.ndarray:
+    return phishing_df[TARGET_COLUMN].replace(-1, 0).to_numpy()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    Runs the test from an empty directory holding only the data schema, since
+    the pipeline reads and writes paths relative to the working directory.
+    """
+    os.symlink(os.path.join(REPO_DIR, "data_schema"), tmp_path / "data_schema")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def fit_network_model(features: pd.DataFrame, labels: np.ndarray, n_estimators: int = 20) -> NetworkModel:
+    preprocessor = Pipeline([("imputer", ServingImputer(n_neighbors=3))]).fit(features)
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=8, random_state=0)
+    model.fit(preprocessor.transform(features).astype(np.float32), labels)
+    return NetworkModel(preprocessor=preprocessor, model=model)
+
+
+@pytest.fixture(scope="session")
+def network_model(features, labels) -> NetworkModel:
+    return fit_network_model(features.iloc[:3000], labels[:3000])
+
+
+class _BulkWriteResult:
+    def __init__(self, upserted_count: int, matched_count: int):
+        self.upserted_count = upserted_count
+        self.matched_count = matched_count
+
+
+def _bulk_write(collection, requests, ordered=True):
+    # mongomock's bulk_write does not accept the operations of recent pymongo releases.
+    upserted = matched = 0
+    for request in requests:
+        result = collection.update_one(request._filter, request._doc, upsert=request._upsert)
+        upserted += result.upserted_id is not None
+        matched += result.matched_count
+    return _BulkWriteResult(upserted, matched)
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    """
+    An in-memory MongoDB shared through networksecurity.utils.mongo_utils.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    from networksecurity.utils import mongo_utils
+
+    client = mongomock.MongoClient()
+    monkeypatch.setenv("MONGO_DB_URL", "mongodb://localhost:27017")
+    monkeypatch.setattr(mongo_utils.pymongo, "MongoClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _bulk_write)
+    monkeypatch.setattr(mongo_utils, "_client", None)
+    yield client
+    monkeypatch.setattr(mongo_utils, "_client", None)
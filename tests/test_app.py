@@ -0,0 +1,118 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import app as serving_app
+
+
+@pytest.fixture
+def client():
+    # Without the lifespan: nothing is loaded or started.
+    return TestClient(serving_app.app)
+
+
+def test_train_rejects_unknown_search_strategy(client, monkeypatch):
+    monkeypatch.setattr(serving_app.training_jobs, "start", lambda **kwargs: pytest.fail("job started"))
+
+    response = client.post("/train", params={"model_search_strategy": "exhaustive"})
+    assert response.status_code == 400
+    assert "exhaustive" in response.json()["detail"]
+
+
+def test_train_starts_the_job_off_the_event_loop(client, monkeypatch):
+    calls = []
+
+    def start(model_search_strategy):
+        calls.append((model_search_strategy, threading.current_thread()))
+        return {"job_id": "job", "status": "queued", "model_search_strategy": model_search_strategy}, True
+
+    monkeypatch.setattr(serving_app.training_jobs, "start", start)
+    response = client.post("/train", params={"model_search_strategy": "halving"})
+
+    assert response.status_code == 202
+    assert response.json()["started"] and response.json()["model_search_strategy"] == "halving"
+    [(strategy, thread)] = calls
+    assert strategy == "halving" and thread.name.startswith("AnyIO worker thread")
+
+
+class SwappingRegistry:
+    """
+    Serves `network_model` once, then behaves as if a new model had been hot-swapped in.
+    """
+    def __init__(self, network_model):
+        self.network_model = network_model
+        self.version = "v1"
+
+    def get_model_version(self):
+        served = self.network_model, self.version
+        self.network_model = SimpleNamespace(classes=np.array(["benign", "phishing"]))
+        self.version = "v2"
+        return served
+
+    def get_model(self):
+        return self.network_model
+
+
+@pytest.mark.parametrize("n_rows", [1, 5])
+def test_predict_reports_the_model_that_scored_the_rows(client, monkeypatch, network_model, features, n_rows):
+    monkeypatch.setattr(serving_app, "model_registry", SwappingRegistry(network_model))
+    rows = features.iloc[:n_rows]
+
+    response = client.post("/v1/predict", params={"scores": True, "threshold": 0.5},
+                           json={"records": rows.to_dict("records")})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["model_version"] == "v1"
+    assert body["classes"] == network_model.classes.tolist()
+    _, proba = network_model.predict_with_scores(rows)
+    np.testing.assert_allclose(body["probabilities"], proba)
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"foo": 1}, "unknown features: foo"),
+    ({}, "missing features: having_IP_Address"),
+])
+def test_predict_rejects_records_that_are_not_the_features(client, monkeypatch, record, message):
+    monkeypatch.setattr(serving_app, "predict_rows", lambda df: pytest.fail("rows scored"))
+
+    response = client.post("/v1/predict", json={"records": [record]})
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
+
+
+def test_predict_rejects_arrow_tables_missing_features(client, features):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(features.iloc[:3].drop(columns=["URL_Length", "port"]), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post("/v1/predict", content=sink.getvalue().to_pybytes(),
+                           headers={"content-type": "application/vnd.apache.arrow.stream"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "missing features: URL_Length, port"
+
+
+def test_csv_upload_is_scored_off_the_event_loop(client, monkeypatch, workdir, network_model, features):
+    (workdir / "prediction_output").mkdir()
+    (workdir / "templates").mkdir()
+    (workdir / "templates" / "table.html").write_text("{{ table|safe }}")
+    threads = []
+
+    def predict_rows(df):
+        threads.append(threading.current_thread())
+        y_pred, proba = network_model.predict_with_scores(df)
+        return y_pred, proba, network_model, "v1"
+
+    monkeypatch.setattr(serving_app, "predict_rows", predict_rows)
+    response = client.post("/predict", files={"file": ("rows.csv", features.iloc[:5].to_csv(index=False))})
+
+    assert response.status_code == 200 and "<table" in response.text
+    [thread] = threads
+    assert thread.name.startswith("AnyIO worker thread")
+    assert len(pd.read_csv(workdir / "prediction_output" / "output.csv")) == 5
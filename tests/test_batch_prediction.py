@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.constant.training_pipeline import PREDICTION_COLUMN, PREDICTION_SCORE_COLUMN
+from networksecurity.entity.config_entity import BatchPredictionConfig
+from networksecurity.pipelines.batch_prediction import BatchPredictionPipeline, get_threshold_column
+from networksecurity.utils.ml_utils.model_artifact import save_model_artifact, publish_model_artifact
+
+
+@pytest.fixture
+def published_model(workdir, network_model):
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model)
+    publish_model_artifact("model_artifact")
+    return network_model
+
+
+def run_batch_prediction(input_file_path: str, output_file_path: str, n_workers: int = 1,
+                         chunk_size: int = 500, thresholds: list = None):
+    config = BatchPredictionConfig(input_file_path=input_file_path, output_file_path=output_file_path,
+                                   thresholds=thresholds)
+    config.n_workers = n_workers
+    config.chunk_size = chunk_size
+    return BatchPredictionPipeline(config).initiate_batch_prediction()
+
+
+def test_chunked_output_matches_one_shot_predict(published_model, phishing_df):
+    phishing_df.iloc[:1200].to_csv("input.csv", index=False)
+    artifact = run_batch_prediction("input.csv", "output.csv", n_workers=2, thresholds=[0.3])
+
+    output = pd.read_csv("output.csv")
+    features = phishing_df.iloc[:1200].drop(columns=["Result"])
+    labels, proba = published_model.predict_with_scores(features)
+    assert artifact.rows_processed == 1200 and artifact.chunks_processed == 3
+    np.testing.assert_array_equal(output[PREDICTION_COLUMN], labels)
+    np.testing.assert_allclose(output[PREDICTION_SCORE_COLUMN], proba[:, 1])
+    np.testing.assert_array_equal(output[get_threshold_column(0.3)], (proba[:, 1] >= 0.3).astype(int))
+
+
+def test_parquet_output_with_missing_value_in_later_chunk(published_model, phishing_df):
+    # The first chunk reads as int64, the second as float64 because of the blank cell.
+    input_df = phishing_df.iloc[:1000].astype(object)
+    input_df.iloc[700, 3] = None
+    input_df.to_csv("input.csv", index=False)
+
+    artifact = run_batch_prediction("input.csv", "output.parquet")
+
+    output = pd.read_parquet("output.parquet")
+    assert artifact.rows_processed == len(output) == 1000
+    column = phishing_df.columns[3]
+    assert output[column].isna().sum() == 1 and pd.isna(output[column].iloc[700])
+    np.testing.assert_array_equal(output[column].dropna().to_numpy(), phishing_df[column].iloc[:1000].drop(700).to_numpy())
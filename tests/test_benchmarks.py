@@ -0,0 +1,55 @@
+import importlib.util
+import json
+import os
+from argparse import Namespace
+
+import numpy as np
+import pandas as pd
+
+from tests.conftest import REPO_DIR
+
+spec = importlib.util.spec_from_file_location("run_benchmarks", os.path.join(REPO_DIR, "benchmarks", "run_benchmarks.py"))
+run_benchmarks = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run_benchmarks)
+
+
+def test_scale_up_is_seeded_and_keeps_the_value_domain(phishing_df):
+    first = run_benchmarks.scale_up(phishing_df.iloc[:1000], 2.5, seed=7)
+    second = run_benchmarks.scale_up(phishing_df.iloc[:1000], 2.5, seed=7)
+
+    assert len(first) == 2500
+    pd.testing.assert_frame_equal(first, second)
+    assert set(np.unique(first.to_numpy())) <= {-1, 0, 1}
+    assert run_benchmarks.scale_up(phishing_df, 1, seed=7).equals(phishing_df)
+
+
+def test_compare_fails_on_regressions_only(tmp_path):
+    def write_report(name: str, seconds: dict) -> str:
+        results = [{"benchmark": benchmark, "name": None, "scale": 1, "seconds": value}
+                   for benchmark, value in seconds.items()]
+        path = tmp_path / name
+        path.write_text(json.dumps({"results": results}))
+        return str(path)
+
+    baseline = write_report("baseline.json", {"ingestion": 1.0, "validation": 1.0})
+    faster = write_report("faster.json", {"ingestion": 0.5, "validation": 1.1})
+    slower = write_report("slower.json", {"ingestion": 1.5, "validation": 1.0})
+
+    assert run_benchmarks.compare(Namespace(baseline=baseline, current=faster, tolerance=0.2)) == 0
+    assert run_benchmarks.compare(Namespace(baseline=baseline, current=slower, tolerance=0.2)) == 1
+
+
+def test_ingestion_benchmark_runs_the_real_ingestion(workdir, phishing_df, monkeypatch):
+    exported = []
+    export = run_benchmarks.DataIngestion.export_collection_to_feature_store
+    monkeypatch.setattr(run_benchmarks.DataIngestion, "export_collection_to_feature_store",
+                        lambda self: exported.append(export(self)) or exported[-1])
+    args = Namespace(seed=0, missing_rate=0.0, search_strategy="random", stages=["ingestion"], mongo=False)
+
+    results = run_benchmarks.run_scale(phishing_df.iloc[:500], 1, args)
+
+    assert [result["benchmark"] for result in results] == ["ingestion"]
+    assert results[0]["rows"] == 500 and exported == [500]
+    # The collection is only swapped in for the benchmark.
+    from networksecurity.utils.mongo_utils import get_collection
+    assert run_benchmarks.data_ingestion_module.get_collection is get_collection
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import (
+    AdaBoostClassifier,
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.utils.ml_utils.compiled_model import CompiledTreeEnsemble, compile_model
+from networksecurity.utils.ml_utils.estimator import NetworkModel
+
+MODELS = [
+    DecisionTreeClassifier(max_depth=10, random_state=0),
+    RandomForestClassifier(n_estimators=30, random_state=0),
+    ExtraTreesClassifier(n_estimators=30, random_state=0),
+    GradientBoostingClassifier(n_estimators=30, random_state=0),
+    AdaBoostClassifier(n_estimators=30, random_state=0),
+]
+
+
+@pytest.fixture(scope="module")
+def data(features, labels):
+    X = features.to_numpy(dtype=np.float32)
+    return X[:4000], labels[:4000], X[4000:]
+
+
+@pytest.mark.parametrize("multiclass", [False, True], ids=["binary", "multiclass"])
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_compiled_matches_sklearn_exactly(data, model, multiclass):
+    X_train, y_train, X_test = data
+    if multiclass:
+        # A third class from one feature, so the multi-class code paths are covered too.
+        y_train = np.where(X_train[:, 0] == 0, 2, y_train)
+    model = model.fit(X_train, y_train)
+
+    compiled = compile_model(model)
+    # Served models are rebuilt from their saved arrays.
+    compiled = CompiledTreeEnsemble.from_arrays(compiled.get_meta(), compiled.get_arrays())
+    labels, proba = compiled.predict_with_proba(X_test)
+    np.testing.assert_array_equal(proba, model.predict_proba(X_test))
+    np.testing.assert_array_equal(labels, model.predict(X_test))
+    np.testing.assert_array_equal(compiled.predict(X_test), model.predict(X_test))
+
+
+def test_unsupported_models_are_served_by_sklearn(data):
+    X_train, y_train, _ = data
+    assert compile_model(LogisticRegression(max_iter=1000).fit(X_train, y_train)) is None
+
+
+def test_verified_network_model_serves_the_compiled_predictions(network_model, features):
+    compiled_network_model = NetworkModel(preprocessor=network_model.preprocessor, model=network_model.model,
+                                          compiled_model=compile_model(network_model.model), verify_compiled=True)
+    assert compiled_network_model.backend == "compiled"
+    np.testing.assert_array_equal(compiled_network_model.predict(features.iloc[:500]),
+                                  network_model.predict(features.iloc[:500]))
+    assert compiled_network_model.compiled_mismatches == 0
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.constant.training_pipeline import (
+    DATA_INGESTION_COLLECTION_NAME,
+    DATA_INGESTION_DATABASE_NAME,
+    MONGO_CONTENT_HASH_FIELD,
+)
+from networksecurity.entity.config_entity import DataIngetionConfig, TrainingPipelineConfig
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils import read_dataframe
+
+
+@pytest.fixture
+def collection(mongo_client):
+    return mongo_client[DATA_INGESTION_DATABASE_NAME][DATA_INGESTION_COLLECTION_NAME]
+
+
+def incremental_ingestion() -> DataIngestion:
+    config = DataIngetionConfig(TrainingPipelineConfig())
+    config.incremental = True
+    return DataIngestion(config)
+
+
+def test_incremental_ingestion_appends_only_new_records(workdir, collection, phishing_df):
+    collection.insert_many(phishing_df.iloc[:300].to_dict("records"))
+    incremental_ingestion().initiate_data_ingestion()
+    collection.insert_many(phishing_df.iloc[300:500].to_dict("records"))
+    ingestion = incremental_ingestion()
+    artifact = ingestion.initiate_data_ingestion()
+
+    state = ingestion.read_ingestion_state()
+    assert len(state["partitions"]) == 2 and state["rows"] == 500
+    ingested = pd.concat([read_dataframe(artifact.train_file_path), read_dataframe(artifact.test_file_path)])
+    assert len(ingested) == 500
+    # Complete ternary columns come back as int8.
+    assert (ingested.dtypes == "int8").all()
+
+
+def test_empty_feature_store_raises_a_clear_error(workdir, collection):
+    with pytest.raises(NetworkSecurityException, match="No feature store partitions"):
+        incremental_ingestion().initiate_data_ingestion()
+
+
+def test_export_streams_batches_without_server_fields(workdir, collection, phishing_df):
+    documents = phishing_df.iloc[:250].to_dict("records")
+    for index, document in enumerate(documents):
+        document[MONGO_CONTENT_HASH_FIELD] = str(index)
+    collection.insert_many(documents)
+    config = DataIngetionConfig(TrainingPipelineConfig())
+    config.export_batch_size = 100
+
+    dataframe = DataIngestion(config).export_collection_as_dataframe(write_feature_store=True)
+
+    assert list(dataframe.columns) == list(phishing_df.columns)
+    pd.testing.assert_frame_equal(dataframe, phishing_df.iloc[:250].astype("int8"))
+    # The three batches were appended to one feature store file.
+    pd.testing.assert_frame_equal(read_dataframe(config.feature_store_file_path), phishing_df.iloc[:250].astype("int8"))
+
+
+def test_ingestion_streams_parquet_batches_with_one_schema(workdir, collection, phishing_df, monkeypatch):
+    documents = phishing_df.iloc[:250].to_dict("records")
+    # Only the last batch has missing values, so its columns are typed differently from the others.
+    del documents[-1]["URL_Length"]
+    collection.insert_many(documents)
+    config = DataIngetionConfig(TrainingPipelineConfig())
+    config.export_batch_size = 100
+    ingestion = DataIngestion(config)
+    monkeypatch.setattr(ingestion, "export_collection_as_dataframe", lambda *args, **kwargs: pytest.fail("batches kept"))
+
+    artifact = ingestion.initiate_data_ingestion()
+
+    assert config.feature_store_file_path.endswith(".parquet")
+    feature_store = read_dataframe(config.feature_store_file_path)
+    assert len(feature_store) == 250 and feature_store["URL_Length"].isna().sum() == 1
+    assert feature_store["URL_Length"].iloc[:249].tolist() == phishing_df["URL_Length"].iloc[:249].tolist()
+    ingested = pd.concat([read_dataframe(artifact.train_file_path), read_dataframe(artifact.test_file_path)])
+    assert len(ingested) == 250 and ingested["URL_Length"].dtype == "float32"
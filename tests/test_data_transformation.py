@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.constant.training_pipeline import FINAL_MODEL_DIR, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME
+from networksecurity.entity.artifact_entity import DataValidationArtifact
+from networksecurity.entity.config_entity import DataTransformationConfig, TrainingPipelineConfig
+from networksecurity.utils.main_utils import load_numpy_array_data, load_object, write_dataframe
+
+
+@pytest.fixture
+def data_validation_artifact(workdir, phishing_df) -> DataValidationArtifact:
+    train_df = phishing_df.iloc[:800].astype(float)
+    test_df = phishing_df.iloc[800:1000].astype(float)
+    train_df.iloc[::25, 5] = np.nan
+    test_df.iloc[::20, 7] = np.nan
+    os.makedirs("valid")
+    write_dataframe("valid/train.csv", train_df)
+    write_dataframe("valid/test.csv", test_df)
+    return DataValidationArtifact(validation_status=True, valid_train_file_path="valid/train.csv",
+                                  valid_test_file_path="valid/test.csv", invalid_train_file_path=None,
+                                  invalid_test_file_path=None, drift_report_file_path=None)
+
+
+def run_transformation(data_validation_artifact):
+    config = DataTransformationConfig(TrainingPipelineConfig())
+    return DataTransformation(config, data_validation_artifact).initiate_data_transformation(), config
+
+
+def test_preprocessor_is_fitted_on_the_train_split(data_validation_artifact):
+    artifact, _ = run_transformation(data_validation_artifact)
+
+    train_arr = load_numpy_array_data(artifact.transformed_train_file_path)
+    test_arr = load_numpy_array_data(artifact.transformed_test_file_path)
+    assert train_arr.shape == (800, 31) and test_arr.shape == (200, 31)
+    assert not np.isnan(train_arr).any() and not np.isnan(test_arr).any()
+    # The serving imputer keeps the complete training rows as its donors.
+    imputer = load_object(artifact.transformed_object_file_path).named_steps["imputer"]
+    assert imputer.donor_counts_.sum() == 800 - len(range(0, 800, 25))
+
+
+def test_drift_baseline_stays_in_the_run_artifacts(data_validation_artifact):
+    artifact, _ = run_transformation(data_validation_artifact)
+
+    assert os.path.exists(artifact.drift_baseline_file_path)
+    # The served model's baseline only changes when a model trained on this data is published.
+    assert not os.path.exists(os.path.join(FINAL_MODEL_DIR, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME))
+
+
+@pytest.mark.parametrize("missing_rate", [0.0, 0.05])
+def test_chunked_imputation_matches_one_shot(workdir, phishing_df, missing_rate):
+    train_df = phishing_df.iloc[:2000].drop(columns=["Result"]).astype(float)
+    test_df = phishing_df.iloc[2000:3000].drop(columns=["Result"]).astype(float)
+    test_df = test_df.mask(np.random.default_rng(0).random(test_df.shape) < missing_rate)
+    config = DataTransformationConfig(TrainingPipelineConfig())
+    config.n_jobs = 2
+    # Small enough to force several chunks per worker.
+    config.max_memory_mb = 4
+    transformation = DataTransformation(config, None)
+    preprocessor = transformation.get_data_transformation_pipeline().fit(train_df)
+
+    chunked = transformation.transform_in_chunks(preprocessor, test_df, n_fitted_rows=len(train_df))
+    np.testing.assert_array_equal(chunked, preprocessor.transform(test_df))
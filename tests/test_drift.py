@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy.stats import chi2_contingency, ks_2samp
+
+from networksecurity.utils.ml_utils.drift import compare_histograms, compute_histograms
+
+
+@pytest.fixture(scope="module")
+def samples(features):
+    base = features.iloc[:5000].to_numpy(dtype=np.float64)
+    current = features.iloc[5000:8000].to_numpy(dtype=np.float64)
+    # Shift a few columns so some tests reject and some do not.
+    current[:600, 0] = 1.0
+    current[:300, 5] = -1.0
+    current[::10, 7] = np.nan
+    return base, current
+
+
+def test_histograms_count_categories_missing_and_other_values():
+    array = np.array([[-1, 0], [0, np.nan], [1, 2], [1, 0.5]])
+    np.testing.assert_array_equal(compute_histograms(array), [[1, 1, 2, 0, 0], [0, 1, 0, 1, 2]])
+
+
+def test_ks_matches_scipy(samples):
+    base, current = samples
+    statistics = compare_histograms(compute_histograms(base), compute_histograms(current))
+
+    for column in range(base.shape[1]):
+        expected = ks_2samp(base[:, column], current[~np.isnan(current[:, column]), column], method="asymp")
+        assert statistics["ks_statistic"][column] == pytest.approx(expected.statistic, abs=1e-12)
+        assert statistics["ks_p_value"][column] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-12)
+
+
+def test_chi2_matches_scipy(samples):
+    base, current = samples
+    base_counts, current_counts = compute_histograms(base), compute_histograms(current)
+    statistics = compare_histograms(base_counts, current_counts)
+
+    for column in range(base.shape[1]):
+        table = np.vstack([base_counts[column], current_counts[column]])
+        table = table[:, table.sum(axis=0) > 0]
+        if table.shape[1] < 2:
+            continue
+        expected = chi2_contingency(table, correction=False)
+        assert statistics["chi2_statistic"][column] == pytest.approx(expected.statistic, rel=1e-9)
+        assert statistics["chi2_p_value"][column] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-12)
@@ -0,0 +1,65 @@
+import os
+
+from networksecurity.constant.training_pipeline import FINAL_MODEL_DIR, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME
+from networksecurity.utils.main_utils import write_yaml_file
+from networksecurity.utils.ml_utils.drift import build_drift_baseline
+from networksecurity.utils.ml_utils.drift_monitor import OnlineDriftMonitor
+from networksecurity.utils.ml_utils.model_artifact import (
+    get_model_version_dir,
+    publish_model_artifact,
+    save_model_artifact,
+)
+
+
+def publish_with_baseline(network_model, baseline_df) -> str:
+    write_yaml_file("baseline/drift_baseline.yaml", build_drift_baseline(baseline_df))
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model,
+                        extra_files={FINAL_MODEL_DRIFT_BASELINE_FILE_NAME: "baseline/drift_baseline.yaml"})
+    return publish_model_artifact("model_artifact")
+
+
+def test_baseline_is_published_with_the_model_version(workdir, network_model, features):
+    version = publish_with_baseline(network_model, features.iloc[:500])
+
+    version_dir = get_model_version_dir(FINAL_MODEL_DIR, version)
+    assert os.path.exists(os.path.join(version_dir, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME))
+    assert not os.path.exists(os.path.join(FINAL_MODEL_DIR, FINAL_MODEL_DRIFT_BASELINE_FILE_NAME))
+
+
+def test_monitor_follows_the_served_version(workdir, network_model, features):
+    monitor = OnlineDriftMonitor(window_rows=100)
+    first_version = publish_with_baseline(network_model, features.iloc[:500])
+    monitor.observe(features.iloc[:500], first_version)
+    report = monitor.get_drift()
+    assert report["baseline_loaded"] and report["rows_observed"] == 500
+    assert report["drifted_features"] == []
+
+    # A model trained on different data brings its own baseline; the counts start over.
+    drifted = features.iloc[:500].copy()
+    drifted[drifted.columns[0]] = 1.0
+    second_version = publish_with_baseline(network_model, drifted)
+    monitor.reset(second_version)
+    monitor.observe(features.iloc[:500], second_version)
+    report = monitor.get_drift()
+    assert report["model_version"] == second_version and report["rows_observed"] == 500
+    assert report["baseline_file_path"].startswith(get_model_version_dir(FINAL_MODEL_DIR, second_version))
+    assert report["drifted_features"] == [drifted.columns[0]]
+
+
+
+def test_no_drift_is_reported_below_min_rows(workdir, network_model, features):
+    drifted = features.iloc[:500].copy()
+    drifted[drifted.columns[0]] = 1.0
+    version = publish_with_baseline(network_model, drifted)
+    monitor = OnlineDriftMonitor(window_rows=100, min_rows=500)
+
+    monitor.observe(features.iloc[:499], version)
+    report = monitor.get_drift()
+    assert report["insufficient_data"] and report["rows_observed"] == 499
+    assert report["drifted_features"] == []
+    assert report["features"][drifted.columns[0]]["psi"] > report["psi_threshold"]
+
+    monitor.observe(features.iloc[499:500], version)
+    report = monitor.get_drift()
+    assert not report["insufficient_data"]
+    assert report["drifted_features"] == [drifted.columns[0]]
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from networksecurity.utils.ml_utils.estimator import apply_threshold
+
+
+def test_threshold_picks_the_second_class_at_or_above_it():
+    proba = np.array([[0.9, 0.1], [0.5, 0.5], [0.3, 0.7]])
+    np.testing.assert_array_equal(apply_threshold(proba, np.array([-1, 1]), 0.5), [-1, 1, 1])
+    np.testing.assert_array_equal(apply_threshold(proba, np.array(["benign", "phishing"]), 0.8),
+                                  ["benign", "benign", "benign"])
+
+
+def test_threshold_needs_two_classes():
+    with pytest.raises(ValueError):
+        apply_threshold(np.full((2, 3), 1 / 3), np.arange(3), 0.5)
+
+
+def test_scores_come_from_the_same_pass_as_the_labels(network_model, features, monkeypatch):
+    rows = features.iloc[:500]
+    labels, proba = network_model.predict_with_scores(rows)
+
+    np.testing.assert_array_equal(proba, network_model.model.predict_proba(network_model.preprocessor.transform(rows)))
+    np.testing.assert_array_equal(labels, network_model.predict(rows))
+    np.testing.assert_array_equal(network_model.classes.take(proba.argmax(axis=1)), labels)
+    # Thresholds are applied to the scores; the model is not asked again.
+    calls = []
+    model = network_model.get_model()
+    for method in ("predict", "predict_proba"):
+        monkeypatch.setattr(model, method, lambda x, method=method, fn=getattr(model, method): calls.append(method) or fn(x))
+    thresholded, thresholded_proba = network_model.predict_with_scores(rows, threshold=0.2)
+    assert calls == ["predict_proba"]
+    np.testing.assert_array_equal(thresholded_proba, proba)
+    np.testing.assert_array_equal(thresholded, np.where(proba[:, 1] >= 0.2, *network_model.classes[::-1]))
+
@@ -0,0 +1,50 @@
+import json
+import logging
+import queue
+import sys
+
+from networksecurity.logging.logger import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    get_logging_stats,
+    serving_logger,
+)
+
+
+def test_only_the_serving_logger_is_sampled(caplog):
+    caplog.set_level(logging.INFO)
+    dropped_before = get_logging_stats()["dropped_sampled"]
+
+    for index in range(50):
+        serving_logger.info(f"request {index}")
+    for index in range(50):
+        logging.getLogger("networksecurity.training").info(f"epoch {index}")
+    for index in range(5):
+        serving_logger.warning(f"slow request {index}")
+
+    serving_messages = [record.getMessage() for record in caplog.records if record.name == serving_logger.name]
+    training_messages = [record for record in caplog.records if record.name == "networksecurity.training"]
+    assert serving_messages[:10] == [f"request {index}" for index in range(10)]
+    assert len(serving_messages) == 10 + 5
+    assert len(training_messages) == 50
+    assert get_logging_stats()["dropped_sampled"] - dropped_before == 40
+
+
+def test_json_formatter_keeps_extra_fields_and_traceback():
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord("test", logging.ERROR, __file__, 1, "failed %s", ("batch",),
+                                                      exc_info=sys.exc_info(), extra={"rows": 3})
+    # Records reach the formatter through the queue handler, which renders the message and traceback.
+    record = NonBlockingQueueHandler(queue.Queue()).prepare(record)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed batch" and entry["level"] == "ERROR" and entry["rows"] == 3
+    assert "ValueError: bad row" in entry["exception"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    for index in range(3):
+        handler.handle(logging.makeLogRecord({"msg": f"record {index}", "levelno": logging.INFO}))
+    assert handler.queue.qsize() == 1 and handler.dropped == 2
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
+from networksecurity.utils.main_utils import (
+    compact_array,
+    get_schema_dtypes,
+    read_dataframe,
+    read_yaml_file,
+    write_dataframe,
+)
+from tests.conftest import REPO_DIR
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "feather", "npy"])
+def test_dataframe_round_trip(tmp_path, phishing_df, extension):
+    dataframe = phishing_df.iloc[:500].astype(np.float32)
+    dataframe.iloc[::7, 3] = np.nan
+    file_path = str(tmp_path / "data" / f"train.{extension}")
+
+    write_dataframe(file_path, dataframe)
+    loaded = read_dataframe(file_path)
+    pd.testing.assert_frame_equal(loaded, dataframe, check_dtype=extension != "csv")
+
+
+def test_binary_formats_keep_compact_dtypes(tmp_path, phishing_df):
+    dataframe = phishing_df.iloc[:500].astype(np.int8)
+    write_dataframe(str(tmp_path / "train.parquet"), dataframe)
+
+    loaded = read_dataframe(str(tmp_path / "train.parquet"))
+    assert (loaded.dtypes == np.int8).all()
+    assert (tmp_path / "train.parquet").stat().st_size < len(dataframe.to_csv(index=False))
+
+
+def test_schema_dtypes_downcast_ternary_columns(tmp_path, phishing_df):
+    schema_dtypes = get_schema_dtypes(read_yaml_file(f"{REPO_DIR}/{SCHEMA_FILE_PATH}"))
+    dataframe = phishing_df.iloc[:500].astype(np.float64)
+    dataframe.iloc[::5, 0] = np.nan
+    write_dataframe(str(tmp_path / "train.csv"), dataframe)
+
+    loaded = read_dataframe(str(tmp_path / "train.csv"), schema_dtypes)
+    # A column with missing values cannot be int8 and stays float32.
+    assert loaded.dtypes.iloc[0] == np.float32
+    assert (loaded.dtypes.iloc[1:] == np.int8).all()
+    np.testing.assert_array_equal(loaded.to_numpy(dtype=np.float64), dataframe.to_numpy())
+
+
+def test_compact_array_only_narrows_lossless_values():
+    assert compact_array(np.array([[-1.0, 0.0, 1.0]])).dtype == np.int8
+    assert compact_array(np.array([[-1.0, 0.5]])).dtype == np.float32
+    assert compact_array(np.array([[np.nan, 1.0]])).dtype == np.float32
+    assert compact_array(np.array([[200.0]])).dtype == np.float32
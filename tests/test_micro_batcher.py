@@ -0,0 +1,49 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.utils.ml_utils.micro_batcher import MicroBatcher
+
+
+def run_concurrently(batcher: MicroBatcher, frames: list) -> list:
+    async def main():
+        try:
+            return await asyncio.gather(*(batcher.submit(frame) for frame in frames), return_exceptions=True)
+        finally:
+            await batcher.stop()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_call_and_get_their_own_rows():
+    calls = []
+
+    def predict_fn(dataframe):
+        calls.append(len(dataframe))
+        return dataframe["x"].to_numpy() * 10, dataframe[["x"]].to_numpy() / 10, "v1"
+
+    frames = [pd.DataFrame({"x": [index, index + 100]}) for index in range(8)]
+    results = run_concurrently(MicroBatcher(predict_fn, max_batch_size=64, max_latency=0.05), frames)
+
+    assert calls == [16]
+    for index, (labels, scores, version) in enumerate(results):
+        np.testing.assert_array_equal(labels, [index * 10, (index + 100) * 10])
+        np.testing.assert_allclose(scores[:, 0], [index / 10, (index + 100) / 10])
+        assert version == "v1"
+
+
+def test_batches_are_capped_and_failures_reach_every_request():
+    calls = []
+
+    def predict_fn(dataframe):
+        calls.append(len(dataframe))
+        raise ValueError("model unavailable")
+
+    frames = [pd.DataFrame({"x": [index]}) for index in range(5)]
+    results = run_concurrently(MicroBatcher(predict_fn, max_batch_size=2, max_latency=0.05), frames)
+
+    assert calls == [2, 2, 1]
+    for result in results:
+        with pytest.raises(ValueError, match="model unavailable"):
+            raise result
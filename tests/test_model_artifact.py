@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pytest
+
+from networksecurity.constant.training_pipeline import FINAL_MODEL_DIR, MODEL_ARTIFACT_MODEL_FILE_NAME
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.ml_utils.compiled_model import compile_model
+from networksecurity.utils.ml_utils.model_artifact import (
+    get_current_model_version,
+    get_model_version_dir,
+    load_model_artifact,
+    publish_model_artifact,
+    read_model_manifest,
+    save_model_artifact,
+)
+
+
+def test_round_trip_and_publish(workdir, network_model, features):
+    manifest = save_model_artifact("model_artifact", network_model.preprocessor, network_model.model)
+    version = publish_model_artifact("model_artifact")
+
+    assert version == manifest["version"] == get_current_model_version()
+    loaded = load_model_artifact(get_model_version_dir(FINAL_MODEL_DIR, version))
+    np.testing.assert_array_equal(loaded.predict_proba(features.iloc[:500]),
+                                  network_model.predict_proba(features.iloc[:500]))
+    # Same content, same version: publishing again changes nothing.
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model)
+    assert publish_model_artifact("model_artifact") == version
+
+
+def test_compiled_backend_does_not_unpickle_the_estimator(workdir, network_model, features):
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model,
+                        compiled_model=compile_model(network_model.model))
+    # An unreadable estimator file shows it is only opened when the estimator is needed.
+    with open(os.path.join("model_artifact", MODEL_ARTIFACT_MODEL_FILE_NAME), "wb") as file_obj:
+        file_obj.write(b"not a pickle")
+
+    loaded = load_model_artifact("model_artifact", backend="compiled", verify=False)
+    assert loaded.backend == "compiled"
+    np.testing.assert_array_equal(loaded.predict(features.iloc[:500]), network_model.predict(features.iloc[:500]))
+    with pytest.raises(NetworkSecurityException):
+        load_model_artifact("model_artifact", backend="sklearn")
+
+
+def test_newer_format_is_rejected(workdir, network_model):
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model)
+    manifest_file_path = os.path.join("model_artifact", "manifest.yaml")
+    manifest = read_yaml_file(manifest_file_path)
+    write_yaml_file(manifest_file_path, {**manifest, "format_version": manifest["format_version"] + 1}, replace=True)
+    with pytest.raises(NetworkSecurityException):
+        read_model_manifest("model_artifact")
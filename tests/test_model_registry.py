@@ -0,0 +1,65 @@
+import threading
+import time
+
+import numpy as np
+
+from networksecurity.utils.ml_utils.compiled_model import compile_model
+from networksecurity.utils.ml_utils.model_artifact import publish_model_artifact, save_model_artifact
+from networksecurity.utils.ml_utils.model_registry import ModelRegistry
+from tests.conftest import fit_network_model
+
+
+def publish(network_model) -> str:
+    save_model_artifact("model_artifact", network_model.preprocessor, network_model.model,
+                        compiled_model=compile_model(network_model.model))
+    return publish_model_artifact("model_artifact")
+
+
+def test_model_stays_warm_until_a_new_version_is_published(workdir, network_model, features, labels):
+    first_version = publish(network_model)
+    registry = ModelRegistry(reload_check_interval=0)
+
+    model, version = registry.get_model_version()
+    assert version == first_version
+    assert registry.get_model() is model and registry.loads == 1
+
+    second_model = fit_network_model(features.iloc[:1000], labels[:1000], n_estimators=5)
+    second_version = publish(second_model)
+    model, version = registry.get_model_version()
+    assert version == second_version and registry.loads == 2
+    np.testing.assert_array_equal(model.predict(features.iloc[:200]), second_model.predict(features.iloc[:200]))
+
+
+def test_hot_swap_during_predict_keeps_model_and_version_paired(workdir, network_model, features, labels):
+    models = [network_model, fit_network_model(features.iloc[:1000], labels[:1000], n_estimators=5)]
+    n_trees = {publish(model): model.model.n_estimators for model in models}
+    publish(models[0])
+    registry = ModelRegistry(reload_check_interval=0)
+    registry.get_model()
+
+    errors, served = [], set()
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                model, version = registry.get_model_version()
+                model.predict(features.iloc[:20])
+                # The version reported must be the one of the model that predicted.
+                assert model.compiled_model.n_trees == n_trees[version]
+                served.add(version)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=serve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for index in range(10):
+        publish(models[index % 2])
+        time.sleep(0.05)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert served == set(n_trees)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.utils.main_utils import HalvingGridSearchCV, allocate_n_jobs, build_search_cv, evaluate_model
+
+
+@pytest.fixture(scope="module")
+def split(features, labels):
+    X = features.to_numpy(dtype=np.float32)[:3000]
+    y = labels[:3000]
+    return X[:2000], y[:2000], X[2000:], y[2000:]
+
+
+class CountingTree(DecisionTreeClassifier):
+    fits = 0
+
+    def fit(self, X, y, sample_weight=None, check_input=True):
+        CountingTree.fits += 1
+        return super().fit(X, y, sample_weight=sample_weight, check_input=check_input)
+
+
+def test_parallel_search_matches_sequential(split):
+    models = {"tree": DecisionTreeClassifier(random_state=0), "logistic": LogisticRegression(max_iter=1000)}
+    params = {"tree": {"max_depth": [2, 4, 8]}, "logistic": {"C": [0.1, 1.0]}}
+
+    sequential = evaluate_model(*split, models, params, n_jobs=1, cv=3)
+    parallel = evaluate_model(*split, models, params, n_jobs=4, cv=3)
+
+    for name in models:
+        assert parallel[name]["best_params"] == sequential[name]["best_params"]
+        assert parallel[name]["test_score"] == sequential[name]["test_score"]
+    assert [parallel[name]["n_jobs"] for name in models] == [2, 1]
+
+
+def test_workers_are_split_by_number_of_fits():
+    params = {"large": {"a": list(range(9))}, "small": {"a": [1, 2, 3]}, "fixed": {}}
+    assert allocate_n_jobs(params, budget=8, cv=3) == {"large": 5, "small": 1, "fixed": 1}
+
+
+def test_best_estimator_is_not_refitted_after_the_search(split):
+    CountingTree.fits = 0
+    report = evaluate_model(*split, {"tree": CountingTree(random_state=0)}, {"tree": {"max_depth": [2, 4]}},
+                            n_jobs=1, cv=3)
+
+    # Six cross-validation fits plus the search's own refit of the winner.
+    assert report["tree"]["n_fits"] == 6 and CountingTree.fits == 7
+    assert report["tree"]["model"].get_depth() <= report["tree"]["best_params"]["max_depth"]
+
+
+def test_halving_grows_n_estimators_for_the_survivors(split):
+    param = {"n_estimators": [8, 16, 32], "max_depth": [2, 4, 8]}
+    search = build_search_cv(RandomForestClassifier(random_state=0), param, "halving", cv=3, n_jobs=1)
+    assert isinstance(search, HalvingGridSearchCV) and search.resource == "n_estimators"
+
+    search.fit(*split[:2])
+    assert search.n_resources_[0] < search.n_resources_[-1] <= 32
+    assert search.best_estimator_.n_estimators == search.n_resources_[-1]
+    assert len(search.cv_results_["params"]) < 3 * len(param["n_estimators"]) * len(param["max_depth"])
@@ -0,0 +1,52 @@
+import asyncio
+
+import pymongo
+import pytest
+
+from networksecurity.utils import mongo_utils
+
+
+def test_one_client_is_shared_until_closed(mongo_client, monkeypatch):
+    created = []
+    monkeypatch.setattr(mongo_utils.pymongo, "MongoClient", lambda *args, **kwargs: created.append(kwargs) or mongo_client)
+
+    first = mongo_utils.get_collection("db", "a")
+    second = mongo_utils.get_collection("db", "b")
+    assert first.database.client is second.database.client
+    assert len(created) == 1 and created[0]["connect"] is False
+
+    asyncio.run(mongo_utils.close_mongo_client())
+    assert mongo_utils._client is None
+    mongo_utils.get_mongo_client()
+    assert len(created) == 2
+
+
+def test_tls_ca_bundle_only_for_tls_urls():
+    assert "tlsCAFile" in mongo_utils.get_client_options("mongodb+srv://cluster.example.net/db")
+    assert "tlsCAFile" not in mongo_utils.get_client_options("mongodb://localhost:27017")
+
+
+def test_async_client_is_created_lazily_and_closed(monkeypatch):
+    monkeypatch.setenv("MONGO_DB_URL", "mongodb://localhost:27017")
+    monkeypatch.setattr(mongo_utils, "_async_client", None)
+
+    first = mongo_utils.get_async_collection("db", "a")
+    second = mongo_utils.get_async_collection("db", "b")
+    assert first.database.client is second.database.client
+    assert isinstance(first.database.client, pymongo.AsyncMongoClient)
+
+    asyncio.run(mongo_utils.close_mongo_client())
+    assert mongo_utils._async_client is None
+
+
+def test_app_lifespan_shares_the_async_collection_without_a_sync_client(monkeypatch):
+    from fastapi.testclient import TestClient
+    import app as serving_app
+
+    monkeypatch.setenv("MONGO_DB_URL", "mongodb://localhost:27017")
+    monkeypatch.setattr(pymongo, "MongoClient", lambda *args, **kwargs: pytest.fail("client created"))
+    with TestClient(serving_app.app) as client:
+        assert client.get("/model/stats").status_code == 200
+        collection = serving_app.app.state.collection
+        assert collection.name == serving_app.DATA_INGESTION_COLLECTION_NAME
+    assert mongo_utils._async_client is None
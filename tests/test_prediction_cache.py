@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.utils.ml_utils.prediction_cache import PredictionCache
+
+
+class CountingModel:
+    """
+    Wraps a NetworkModel and counts the rows it is asked to score.
+    """
+    def __init__(self, network_model):
+        self.network_model = network_model
+        self.rows = 0
+
+    def predict_with_scores(self, dataframe):
+        self.rows += len(dataframe)
+        return self.network_model.predict_with_scores(dataframe)
+
+
+def test_cached_rows_skip_the_model_and_match_it(network_model, features):
+    model = CountingModel(network_model)
+    cache = PredictionCache(max_rows=10_000, ttl_seconds=60)
+    rows = features.iloc[:300].copy()
+    rows.iloc[::7, 2] = np.nan
+    expected_labels, expected_proba = network_model.predict_with_scores(rows)
+
+    labels, proba = cache.predict_with_scores(model, rows, "v1")
+    first_rows = model.rows
+    # Only one row per distinct feature vector was sent to the model.
+    assert first_rows == len(rows.drop_duplicates())
+    labels_again, proba_again = cache.predict_with_scores(model, rows, "v1")
+
+    assert model.rows == first_rows
+    for result_labels, result_proba in ((labels, proba), (labels_again, proba_again)):
+        np.testing.assert_array_equal(result_labels, expected_labels)
+        np.testing.assert_array_equal(result_proba, expected_proba)
+    assert cache.get_stats()["hits"] == len(rows)
+
+
+def test_new_version_ttl_and_capacity_invalidate_entries(network_model, features, monkeypatch):
+    model = CountingModel(network_model)
+    rows = features.iloc[:50].drop_duplicates()
+    cache = PredictionCache(max_rows=len(rows) - 10, ttl_seconds=60)
+
+    cache.predict_with_scores(model, rows, "v1")
+    assert cache.get_stats()["rows"] == len(rows) - 10 and cache.evictions == 10
+
+    cache.predict_with_scores(model, rows.iloc[-5:], "v2")
+    assert cache.invalidations == 1 and cache.get_stats()["rows"] == 5
+
+    now = time.monotonic()
+    monkeypatch.setattr("networksecurity.utils.ml_utils.prediction_cache.time.monotonic", lambda: now + 61)
+    model.rows = 0
+    cache.predict_with_scores(model, rows.iloc[-5:], "v2")
+    assert model.rows == 5 and cache.expirations == 5
+
+
+def test_rows_outside_the_ternary_domain_are_not_cached(network_model, features):
+    model = CountingModel(network_model)
+    cache = PredictionCache(max_rows=1000, ttl_seconds=60)
+    rows = features.iloc[:20].astype(float)
+    rows.iloc[:, 0] = 0.5
+
+    labels, _ = cache.predict_with_scores(model, rows, "v1")
+    cache.predict_with_scores(model, rows, "v1")
+    assert model.rows == 40 and cache.uncacheable == 40
+    np.testing.assert_array_equal(labels, network_model.predict(rows))
+
+
+def test_column_order_is_part_of_the_key(network_model, features):
+    cache = PredictionCache(max_rows=1000, ttl_seconds=60)
+    rows = features.iloc[:20]
+    cache.predict_with_scores(CountingModel(network_model), rows, "v1")
+
+    model = CountingModel(network_model)
+    shuffled = rows[rows.columns[::-1]]
+    cache.predict_with_scores(model, pd.DataFrame(shuffled), "v1")
+    assert model.rows == 20
@@ -0,0 +1,42 @@
+import time
+
+import numpy as np
+import pytest
+
+from networksecurity.utils.profiler import StageProfiler, read_peak_rss_mb, record_rows
+
+
+def test_profile_records_time_rows_and_memory():
+    with StageProfiler("outer") as outer:
+        record_rows(10)
+        with StageProfiler("inner") as inner:
+            record_rows(5)
+            # Allocate and touch ~64 MB so the peak RSS moves.
+            block = np.ones(8 * 2 ** 20)
+            time.sleep(0.05)
+            del block
+        record_rows(1)
+
+    assert inner.metric_artifact.rows_processed == 5
+    assert outer.metric_artifact.rows_processed == 11
+    assert inner.metric_artifact.wall_time_seconds >= 0.05
+    assert outer.metric_artifact.wall_time_seconds >= inner.metric_artifact.wall_time_seconds
+    assert inner.metric_artifact.cpu_time_seconds >= 0
+    if read_peak_rss_mb() is not None:
+        # Nested peaks are folded into the enclosing profiler.
+        assert inner.metric_artifact.peak_rss_mb >= 64
+        assert outer.metric_artifact.peak_rss_mb >= inner.metric_artifact.peak_rss_mb
+
+
+def test_rows_outside_a_profile_are_ignored():
+    record_rows(3)
+    with StageProfiler("stage") as profiler:
+        pass
+    assert profiler.metric_artifact.rows_processed is None
+
+
+def test_profile_is_recorded_when_the_block_fails():
+    with pytest.raises(ValueError):
+        with StageProfiler("failing") as profiler:
+            raise ValueError("stage failed")
+    assert profiler.metric_artifact.name == "failing"
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from push_data import NetworkDataExtract
+
+from networksecurity.constant.training_pipeline import MONGO_CONTENT_HASH_FIELD
+
+
+def test_reload_inserts_only_missing_rows(tmp_path, mongo_client, phishing_df):
+    # Repeated rows are data too and must each be loaded once.
+    data = phishing_df.iloc[:400]
+    data = pd.concat([data, data.iloc[:50]], ignore_index=True)
+    csv_file_path = str(tmp_path / "data.csv")
+    data.iloc[:300].to_csv(csv_file_path, index=False)
+    loader = NetworkDataExtract()
+
+    counts = loader.insert_data_mongodb(loader.csv_to_documents(csv_file_path, batch_size=64), "network", "db")
+    assert counts == {"inserted": 300, "existing": 0}
+
+    data.to_csv(csv_file_path, index=False)
+    counts = loader.insert_data_mongodb(loader.csv_to_documents(csv_file_path, batch_size=100), "network", "db",
+                                        max_workers=2)
+    assert counts == {"inserted": 150, "existing": 300}
+
+    collection = mongo_client["db"]["network"]
+    assert collection.count_documents({}) == len(data)
+    document = collection.find_one({}, {"_id": 0, MONGO_CONTENT_HASH_FIELD: 0})
+    assert document == {column: int(value) for column, value in data.iloc[0].items()}
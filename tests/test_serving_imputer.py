@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from sklearn.impute import KNNImputer
+from sklearn.metrics.pairwise import nan_euclidean_distances
+
+from networksecurity.utils.ml_utils.serving_imputer import ServingImputer
+
+
+def with_missing(array: np.ndarray, rate: float, seed: int = 0) -> np.ndarray:
+    array = array.astype(np.float64, copy=True)
+    array[np.random.default_rng(seed).random(array.shape) < rate] = np.nan
+    return array
+
+
+@pytest.mark.parametrize("n_neighbors", [1, 5])
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_matches_knn_imputer_without_ties(n_neighbors, weights):
+    rng = np.random.default_rng(0)
+    train = rng.normal(size=(400, 6))
+    # Enough rows per pattern to exercise both the brute-force scan and the per-pattern trees.
+    test = with_missing(rng.normal(size=(2000, 6)), 0.15)
+
+    expected = KNNImputer(n_neighbors=n_neighbors, weights=weights).fit(train).transform(test)
+    imputer = ServingImputer(n_neighbors=n_neighbors, weights=weights).fit(train)
+    np.testing.assert_allclose(imputer.transform(test), expected, rtol=1e-9, atol=1e-12)
+    assert imputer.get_stats()["trees"] > 0
+
+
+def test_phishing_rows_without_boundary_ties_match_knn_imputer(features):
+    train = features.iloc[:3000].to_numpy(dtype=np.float64)
+    test = with_missing(features.iloc[3000:3500].to_numpy(), 0.05)
+    n_neighbors = 3
+
+    expected = KNNImputer(n_neighbors=n_neighbors).fit(train).transform(test)
+    imputed = ServingImputer(n_neighbors=n_neighbors).fit(train).transform(test)
+
+    complete = ~np.isnan(test).any(axis=1)
+    np.testing.assert_array_equal(imputed[complete], test[complete])
+    assert not np.isnan(imputed).any()
+    # Only compare rows whose k nearest donors are unambiguous.
+    distances = np.sort(nan_euclidean_distances(test, train), axis=1)
+    unambiguous = distances[:, n_neighbors - 1] < distances[:, n_neighbors]
+    assert unambiguous[~complete].sum() > 20
+    np.testing.assert_allclose(imputed[unambiguous], expected[unambiguous])
+
+
+def test_lookup_table_returns_the_same_values(features):
+    train = features.iloc[:3000].to_numpy(dtype=np.float64)
+    test = with_missing(features.iloc[3000:3300].to_numpy(), 0.05)
+
+    plain = ServingImputer(n_neighbors=3).fit(train).transform(test)
+    cached = ServingImputer(n_neighbors=3, lookup_table_size=1000).fit(train)
+    np.testing.assert_array_equal(cached.transform(test), plain)
+    np.testing.assert_array_equal(cached.transform(test), plain)
+    assert cached.get_stats()["lookup_hits"] >= np.isnan(test).any(axis=1).sum()
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from networksecurity.pipelines.training_job import ACTIVE_STATUSES, TrainingJobManager
+
+
+@pytest.fixture
+def manager(workdir, monkeypatch):
+    # Without a MongoDB URL the spawned pipeline fails at ingestion, which ends the job quickly.
+    monkeypatch.delenv("MONGO_DB_URL", raising=False)
+    monkeypatch.delenv("MONGODB_URL_KEY", raising=False)
+    manager = TrainingJobManager(niceness=0)
+    yield manager
+    manager.shutdown()
+
+
+def wait_for(manager: TrainingJobManager, job_id: str, timeout: float = 60.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get_status(job_id)
+        if job["status"] not in ACTIVE_STATUSES:
+            return job
+        time.sleep(0.1)
+    raise TimeoutError(f"Training job {job_id} still {job['status']}")
+
+
+def test_single_flight_and_failure_reporting(manager):
+    job, started = manager.start(model_search_strategy="random")
+    duplicate, started_again = manager.start()
+    assert started and not started_again
+    assert duplicate["job_id"] == job["job_id"]
+
+    job = wait_for(manager, job["job_id"])
+    assert job["status"] == "failed" and "MongoDB URL is not set" in job["error"]
+    assert job["pid"] is not None and job["finished_at"] >= job["started_at"]
+    assert job["model_search_strategy"] == "random"
+    # Once the job has finished a new one can start.
+    assert manager.start()[1]
+
+
+def test_cancel_terminates_the_process(manager):
+    job, _ = manager.start()
+    cancelled = manager.cancel(job["job_id"])
+
+    assert cancelled["status"] == "cancelled"
+    assert manager.get_status(job["job_id"])["status"] == "cancelled"
+    assert manager.cancel("unknown") is None
+
+
+def test_each_job_reports_through_its_own_queue(manager):
+    job, _ = manager.start()
+    manager.cancel(job["job_id"])
+    assert job["job_id"] not in manager._events
+
+    job, started = manager.start()
+    assert started
+    job = wait_for(manager, job["job_id"])
+    assert job["status"] == "failed" and "MongoDB URL is not set" in job["error"]
+    # The queue is dropped once the process has exited.
+    deadline = time.monotonic() + 30
+    while manager._events and time.monotonic() < deadline:
+        time.sleep(0.1)
+        manager.list_jobs()
+    assert manager._events == {}
+
+
+def test_a_run_held_by_another_process_is_not_duplicated(manager):
+    from networksecurity.pipelines.training_job import acquire_training_lock
+
+    # Another server worker's training process, as seen from this one.
+    lock_file = acquire_training_lock(manager.lock_file_path)
+    try:
+        job, _ = manager.start()
+        job = wait_for(manager, job["job_id"])
+        assert job["status"] == "failed" and "Another training run holds" in job["error"]
+        assert job["started_at"] is None
+    finally:
+        lock_file.close()
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.constant.training_pipeline import DATA_INGESTION_COLLECTION_NAME, DATA_INGESTION_DATABASE_NAME
+from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.pipelines.training_pipeline import TrainingPipeline
+from networksecurity.utils.ml_utils.model_artifact import get_current_model_version
+
+
+@pytest.fixture
+def small_training(workdir, mongo_client, phishing_df, monkeypatch):
+    collection = mongo_client[DATA_INGESTION_DATABASE_NAME][DATA_INGESTION_COLLECTION_NAME]
+    collection.insert_many(phishing_df.iloc[:1500].to_dict("records"))
+    monkeypatch.setattr(ModelTrainer, "get_candidate_models", staticmethod(
+        lambda: ({"Decision Tree": DecisionTreeClassifier(random_state=0)}, {"Decision Tree": {"max_depth": [4, 8]}})))
+    monkeypatch.setattr(ModelTrainer, "track_mlflow", lambda self, *args: None)
+    return collection
+
+
+def test_unchanged_rerun_reuses_every_stage(small_training):
+    first = TrainingPipeline()
+    first_artifact = first.run_pipeline()
+    assert first.cached_stages == []
+    version = get_current_model_version()
+
+    second = TrainingPipeline()
+    second_artifact = second.run_pipeline()
+    assert second.cached_stages == ["data_ingestion", "data_validation", "data_transformation", "model_trainer"]
+    assert second_artifact.trained_model_file_path == first_artifact.trained_model_file_path
+    assert get_current_model_version() == version
+    assert os.path.exists(second.training_pipeline_config.run_report_file_path)
+
+
+def test_new_data_reruns_the_pipeline(small_training, phishing_df):
+    TrainingPipeline().run_pipeline()
+    small_training.insert_many(phishing_df.iloc[1500:1600].to_dict("records"))
+
+    pipeline = TrainingPipeline()
+    pipeline.run_pipeline()
+    assert pipeline.cached_stages == []
+
+
+def test_stage_with_missing_files_is_rerun(workdir):
+    calls = []
+
+    def run_ingestion():
+        calls.append(len(calls))
+        os.makedirs("ingested", exist_ok=True)
+        for name in ("train.csv", "test.csv"):
+            with open(os.path.join("ingested", name), "w") as file_obj:
+                file_obj.write("a\n1\n")
+        return DataIngestionArtifact(train_file_path="ingested/train.csv", test_file_path="ingested/test.csv")
+
+    pipeline = TrainingPipeline()
+    pipeline.run_stage("data_ingestion", None, DataIngestionArtifact, run_ingestion)
+    artifact, _ = pipeline.run_stage("data_ingestion", None, DataIngestionArtifact, run_ingestion)
+    assert calls == [0] and artifact.train_file_path == "ingested/train.csv"
+
+    os.remove("ingested/test.csv")
+    pipeline.run_stage("data_ingestion", None, DataIngestionArtifact, run_ingestion)
+    assert calls == [0, 1]
+    # Anything else the key covers, here an extra input, is a different entry.
+    pipeline.run_stage("data_ingestion", None, DataIngestionArtifact, run_ingestion, extra={"data_fingerprint": 1})
+    assert calls == [0, 1, 2]